@@ -1,7 +1,13 @@
 import asyncio
 from fastapi import HTTPException, status
-from agents.linkedin_processor import get_linkedin_profile_with_companies
+from agents.linkedin_processor import (
+    get_linkedin_profile_with_companies,
+    enrich_linkedin_profile,
+)
+from fastapi.concurrency import run_in_threadpool
+from services.proxycurl import aget_linkedin_profile
 import services.firestore as firestore
+import services.firestore_async as firestore_async
 from models.jobs import KeyTrait, Candidate, CalibratedProfiles
 import psutil
 import logging
@@ -9,11 +15,20 @@ from datetime import datetime
 from services.evaluate import run_graph
 from services.firestore import get_custom_instructions
 import uuid
-from fastapi.concurrency import run_in_threadpool
+from services.scheduler import limiter
+from services.task_queue import get_task_queue
+from services.credit_ledger import get_credit_ledger
+from models.tasks import QueuedTask
 from models.api import CandidateCalibrationPayload
 from models.jobs import Job
 from models.linkedin import LinkedInProfile
 from utils.linkedin_utils import extract_linkedin_id
+from agents.change_impact import (
+    ReevaluationPlan,
+    evaluation_fingerprint,
+    merge_trait_results,
+    plan_reevaluation,
+)
 
 
 class CandidateProcessor:
@@ -40,23 +55,38 @@ class CandidateProcessor:
             f"VMS: {memory_info.vms / 1024 / 1024:.2f}MB"
         )
 
-    async def process_single_candidate(self, candidate_data: dict, search_mode: bool) -> None:
-        """Process a single candidate with evaluation"""
+    async def process_single_candidate(
+        self, candidate_data: dict, search_mode: bool, final_attempt: bool = True
+    ) -> bool:
+        """Process a single candidate with evaluation
+
+        If the evaluation fails, a candidate that already had a result gets it
+        back. A new candidate keeps its processing row for the next attempt and
+        is only removed from the job when this is the final attempt.
+
+        Returns:
+            bool: True if the candidate was newly added to the job and consumes
+                a search credit, False for reevaluations
+        """
+        previous = None
+        is_reevaluation = added = False
         try:
             logging.info(
                 f"[MEMORY] Starting candidate processing - {self._get_memory_usage()}"
             )
 
             # Check if this is a reevaluation by seeing if the candidate is already in the job
-            is_reevaluation = firestore.check_candidate_in_job(
-                self.job_id, candidate_data["public_identifier"], self.user_id
-            )
-
-            firestore.add_candidate_to_job(
+            previous = await limiter.run_in_threadpool(
+                "firestore",
+                firestore.get_job_candidate,
                 self.job_id,
                 candidate_data["public_identifier"],
                 self.user_id,
-                {"status": "processing", "name": candidate_data["name"]},
+            )
+            # A processing row without sections is left by an earlier attempt at
+            # adding a new candidate; a reevaluation keeps its result while it runs
+            is_reevaluation = (
+                previous is not None and previous.get("sections") is not None
             )
 
             if not candidate_data:
@@ -67,6 +97,74 @@ class CandidateProcessor:
             if not isinstance(candidate_data["profile"], LinkedInProfile):
                 candidate_data["profile"] = LinkedInProfile(**candidate_data["profile"])
 
+            custom_instructions = await limiter.run_in_threadpool(
+                "firestore", get_custom_instructions, self.user_id
+            )
+            custom_instructions = (
+                custom_instructions.evaluation_instructions
+                if custom_instructions
+                else ""
+            )
+            job = self._build_job()
+
+            # Only rerun what changed since the candidate's last completed evaluation
+            eval_fingerprint = evaluation_fingerprint(
+                job,
+                candidate_data["profile"],
+                custom_instructions,
+                {
+                    "search_mode": search_mode,
+                    "number_of_queries": candidate_data.get("number_of_queries", 0),
+                    "confidence_threshold": candidate_data.get(
+                        "confidence_threshold", 0.0
+                    ),
+                },
+            )
+            plan = plan_reevaluation(
+                (
+                    previous.get("eval_fingerprint")
+                    if previous and previous.get("status") == "complete"
+                    else None
+                ),
+                eval_fingerprint,
+            )
+            if plan.mode == "skip":
+                logging.info(
+                    f"Skipping {candidate_data['public_identifier']}, inputs unchanged"
+                )
+                return False
+            if plan.mode == "traits":
+                await self._reevaluate_traits(
+                    candidate_data,
+                    previous,
+                    job,
+                    plan,
+                    search_mode,
+                    custom_instructions,
+                    eval_fingerprint,
+                )
+                return False
+
+            if is_reevaluation:
+                await limiter.run_in_threadpool(
+                    "firestore",
+                    firestore.update_job_candidate,
+                    self.job_id,
+                    candidate_data["public_identifier"],
+                    self.user_id,
+                    {"status": "processing"},
+                )
+            else:
+                await limiter.run_in_threadpool(
+                    "firestore",
+                    firestore.add_candidate_to_job,
+                    self.job_id,
+                    candidate_data["public_identifier"],
+                    self.user_id,
+                    {"status": "processing", "name": candidate_data["name"]},
+                )
+                added = True
+
             # Run evaluation with all the necessary data
             graph_result = await run_graph(
                 profile=candidate_data["profile"],
@@ -76,28 +174,8 @@ class CandidateProcessor:
                 cached=candidate_data.get("cached"),
                 citations=candidate_data.get("citations"),
                 source_str=candidate_data.get("source_str"),
-                custom_instructions=(
-                    get_custom_instructions(self.user_id).evaluation_instructions
-                    if get_custom_instructions(self.user_id)
-                    else ""
-                ),
-                job=Job(
-                    job_description=self.job_data["job_description"],
-                    key_traits=[
-                        KeyTrait(**trait) for trait in self.job_data["key_traits"]
-                    ],
-                    calibrated_profiles=[
-                        CalibratedProfiles(**profile)
-                        for profile in (self.job_data.get("calibrated_profiles") or [])
-                    ],
-                    job_title=self.job_data["job_title"],
-                    company_name=self.job_data["company_name"],
-                    created_at=(
-                        self.job_data.get("created_at").isoformat()
-                        if isinstance(self.job_data.get("created_at"), datetime)
-                        else self.job_data.get("created_at")
-                    ),
-                ),
+                custom_instructions=custom_instructions,
+                job=job,
             )
 
             profile = candidate_data["profile"]
@@ -128,7 +206,9 @@ class CandidateProcessor:
                 )
 
             candidate_data.update(update_data)
-            firestore.create_candidate(candidate_data)
+            await limiter.run_in_threadpool(
+                "firestore", firestore.create_candidate, candidate_data
+            )
 
             logging.info(f"[MEMORY] After graph search - {self._get_memory_usage()}")
 
@@ -141,33 +221,129 @@ class CandidateProcessor:
                 "search_mode": search_mode,
                 "fit": graph_result["fit"],
                 "favorite": False,
+                "eval_fingerprint": eval_fingerprint,
             }
 
-            firestore.add_candidate_to_job(
+            await limiter.run_in_threadpool(
+                "firestore",
+                firestore.add_candidate_to_job,
                 self.job_id,
                 candidate_data["public_identifier"],
                 self.user_id,
                 candidate_job_data,
             )
 
-            # Only decrement search credits if this is not a reevaluation
-            if not is_reevaluation:
-                firestore.decrement_search_credits(self.user_id)
-
             logging.info(
                 f"[MEMORY] Completed candidate processing - {self._get_memory_usage()}"
             )
+            # Only charge a search credit if this is not a reevaluation
+            return not is_reevaluation
         except Exception as e:
             logging.error(f"[MEMORY] Error in processing - {self._get_memory_usage()}")
-            firestore.remove_candidate_from_job(
-                self.job_id, candidate_data["public_identifier"], self.user_id
-            )
-            print(e)
+            if is_reevaluation:
+                await limiter.run_in_threadpool(
+                    "firestore",
+                    firestore.add_candidate_to_job,
+                    self.job_id,
+                    candidate_data["public_identifier"],
+                    self.user_id,
+                    {**previous, "status": "complete"},
+                )
+            elif added and final_attempt:
+                await limiter.run_in_threadpool(
+                    "firestore",
+                    firestore.remove_candidate_from_job,
+                    self.job_id,
+                    candidate_data["public_identifier"],
+                    self.user_id,
+                )
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error running candidate evaluation: {str(e)}",
             )
 
+    async def _reevaluate_traits(
+        self,
+        candidate_data: dict,
+        previous: dict,
+        job: Job,
+        plan: ReevaluationPlan,
+        search_mode: bool,
+        custom_instructions: str,
+        eval_fingerprint: dict,
+    ) -> None:
+        """Rescore only the changed traits and merge them into the previous result.
+
+        The previous summary and fit are kept since they were produced for the
+        job as a whole. The caller restores the previous result if this fails.
+        """
+        await limiter.run_in_threadpool(
+            "firestore",
+            firestore.update_job_candidate,
+            self.job_id,
+            candidate_data["public_identifier"],
+            self.user_id,
+            {"status": "processing"},
+        )
+
+        new_sections = []
+        if plan.changed_traits:
+            changed = set(plan.changed_traits)
+            graph_result = await run_graph(
+                profile=candidate_data["profile"],
+                number_of_queries=candidate_data.get("number_of_queries", 0),
+                confidence_threshold=candidate_data.get("confidence_threshold", 0.0),
+                search_mode=search_mode,
+                cached=candidate_data.get("cached"),
+                citations=candidate_data.get("citations"),
+                source_str=candidate_data.get("source_str"),
+                custom_instructions=custom_instructions,
+                job=job.model_copy(
+                    update={
+                        "key_traits": [
+                            trait for trait in job.key_traits if trait.trait in changed
+                        ]
+                    }
+                ),
+            )
+            new_sections = graph_result["sections"]
+
+        candidate_job_data = {
+            "status": "complete",
+            "summary": previous.get("summary"),
+            "search_mode": search_mode,
+            "fit": previous.get("fit"),
+            "favorite": previous.get("favorite", False),
+            "eval_fingerprint": eval_fingerprint,
+            **merge_trait_results(previous.get("sections"), new_sections, job),
+        }
+        await limiter.run_in_threadpool(
+            "firestore",
+            firestore.add_candidate_to_job,
+            self.job_id,
+            candidate_data["public_identifier"],
+            self.user_id,
+            candidate_job_data,
+        )
+
+    def _build_job(self) -> Job:
+        """Build the Job model used as evaluation input"""
+        return Job(
+            job_description=self.job_data["job_description"],
+            key_traits=[KeyTrait(**trait) for trait in self.job_data["key_traits"]],
+            calibrated_profiles=[
+                CalibratedProfiles(**profile)
+                for profile in (self.job_data.get("calibrated_profiles") or [])
+            ],
+            job_title=self.job_data["job_title"],
+            company_name=self.job_data["company_name"],
+            created_at=(
+                self.job_data.get("created_at").isoformat()
+                if isinstance(self.job_data.get("created_at"), datetime)
+                else self.job_data.get("created_at")
+            ),
+        )
+
     def get_candidate_record(self, candidate_data: dict) -> dict | None:
         """Get candidate record from LinkedIn URL with enriched company data."""
         try:
@@ -206,65 +382,73 @@ class CandidateProcessor:
                     profile,
                     public_id,
                 ) = get_linkedin_profile_with_companies(candidate_data["url"])
-                if not full_name or not profile:
-                    logging.error(
-                        f"No full name or profile found for {candidate_data['url']}, skipping"
-                    )
-                    return None
-
-                candidate_data.update(
-                    {
-                        "context": profile.to_context_string(),
-                        "name": full_name,
-                        "profile": profile,
-                        "public_identifier": public_id,
-                        "cached": False,
-                    }
+                return self._fresh_candidate_record(
+                    candidate_data, full_name, profile, public_id
                 )
-                return candidate_data
         except Exception as e:
             print(f"Error getting candidate record: {str(e)}")
             return None
 
-    async def process_urls(self, urls: list[str], search_mode: bool = True) -> None:
-        """Process a list of LinkedIn URLs in bulk."""
+    async def aget_candidate_record(self, candidate_data: dict) -> dict | None:
+        """Async variant of get_candidate_record that fetches uncached profiles
+        through the pooled ProxyCurl client instead of blocking a thread."""
         try:
-            logging.info(f"Processing {len(urls)} LinkedIn URLs")
-
-            dummy_id = self.create_dummy_candidate(len(urls))
-
-            # Process URL fetches concurrently using gather
-            fetch_tasks = [
-                run_in_threadpool(lambda d={'url': url}: self.get_candidate_record(d))
-                for url in urls
-            ]
-            candidates = await asyncio.gather(*fetch_tasks)
-
-            # Filter out failed fetches
-            candidates = [c for c in candidates if c is not None]
-
-            logging.info(f"Successfully fetched {len(candidates)} profiles")
+            public_id = extract_linkedin_id(candidate_data["url"])
+            if not public_id:
+                print(
+                    f"Could not extract public identifier from {candidate_data['url']}"
+                )
+                return None
 
-            # Process candidates concurrently
-            eval_tasks = [
-                self.process_single_candidate(candidate, search_mode) for candidate in candidates
-            ]
-            await asyncio.gather(*eval_tasks)
+            cached = await limiter.run_in_threadpool(
+                "firestore", firestore.check_cached_candidate_exists, public_id
+            )
+            if cached:
+                return await limiter.run_in_threadpool(
+                    "firestore", self.get_candidate_record, candidate_data
+                )
 
+            async with limiter.limit("proxycurl"):
+                full_name, profile, public_id = await aget_linkedin_profile(
+                    candidate_data["url"]
+                )
+            full_name, profile, public_id = await run_in_threadpool(
+                enrich_linkedin_profile, full_name, profile, public_id
+            )
+            return self._fresh_candidate_record(
+                candidate_data, full_name, profile, public_id
+            )
         except Exception as e:
-            logging.error(str(e))
-        finally:
-            firestore.delete_candidate(dummy_id)
-            firestore.remove_candidate_from_job(self.job_id, dummy_id, self.user_id)
+            print(f"Error getting candidate record: {str(e)}")
+            return None
 
-    async def reevaluate_candidates(self):
-        """Reevaluate all candidates for a job"""
-        candidates = firestore.get_candidates(self.job_id, self.user_id)
-        tasks = [self.process_single_candidate(candidate, search_mode=candidate.get("search_mode", False)) for candidate in candidates]
-        await asyncio.gather(*tasks)
+    def _fresh_candidate_record(
+        self,
+        candidate_data: dict,
+        full_name: str,
+        profile: LinkedInProfile,
+        public_id: str,
+    ) -> dict | None:
+        """Fill candidate data from a newly fetched profile"""
+        if not full_name or not profile:
+            logging.error(
+                f"No full name or profile found for {candidate_data['url']}, skipping"
+            )
+            return None
 
-    def create_dummy_candidate(self, num_urls: int) -> str:
-        id = str(uuid.uuid4())
+        candidate_data.update(
+            {
+                "context": profile.to_context_string(),
+                "name": full_name,
+                "profile": profile,
+                "public_identifier": public_id,
+                "cached": False,
+            }
+        )
+        return candidate_data
+
+    def create_dummy_candidate(self, num_urls: int, id: str | None = None) -> str:
+        id = id or str(uuid.uuid4())
         firestore.create_candidate({"public_identifier": id})
         firestore.add_candidate_to_job(
             self.job_id,
@@ -278,6 +462,75 @@ class CandidateProcessor:
         )
         return id
 
+    def enqueue_urls(self, urls: list[str], search_mode: bool = True) -> str:
+        """Queue one durable task per LinkedIn URL and return the batch ID.
+
+        The loading indicator row doubles as the batch ID so the worker that
+        finishes the last task can remove it. One credit per URL is reserved
+        under the same ID before anything is queued.
+
+        Raises:
+            ValueError: If no URLs are given, since nothing would ever finish
+                the batch and remove its loading indicator
+            InsufficientCreditsError: If the user cannot pay for every URL
+        """
+        if not urls:
+            raise ValueError("No LinkedIn URLs to enqueue")
+        dummy_id = str(uuid.uuid4())
+        ledger = get_credit_ledger()
+        ledger.reserve(self.user_id, dummy_id, len(urls), job_id=self.job_id)
+        try:
+            self.create_dummy_candidate(len(urls), dummy_id)
+            self._enqueue_url_tasks(dummy_id, urls, search_mode)
+        except Exception:
+            ledger.release(dummy_id)
+            raise
+        return dummy_id
+
+    def _enqueue_url_tasks(
+        self, dummy_id: str, urls: list[str], search_mode: bool
+    ) -> None:
+        get_task_queue().enqueue(
+            [
+                QueuedTask(
+                    id=f"{dummy_id}-{i}",
+                    kind="process_url",
+                    batch_id=dummy_id,
+                    payload={
+                        "job_id": self.job_id,
+                        "user_id": self.user_id,
+                        "url": url,
+                        "search_mode": search_mode,
+                        "reservation_id": dummy_id,
+                    },
+                )
+                for i, url in enumerate(urls)
+            ]
+        )
+
+    def enqueue_reevaluation(self) -> str:
+        """Queue one durable reevaluation task per candidate and return the batch ID"""
+        batch_id = str(uuid.uuid4())
+        candidates = firestore.get_candidates(self.job_id, self.user_id)
+        get_task_queue().enqueue(
+            [
+                QueuedTask(
+                    id=f"{batch_id}-{candidate['id']}",
+                    kind="evaluate_candidate",
+                    batch_id=batch_id,
+                    payload={
+                        "job_id": self.job_id,
+                        "user_id": self.user_id,
+                        "candidate_id": candidate["id"],
+                        "search_mode": candidate.get("search_mode", False),
+                    },
+                )
+                for candidate in candidates
+                if not candidate.get("is_loading_indicator")
+            ]
+        )
+        return batch_id
+
     async def calibrate_candidate(
         self,
         candidate_id: str,
@@ -287,7 +540,7 @@ class CandidateProcessor:
         """Calibrate a single candidate and optionally update evaluation settings"""
         try:
             # Get candidate data
-            candidate = firestore.get_full_candidate(
+            candidate = await firestore_async.get_full_candidate(
                 self.job_id, candidate_id, self.user_id
             )
             if not candidate:
@@ -324,10 +577,10 @@ class CandidateProcessor:
                 self.job_data["calibrated_profiles"].append(new_calibration)
 
             # Persist the updated job_data in Firestore
-            firestore.edit_job(self.job_id, self.user_id, self.job_data)
+            await firestore_async.edit_job(self.job_id, self.user_id, self.job_data)
 
             # Re-evaluate all candidates since calibration affects the context
-            await self.reevaluate_candidates()
+            await run_in_threadpool(self.enqueue_reevaluation)
 
         except Exception as e:
             logging.error(f"Error calibrating candidate: {str(e)}")
@@ -341,12 +594,18 @@ class CandidateProcessor:
     ) -> None:
         """Calibrate multiple candidates in bulk"""
         try:
-            # Process each candidate's calibration data first
-            for candidate_id, calibration_data in feedback.items():
-                # Get candidate data
-                candidate = firestore.get_full_candidate(
-                    self.job_id, candidate_id, self.user_id
+            # Read every calibrated candidate at once, then apply the feedback in order
+            candidates = await asyncio.gather(
+                *(
+                    firestore_async.get_full_candidate(
+                        self.job_id, candidate_id, self.user_id
+                    )
+                    for candidate_id in feedback
                 )
+            )
+            for (candidate_id, calibration_data), candidate in zip(
+                feedback.items(), candidates
+            ):
                 if not candidate:
                     raise HTTPException(
                         status_code=status.HTTP_404_NOT_FOUND,
@@ -381,10 +640,10 @@ class CandidateProcessor:
                     self.job_data["calibrated_profiles"].append(new_calibration)
 
             # Persist all updates to job_data in Firestore
-            firestore.edit_job(self.job_id, self.user_id, self.job_data)
+            await firestore_async.edit_job(self.job_id, self.user_id, self.job_data)
 
             # Perform a single reevaluation of all candidates
-            await self.reevaluate_candidates()
+            await run_in_threadpool(self.enqueue_reevaluation)
 
         except Exception as e:
             logging.error(f"Error in bulk calibration: {str(e)}")
@@ -6,8 +6,8 @@ from datetime import date
 from collections import defaultdict
 from models.linkedin import LinkedInProfile, LinkedInExperience
 from models.career import CareerMetrics, FundingType
-from .constants import unicorns, big_tech, quant
-from .career_levels import determine_career_level_llm
+from .company_index import classify_company
+from .career_levels import classify_career_levels_batch, determine_career_level
 
 
 # Constants for filtering experience titles
@@ -43,14 +43,18 @@ def months_between(start: date, end: date) -> int:
     return (end.year - start.year) * 12 + (end.month - start.month)
 
 
-def analyze_career(profile: LinkedInProfile) -> CareerMetrics:
-    """Compute career metrics from a LinkedIn profile."""
-    professional_experiences = [
+def _professional_experiences(profile: LinkedInProfile) -> list[LinkedInExperience]:
+    return [
         exp
         for exp in profile.experiences
         if is_professional_experience(exp, profile.education)
     ]
 
+
+def analyze_career(profile: LinkedInProfile) -> CareerMetrics:
+    """Compute career metrics from a LinkedIn profile."""
+    professional_experiences = _professional_experiences(profile)
+
     total_months = calculate_total_months(professional_experiences)
     avg_tenure = calculate_average_tenure_months(professional_experiences)
     current_tenure = calculate_current_tenure_months(professional_experiences)
@@ -266,11 +270,12 @@ def generate_experience_tags(pro_exps: list[LinkedInExperience]) -> list[str]:
             continue
         seen_companies.add(company)
 
-        if company in big_tech:
+        categories = classify_company(company, exp.company_data.company_id)
+        if "big_tech" in categories:
             tags.add("Worked at Big Tech")
-        if company in unicorns:
+        if "unicorn" in categories:
             tags.add("Worked at Unicorn")
-        if company in quant:
+        if "quant" in categories:
             tags.add("Worked at Quant Fund")
 
         stages = exp.company_data.funding_data
@@ -321,10 +326,28 @@ def analyze_latest_experience(profile: LinkedInProfile, total_months: int) -> di
     latest_experience = profile.experiences[0]
     role = latest_experience.title
     company = latest_experience.company
-    # Determine career level and track using LLM
-    level, track = determine_career_level_llm(role, company, total_months)
+    # Determine career level and track, reusing stored classifications
+    level, track = determine_career_level(role, company, total_months)
 
     return {
         "level": level,
         "track": track,
     }
+
+
+def prime_career_levels(profiles: list[LinkedInProfile]) -> None:
+    """
+    Classify the latest experience of many profiles in one batched LLM pass,
+    so analyze_career finds every classification already cached.
+    """
+    items = [
+        (
+            profile.experiences[0].title,
+            profile.experiences[0].company,
+            calculate_total_months(_professional_experiences(profile)),
+        )
+        for profile in profiles
+        if profile.experiences
+    ]
+    if items:
+        classify_career_levels_batch(items)
@@ -2,8 +2,24 @@
 Career level definitions and track-specific titles.
 """
 
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
 from models.serializable import SerializableModel
 from services.llms import llm_fast
+from services.firestore import db
+
+# Number of classifications kept in the process-local cache
+CAREER_LEVEL_CACHE_SIZE = int(os.getenv("CAREER_LEVEL_CACHE_SIZE", "20000"))
+# Document references per Firestore get_all call
+CAREER_LEVEL_BATCH_SIZE = 100
+# Upper bounds, in months of total experience, of the buckets used in cache keys
+MONTHS_BUCKETS = [24, 60, 120, 180]
+# Title matches at or above this confidence are used without asking the LLM
+TITLE_MATCH_CONFIDENCE = 0.8
 
 # Career Track Constants
 TRACKS = {
@@ -99,20 +115,258 @@ class CareerLevelAnalysis(SerializableModel):
     confidence: float  # Confidence score between 0 and 1
 
 
-def determine_career_level_llm(
+# Abbreviations expanded before matching titles against LEVEL_TITLES
+TITLE_ABBREVIATIONS = {
+    "sr": "senior",
+    "snr": "senior",
+    "jr": "junior",
+    "mgr": "manager",
+    "vice president": "vp",
+}
+
+_ABBREVIATION_PATTERN = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, TITLE_ABBREVIATIONS)) + r")\b"
+)
+
+
+def _normalize_title(title: str | None) -> str:
+    normalized = " ".join(re.sub(r"[^a-z0-9]+", " ", (title or "").lower()).split())
+    return _ABBREVIATION_PATTERN.sub(
+        lambda m: TITLE_ABBREVIATIONS[m.group(0)], normalized
+    )
+
+
+def _title_levels(level_titles: dict) -> dict[str, tuple[str, str]]:
+    """Map each title pattern to its (level, track), rejecting duplicate patterns."""
+    title_levels = {}
+    for track, levels in level_titles.items():
+        for level, patterns in levels.items():
+            for pattern in patterns:
+                if pattern in title_levels:
+                    raise ValueError(
+                        f"Title pattern {pattern!r} is listed under both "
+                        f"{title_levels[pattern]} and {(level, track)}"
+                    )
+                title_levels[pattern] = (level, track)
+    return title_levels
+
+
+_TITLE_LEVELS = _title_levels(LEVEL_TITLES)
+# Longest patterns first so the most specific title wins at each position
+_TITLE_PATTERN = re.compile(
+    r"\b(?:"
+    + "|".join(
+        re.escape(pattern) for pattern in sorted(_TITLE_LEVELS, key=len, reverse=True)
+    )
+    + r")\b"
+)
+
+
+def match_career_level(title: str) -> CareerLevelAnalysis | None:
+    """
+    Match a title against LEVEL_TITLES in a single regex pass.
+
+    Only a title equal to a known pattern has confidence 1.0. A title that
+    merely contains known patterns leaves words unmatched, such as seniority,
+    "intern" or a roman numeral, that can change its level, so it scores 0.6
+    when the patterns agree on level and track and 0.5 when they disagree;
+    both are below TITLE_MATCH_CONFIDENCE. Returns None when no pattern occurs
+    in the title.
+    """
+    normalized = _normalize_title(title)
+    matches = [m.group(0) for m in _TITLE_PATTERN.finditer(normalized)]
+    if not matches:
+        return None
+    best = max(matches, key=len)
+    level, track = _TITLE_LEVELS[best]
+    if normalized == best:
+        confidence = 1.0
+    elif len({_TITLE_LEVELS[match] for match in matches}) == 1:
+        confidence = 0.6
+    else:
+        confidence = 0.5
+    return CareerLevelAnalysis(level_code=level, track=track, confidence=confidence)
+
+
+def _confident_match(title: str) -> tuple[str, str] | None:
+    match = match_career_level(title)
+    if match is None or match.confidence < TITLE_MATCH_CONFIDENCE:
+        return None
+    return match.level_code, match.track
+
+
+_level_cache: OrderedDict[str, tuple[str, str]] = OrderedDict()
+_level_cache_lock = threading.Lock()
+
+
+def _normalize(text: str | None) -> str:
+    return re.sub(r"[^a-z0-9&+#]+", " ", (text or "").lower()).strip()
+
+
+def months_bucket(total_months: int) -> str:
+    """Coarse experience bucket, so nearby experience levels share a cache entry."""
+    lower = 0
+    for upper in MONTHS_BUCKETS:
+        if (total_months or 0) < upper:
+            return f"{lower}-{upper}"
+        lower = upper
+    return f"{lower}+"
+
+
+def career_level_key(title: str, company: str, total_months: int) -> str:
+    """Cache key for a classification: normalized title, company and months bucket."""
+    raw = "|".join(
+        [_normalize(title), _normalize(company), months_bucket(total_months)]
+    )
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def get_cached_career_levels(keys: list[str]) -> dict[str, tuple[str, str]]:
+    """
+    Look up classifications by key.
+
+    Recent keys are served from a process-local LRU cache; the rest are read
+    from Firebase with chunked get_all calls. Unknown keys are left out.
+    """
+    levels = {}
+    missing = []
+    with _level_cache_lock:
+        for key in dict.fromkeys(keys):
+            level = _level_cache.get(key)
+            if level is not None:
+                _level_cache.move_to_end(key)
+                levels[key] = level
+            else:
+                missing.append(key)
+
+    fetched = {}
+    for i in range(0, len(missing), CAREER_LEVEL_BATCH_SIZE):
+        refs = [
+            db.collection("career_levels").document(key)
+            for key in missing[i : i + CAREER_LEVEL_BATCH_SIZE]
+        ]
+        for doc in db.get_all(refs):
+            if doc.exists:
+                data = doc.to_dict()
+                fetched[doc.id] = (data["level"], data["track"])
+
+    _remember(fetched)
+    levels.update(fetched)
+    return levels
+
+
+def _remember(levels: dict[str, tuple[str, str]]) -> None:
+    if not levels:
+        return
+    with _level_cache_lock:
+        for key, level in levels.items():
+            _level_cache[key] = level
+            _level_cache.move_to_end(key)
+        while len(_level_cache) > CAREER_LEVEL_CACHE_SIZE:
+            _level_cache.popitem(last=False)
+
+
+def store_career_levels(classifications: dict[str, dict]) -> None:
+    """Persist classifications, keyed by career_level_key, with batched writes."""
+    items = list(classifications.items())
+    for i in range(0, len(items), 500):
+        batch = db.batch()
+        for key, data in items[i : i + 500]:
+            batch.set(db.collection("career_levels").document(key), data)
+        batch.commit()
+    _remember(
+        {key: (data["level"], data["track"]) for key, data in classifications.items()}
+    )
+
+
+def determine_career_level(
     title: str, company: str, total_months: int
 ) -> tuple[str, str]:
     """
-    Use LLM to determine the career level and track based on the job title and company.
+    Determine the career level and track.
+
+    A title that matches LEVEL_TITLES unambiguously is classified directly.
+    Otherwise a stored classification for the same title, company and
+    experience bucket is used, and only then the LLM.
+    """
+    matched = _confident_match(title)
+    if matched:
+        return matched
+
+    key = career_level_key(title, company, total_months)
+    cached = get_cached_career_levels([key]).get(key)
+    if cached:
+        return cached
+
+    level, track = determine_career_level_llm(title, company, total_months)
+    try:
+        store_career_levels(
+            {key: _classification(title, company, total_months, level, track)}
+        )
+    except Exception as e:
+        logging.error(f"Error caching career level for {title}: {str(e)}")
+    return level, track
+
+
+def classify_career_levels_batch(
+    items: list[tuple[str, str, int]],
+) -> dict[str, tuple[str, str]]:
+    """
+    Classify many (title, company, total months) items at once.
+
+    Titles that match LEVEL_TITLES unambiguously are classified directly.
+    Only keys with no stored classification reach the LLM, and all of them go
+    in a single batched call. Results are persisted for later lookups.
 
-    Args:
-        title: The job title to analyze
-        company: The company name
-        total_months: The total months of experience
     Returns:
-        tuple[str, str]: Tuple of (level code, track code)
+        dict[str, tuple[str, str]]: (level, track) by career_level_key
     """
-    prompt = f"""Analyze the job title '{title}' at company '{company}' and classify it into one of these career tracks and levels:
+    unique = {career_level_key(*item): item for item in items}
+    levels = {}
+    for key, (title, _, _) in unique.items():
+        matched = _confident_match(title)
+        if matched:
+            levels[key] = matched
+    levels.update(get_cached_career_levels([k for k in unique if k not in levels]))
+    unseen = {key: item for key, item in unique.items() if key not in levels}
+    if not unseen:
+        return levels
+
+    structured_llm = llm_fast.with_structured_output(CareerLevelAnalysis)
+    results = structured_llm.batch(
+        [_career_level_prompt(*item) for item in unseen.values()],
+        return_exceptions=True,
+    )
+
+    classifications = {}
+    for (key, (title, company, total_months)), result in zip(unseen.items(), results):
+        if isinstance(result, Exception):
+            logging.error(f"Error classifying career level for {title}: {str(result)}")
+            continue
+        level, track = _resolve_llm_result(title, result)
+        classifications[key] = _classification(
+            title, company, total_months, level, track
+        )
+        levels[key] = (level, track)
+
+    store_career_levels(classifications)
+    return levels
+
+
+def _classification(
+    title: str, company: str, total_months: int, level: str, track: str
+) -> dict:
+    return {
+        "title": _normalize(title),
+        "company": _normalize(company),
+        "months_bucket": months_bucket(total_months),
+        "level": level,
+        "track": track,
+    }
+
+
+def _career_level_prompt(title: str, company: str, total_months: int) -> str:
+    return f"""Analyze the job title '{title}' at company '{company}' and classify it into one of these career tracks and levels:
 
     {LEVEL_TITLES}
 
@@ -120,9 +374,27 @@ def determine_career_level_llm(
     Keep in mind the total months of experience this person has worked {total_months}.
     Consider company context and years of experience implied by the title.
 """
+
+
+def determine_career_level_llm(
+    title: str, company: str, total_months: int
+) -> tuple[str, str]:
+    """
+    Use LLM to determine the career level and track based on the job title and company.
+
+    Args:
+        title: The job title to analyze
+        company: The company name
+        total_months: The total months of experience
+    Returns:
+        tuple[str, str]: Tuple of (level code, track code)
+    """
     structured_llm = llm_fast.with_structured_output(CareerLevelAnalysis)
-    result = structured_llm.invoke(prompt)
+    result = structured_llm.invoke(_career_level_prompt(title, company, total_months))
+    return _resolve_llm_result(title, result)
 
+
+def _resolve_llm_result(title: str, result: CareerLevelAnalysis) -> tuple[str, str]:
     if result.confidence < 0.7:
         # Fall back to heuristic matching for low confidence results
         return determine_level_heuristic(title)
@@ -134,11 +406,10 @@ def determine_level_heuristic(title: str) -> tuple[str, str]:
     """Fallback method using simple pattern matching for level determination."""
     title_lower = title.lower()
 
-    # Check each track and its levels
-    for track, levels in LEVEL_TITLES.items():
-        for level, patterns in levels.items():
-            if any(pattern in title_lower for pattern in patterns):
-                return level, track
+    # Use the most specific known title in the title, if any
+    match = match_career_level(title)
+    if match:
+        return match.level_code, match.track
 
     # Default fallbacks based on common terms
     if any(term in title_lower for term in ["senior", "sr.", "sr ", "lead"]):
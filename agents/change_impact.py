@@ -0,0 +1,131 @@
+"""
+Change-impact analysis for candidate reevaluation.
+
+Each evaluation stores a fingerprint of its inputs on the job-candidate
+document. Comparing it with the fingerprint of the current inputs tells us
+whether a candidate needs a full reevaluation, only some traits rescored,
+or nothing at all.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Literal
+from models.jobs import Job
+from models.linkedin import LinkedInProfile
+
+
+def fingerprint(value: Any) -> str:
+    """Stable content hash of a JSON-compatible value."""
+    payload = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def evaluation_fingerprint(
+    job: Job,
+    profile: LinkedInProfile,
+    custom_instructions: str | None,
+    settings: dict,
+) -> dict:
+    """Fingerprint every input that affects a candidate's evaluation."""
+    return {
+        "job": fingerprint(
+            [job.job_description, job.job_title, job.company_name]
+        ),
+        "calibrations": fingerprint(
+            [profile.dict() for profile in job.calibrated_profiles or []]
+        ),
+        "instructions": fingerprint(custom_instructions or ""),
+        "profile": fingerprint(profile.dict()),
+        "settings": fingerprint(settings),
+        "traits": {
+            trait.trait: fingerprint([trait.description, trait.required])
+            for trait in job.key_traits
+        },
+    }
+
+
+@dataclass
+class ReevaluationPlan:
+    """What needs to be rerun for a candidate."""
+
+    mode: Literal["full", "traits", "skip"]
+    changed_traits: list[str] = field(default_factory=list)
+    removed_traits: list[str] = field(default_factory=list)
+
+
+def plan_reevaluation(previous: dict | None, current: dict) -> ReevaluationPlan:
+    """
+    Compare stored and current fingerprints.
+
+    Any change outside the key traits requires a full reevaluation. When
+    only traits were added, edited or removed, just those traits are
+    rescored and the rest of the previous result is kept.
+    """
+    if not previous:
+        return ReevaluationPlan(mode="full")
+
+    for key in ("job", "calibrations", "instructions", "profile", "settings"):
+        if previous.get(key) != current[key]:
+            return ReevaluationPlan(mode="full")
+
+    previous_traits = previous.get("traits") or {}
+    changed = [
+        trait
+        for trait, trait_hash in current["traits"].items()
+        if previous_traits.get(trait) != trait_hash
+    ]
+    removed = [trait for trait in previous_traits if trait not in current["traits"]]
+
+    if not changed and not removed:
+        return ReevaluationPlan(mode="skip")
+    # Rescoring most traits costs about as much as a full run and keeps the
+    # summary and fit consistent with the new traits
+    if len(changed) * 2 > len(current["traits"]):
+        return ReevaluationPlan(mode="full")
+    return ReevaluationPlan(mode="traits", changed_traits=changed, removed_traits=removed)
+
+
+def merge_trait_results(
+    previous_sections: list[dict],
+    new_sections: list[dict],
+    job: Job,
+) -> dict:
+    """
+    Merge rescored trait sections into a previous result.
+
+    Returns:
+        dict: sections in key-trait order with recomputed required_met and optional_met
+    """
+    by_trait = {
+        section.get("section"): section
+        for section in previous_sections or []
+        if isinstance(section, dict)
+    }
+    by_trait.update(
+        {
+            section.get("section"): section
+            for section in new_sections
+            if isinstance(section, dict)
+        }
+    )
+
+    sections = []
+    required_met = 0
+    optional_met = 0
+    for trait in job.key_traits:
+        section = by_trait.get(trait.trait)
+        if section is None:
+            continue
+        sections.append(section)
+        if section.get("value") is True:
+            if trait.required:
+                required_met += 1
+            else:
+                optional_met += 1
+
+    return {
+        "sections": sections,
+        "required_met": required_met,
+        "optional_met": optional_met,
+    }
@@ -0,0 +1,124 @@
+"""
+Company classification index.
+
+Maps normalized company names, known aliases and LinkedIn company IDs to the
+categories in agents/constants.py, so "Google LLC", "Alphabet" and the
+`google` company page all resolve to big tech with a single dict lookup.
+"""
+
+import re
+from functools import lru_cache
+from .constants import big_tech, quant, unicorns
+
+# Lists of company names by category
+COMPANY_CATEGORIES = {
+    "big_tech": big_tech,
+    "unicorn": unicorns,
+    "quant": quant,
+}
+
+# Other names a company is listed under on LinkedIn
+COMPANY_ALIASES = {
+    "Google": ["Alphabet", "Google DeepMind", "DeepMind", "YouTube"],
+    "Meta": ["Facebook", "Meta Platforms", "Instagram", "WhatsApp"],
+    "Amazon": ["Amazon Web Services", "AWS", "Amazon.com"],
+    "Apple": ["Apple Computer"],
+    "Microsoft": ["Microsoft Research"],
+}
+
+# LinkedIn company IDs of listed companies
+COMPANY_LINKEDIN_IDS = {
+    "Google": ["google", "deepmind", "youtube"],
+    "Meta": ["meta", "facebook", "instagram", "whatsapp"],
+    "Amazon": ["amazon", "amazon-web-services"],
+    "Apple": ["apple"],
+    "Microsoft": ["microsoft"],
+    "Netflix": ["netflix"],
+    "OpenAI": ["openai"],
+    "Stripe": ["stripe"],
+    "Databricks": ["databricks"],
+    "SpaceX": ["spacex"],
+    "ByteDance": ["bytedance"],
+}
+
+# Legal suffixes dropped from company names before lookup
+LEGAL_SUFFIXES = {
+    "inc",
+    "incorporated",
+    "llc",
+    "ltd",
+    "limited",
+    "corp",
+    "corporation",
+    "co",
+    "company",
+    "plc",
+    "gmbh",
+    "lp",
+    "llp",
+    "sa",
+    "ag",
+}
+
+_PARENTHETICAL = re.compile(r"\([^)]*\)")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+@lru_cache(maxsize=50000)
+def normalize_company_name(name: str) -> str:
+    """Lowercase a company name and drop punctuation, notes in parentheses and legal suffixes."""
+    words = _NON_ALNUM.sub(" ", _PARENTHETICAL.sub(" ", name.lower())).split()
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+class CompanyIndex:
+    """Category lookups by company name or LinkedIn company ID."""
+
+    def __init__(
+        self,
+        categories: dict[str, list[str]],
+        aliases: dict[str, list[str]],
+        linkedin_ids: dict[str, list[str]],
+    ):
+        by_company: dict[str, set[str]] = {}
+        for category, companies in categories.items():
+            for company in companies:
+                by_company.setdefault(company, set()).add(category)
+
+        self._by_name: dict[str, frozenset[str]] = {}
+        self._by_id: dict[str, frozenset[str]] = {}
+        for company, company_categories in by_company.items():
+            for name in [company, *aliases.get(company, [])]:
+                self._add(self._by_name, normalize_company_name(name), company_categories)
+            for company_id in linkedin_ids.get(company, []):
+                self._add(self._by_id, company_id.lower(), company_categories)
+
+    @staticmethod
+    def _add(index: dict, key: str, categories: set[str]) -> None:
+        if key:
+            index[key] = index.get(key, frozenset()) | categories
+
+    def categories(
+        self, name: str | None = None, company_id: str | None = None
+    ) -> frozenset[str]:
+        """Categories of a company, matched by LinkedIn company ID or by name."""
+        categories = frozenset()
+        if company_id:
+            categories = self._by_id.get(company_id.lower(), categories)
+        if name:
+            categories = categories | self._by_name.get(
+                normalize_company_name(name), frozenset()
+            )
+        return categories
+
+
+company_index = CompanyIndex(COMPANY_CATEGORIES, COMPANY_ALIASES, COMPANY_LINKEDIN_IDS)
+
+
+def classify_company(
+    name: str | None = None, company_id: str | None = None
+) -> frozenset[str]:
+    """Categories ("big_tech", "unicorn", "quant") a company belongs to."""
+    return company_index.categories(name, company_id)
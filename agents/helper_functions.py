@@ -1,3 +1,6 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.messages import HumanMessage, SystemMessage
 from services.llms import llm
 from langsmith import traceable
@@ -11,18 +14,23 @@ from agents.prompts import (
 )
 
 from agents.linkedin_processor import get_linkedin_profile_with_companies
-from services.firestore import get_user_templates
+import services.firestore_async as firestore_async
+from models.templates import UserTemplates
 from models.evaluation import KeyTraitsOutput, HeadlessEvaluationOutput, EditKeyTraitsOutput, EditJobDescriptionOutput
 from models.jobs import CalibratedProfiles
+from models.linkedin import LinkedInProfile
+from utils.linkedin_utils import extract_linkedin_id
 
+# Calibration profiles fetched at once for a single request
+CALIBRATION_FETCH_CONCURRENCY = int(os.getenv("CALIBRATION_FETCH_CONCURRENCY", "5"))
 
-@traceable(name="headless_evaluate_helper")
-def headless_evaluate_helper(
+
+def _headless_evaluate_messages(
     candidate_name: str, 
     candidate_context: str, 
     job_description: str, 
     calibrations: list[dict] = None
-) -> HeadlessEvaluationOutput:
+) -> list:
     if calibrations:
         calibrations_str = """
             ===============================================\n
@@ -60,31 +68,71 @@ def headless_evaluate_helper(
     else:
         calibrations_str = ""
     
+    return [
+        SystemMessage(
+            content=headless_evaluate_prompt.format(
+                candidate_name=candidate_name,
+                candidate_context=candidate_context,
+                job_description=job_description, 
+                calibrations=calibrations_str
+            )
+        ),
+        HumanMessage("Evaluate the candidate based on the job description and calibrations."),
+    ]
+
+
+@traceable(name="headless_evaluate_helper")
+async def aheadless_evaluate_helper(
+    candidate_name: str, 
+    candidate_context: str, 
+    job_description: str, 
+    calibrations: list[dict] = None
+) -> HeadlessEvaluationOutput:
     structured_llm = llm.with_structured_output(HeadlessEvaluationOutput)
-    output = structured_llm.invoke(
-        [
-            SystemMessage(
-                content=headless_evaluate_prompt.format(
-                    candidate_name=candidate_name,
-                    candidate_context=candidate_context,
-                    job_description=job_description, 
-                    calibrations=calibrations_str
-                )
-            ),
-            HumanMessage("Evaluate the candidate based on the job description and calibrations."),
-        ]
+    output = await structured_llm.ainvoke(
+        _headless_evaluate_messages(
+            candidate_name, candidate_context, job_description, calibrations
+        )
     )
     return output
 
 
+def _fetch_calibration_profile(url: str) -> LinkedInProfile | None:
+    try:
+        _, profile, _ = get_linkedin_profile_with_companies(url)
+        return profile
+    except Exception as e:
+        logging.error(f"Failed to fetch calibrated profile {url}: {str(e)}")
+        return None
+
+
 @traceable(name="get_calibrated_profiles_linkedin")
 def get_calibrated_profiles_linkedin(
     calibrated_profiles: list[CalibratedProfiles],
 ) -> list[CalibratedProfiles]:
-    if calibrated_profiles:
-        for calibrated_profile in calibrated_profiles:
-            _, profile, _ = get_linkedin_profile_with_companies(calibrated_profile.url)
-            calibrated_profile.profile = profile
+    """
+    Attach LinkedIn profiles to calibrations, fetching each distinct profile once
+    and up to CALIBRATION_FETCH_CONCURRENCY at a time. A calibration whose
+    profile cannot be fetched keeps the profile it already had.
+    """
+    if not calibrated_profiles:
+        return calibrated_profiles
+
+    urls = {}
+    for calibrated_profile in calibrated_profiles:
+        key = extract_linkedin_id(calibrated_profile.url) or calibrated_profile.url
+        urls.setdefault(key, calibrated_profile.url)
+
+    workers = max(1, min(CALIBRATION_FETCH_CONCURRENCY, len(urls)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        profiles = dict(
+            zip(urls, executor.map(_fetch_calibration_profile, urls.values()))
+        )
+
+    for calibrated_profile in calibrated_profiles:
+        key = extract_linkedin_id(calibrated_profile.url) or calibrated_profile.url
+        if profiles[key] is not None:
+            calibrated_profile.profile = profiles[key]
     return calibrated_profiles
 
 
@@ -153,16 +201,14 @@ def edit_job_description_llm_helper(
     return output
 
 
-@traceable(name="get_reachout_message")
-def get_reachout_message(
+def _reachout_messages(
     name: str,
     job_description: str,
     sections: list[dict],
     citations: list[dict],
     format: str,
-    user_id: str = None,
-    template_content: str = None,
-) -> str:
+    template: str,
+) -> list:
     sections_str = "\n".join(
         [f"{section['section']}: {section['content']} " for section in sections]
     )
@@ -170,18 +216,6 @@ def get_reachout_message(
         [f"{citation['distilled_content']}" for citation in citations]
     )
 
-    # Use provided test template if available, otherwise get user's templates
-    if template_content:
-        template = template_content
-    else:
-        template = "No template provided - use default professional recruiting style."
-        if user_id:
-            templates = get_user_templates(user_id)
-            if format == "linkedin":
-                template = templates.linkedin_template or template
-            else:
-                template = templates.email_template or template
-
     # Use default prompt based on format
     prompt = (
         reachout_message_prompt_linkedin
@@ -189,20 +223,52 @@ def get_reachout_message(
         else reachout_message_prompt_email
     )
 
-    output = llm.invoke(
-        [
-            SystemMessage(
-                content=prompt.format(
-                    name=name,
-                    job_description=job_description,
-                    sections=sections_str,
-                    citations=citations_str,
-                    template=template,
-                )
-            ),
-            HumanMessage(
-                content="Generate a message that strictly follows the provided template structure and style, while personalizing the specific details for this candidate. Make sure to include all key elements from the template."
-            ),
-        ]
+    return [
+        SystemMessage(
+            content=prompt.format(
+                name=name,
+                job_description=job_description,
+                sections=sections_str,
+                citations=citations_str,
+                template=template,
+            )
+        ),
+        HumanMessage(
+            content="Generate a message that strictly follows the provided template structure and style, while personalizing the specific details for this candidate. Make sure to include all key elements from the template."
+        ),
+    ]
+
+
+def _select_template(templates: UserTemplates | None, format: str) -> str:
+    template = "No template provided - use default professional recruiting style."
+    if templates:
+        if format == "linkedin":
+            template = templates.linkedin_template or template
+        else:
+            template = templates.email_template or template
+    return template
+
+
+@traceable(name="get_reachout_message")
+async def aget_reachout_message(
+    name: str,
+    job_description: str,
+    sections: list[dict],
+    citations: list[dict],
+    format: str,
+    user_id: str = None,
+    template_content: str = None,
+) -> str:
+    # Use provided test template if available, otherwise get user's templates
+    if template_content:
+        template = template_content
+    else:
+        template = _select_template(
+            await firestore_async.get_user_templates(user_id) if user_id else None,
+            format,
+        )
+
+    output = await llm.ainvoke(
+        _reachout_messages(name, job_description, sections, citations, format, template)
     )
     return output.content
@@ -1,5 +1,10 @@
+import os
 import re
-from models.linkedin import LinkedInProfile, LinkedInCompany
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable
+from models.linkedin import LinkedInProfile, LinkedInCompany, LinkedInExperience
 
 from services.proxycurl import get_linkedin_profile
 from services.firestore import db
@@ -8,34 +13,155 @@ import services.firestore as firestore
 from utils.linkedin_utils import extract_linkedin_id
 
 
+COMPANY_ID_PATTERN = re.compile(r"linkedin\.com/company/([^/?]+)")
+# Number of LinkedInCompany objects kept in the process-local cache
+COMPANY_CACHE_SIZE = int(os.getenv("COMPANY_CACHE_SIZE", "5000"))
+# Seconds a cached company is served before it is read from Firebase again
+COMPANY_CACHE_TTL_SECONDS = int(os.getenv("COMPANY_CACHE_TTL_SECONDS", "3600"))
+# Document references per Firestore get_all call
+COMPANY_BATCH_SIZE = 100
+
+_company_cache: OrderedDict[str, tuple[LinkedInCompany, float]] = OrderedDict()
+# Company IDs being read by another thread, mapped to the read's outcome
+_company_fetches: dict[str, "_CompanyFetch"] = {}
+_company_cache_lock = threading.Lock()
+
+
+class _CompanyFetch:
+    """A company read in progress that other threads can wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.failed = False
+
+
+def get_company_id(exp: LinkedInExperience) -> str | None:
+    """Extract the LinkedIn company ID from an experience, ignoring schools."""
+    if (
+        not exp.company_linkedin_profile_url
+        or "school" in exp.company_linkedin_profile_url
+    ):
+        return None
+    match = COMPANY_ID_PATTERN.search(exp.company_linkedin_profile_url)
+    return match.group(1) if match else None
+
+
+def get_companies(company_ids: Iterable[str]) -> dict[str, LinkedInCompany]:
+    """
+    Resolve company IDs to LinkedInCompany objects.
+
+    Popular companies are served from a process-local LRU cache for up to
+    COMPANY_CACHE_TTL_SECONDS; the rest are read from Firebase with chunked
+    get_all calls. A company another thread is already reading is waited for
+    instead of read again, so concurrent tasks in a bulk batch share reads.
+    Unknown companies are left out of the result.
+
+    Returned companies are shared with other callers and must be treated as
+    read-only; assigning to their fields raises TypeError.
+    """
+    companies = {}
+    missing = []
+    waiting = []
+    now = time.monotonic()
+    fetch = _CompanyFetch()
+    with _company_cache_lock:
+        for company_id in dict.fromkeys(company_ids):
+            entry = _company_cache.get(company_id)
+            if entry is not None and entry[1] > now:
+                _company_cache.move_to_end(company_id)
+                companies[company_id] = entry[0]
+            elif company_id in _company_fetches:
+                waiting.append((company_id, _company_fetches[company_id]))
+            else:
+                _company_fetches[company_id] = fetch
+                missing.append(company_id)
+
+    fetched = {}
+    try:
+        fetched = _read_companies(missing)
+    except Exception:
+        fetch.failed = True
+        raise
+    finally:
+        _finish_company_fetch(missing, fetched, fetch)
+    companies.update(fetched)
+
+    # Read again whatever another thread failed to read for us
+    retry = []
+    for company_id, other in waiting:
+        other.done.wait()
+        with _company_cache_lock:
+            entry = _company_cache.get(company_id)
+        if entry is not None:
+            companies[company_id] = entry[0]
+        elif other.failed:
+            retry.append(company_id)
+    if retry:
+        companies.update(_read_companies(retry))
+
+    return companies
+
+
+def _read_companies(company_ids: list[str]) -> dict[str, LinkedInCompany]:
+    """Read companies from Firebase in chunks, marking each one read-only."""
+    fetched = {}
+    for i in range(0, len(company_ids), COMPANY_BATCH_SIZE):
+        refs = [
+            db.collection("companies").document(company_id)
+            for company_id in company_ids[i : i + COMPANY_BATCH_SIZE]
+        ]
+        for doc in db.get_all(refs):
+            if doc.exists:
+                company = LinkedInCompany(**doc.to_dict())
+                company.make_read_only()
+                fetched[doc.id] = company
+    return fetched
+
+
+def _finish_company_fetch(
+    company_ids: list[str], fetched: dict[str, LinkedInCompany], fetch: _CompanyFetch
+) -> None:
+    """Cache what a read returned and wake the threads waiting for it."""
+    expires_at = time.monotonic() + COMPANY_CACHE_TTL_SECONDS
+    with _company_cache_lock:
+        for company_id, company in fetched.items():
+            _company_cache[company_id] = (company, expires_at)
+            _company_cache.move_to_end(company_id)
+        while len(_company_cache) > COMPANY_CACHE_SIZE:
+            _company_cache.popitem(last=False)
+        for company_id in company_ids:
+            _company_fetches.pop(company_id, None)
+    fetch.done.set()
+
+
+def get_experience_companies_batch(profiles: list[LinkedInProfile]) -> None:
+    """
+    Attach company data to every experience across a batch of profiles.
+    Company IDs are collected from all profiles first so each company is
+    resolved once and shared between candidates.
+    """
+    company_ids = [
+        company_id
+        for profile in profiles
+        for exp in profile.experiences
+        if (company_id := get_company_id(exp))
+    ]
+    companies = get_companies(company_ids)
+
+    for profile in profiles:
+        for exp in profile.experiences:
+            company_id = get_company_id(exp)
+            if company_id:
+                exp.company_data = companies.get(company_id)
+
+
 def get_experience_companies(profile: LinkedInProfile) -> None:
     """
     Get and store company data for all experiences in a profile.
     If company exists in Firebase, use cached data.
-    If not, fetch from Crustdata and store in Firebase.
     Attaches company data to each experience in the profile.
     """
-    for exp in profile.experiences:
-        if (
-            exp.company_linkedin_profile_url
-            and "school" not in exp.company_linkedin_profile_url
-        ):
-            # Extract company ID from URL using regex
-            match = re.search(
-                r"linkedin\.com/company/([^/?]+)", exp.company_linkedin_profile_url
-            )
-            company_id = match.group(1) if match else None
-
-            if company_id:
-                company_ref = db.collection("companies").document(company_id)
-                company_doc = company_ref.get()
-
-                if company_doc.exists:
-                    # Use cached company data
-                    company_data = company_doc.to_dict()
-                    exp.company_data = LinkedInCompany(**company_data)
-                else:
-                    exp.company_data = None
+    get_experience_companies_batch([profile])
 
 
 def get_linkedin_profile_with_companies(
@@ -52,17 +178,24 @@ def get_linkedin_profile_with_companies(
             # First get the basic profile
             full_name, profile, public_id = get_linkedin_profile(url)
 
-        # Get and store company data for experiences
-        get_experience_companies(profile)
-
-        profile.analyze_career()
-
-        # Save profile to Firebase - company_data will be automatically excluded
-        profile_dict = profile.dict()
-        profile_ref = db.collection("candidates").document(public_id)
-        profile_ref.set(profile_dict, merge=True)
-
-        return full_name, profile, public_id
+        return enrich_linkedin_profile(full_name, profile, public_id)
     except Exception as e:
         logging.error(f"Failed to get LinkedIn profile for URL {url}: {str(e)}")
         raise
+
+
+def enrich_linkedin_profile(
+    full_name: str, profile: LinkedInProfile, public_id: str
+) -> tuple[str, LinkedInProfile, str]:
+    """Attach company data, analyze the career and save the profile to Firebase."""
+    # Get and store company data for experiences
+    get_experience_companies(profile)
+
+    profile.analyze_career()
+
+    # Save profile to Firebase - company_data will be automatically excluded
+    profile_dict = profile.dict()
+    profile_ref = db.collection("candidates").document(public_id)
+    profile_ref.set(profile_dict, merge=True)
+
+    return full_name, profile, public_id
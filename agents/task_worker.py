@@ -0,0 +1,277 @@
+"""
+Workers that drain the durable task queue.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from fastapi.concurrency import run_in_threadpool
+import services.firestore as firestore
+from agents.candidate_processor import CandidateProcessor
+from models.tasks import QueuedTask
+from services.scheduler import limiter
+from services.task_queue import TASK_MAX_ATTEMPTS, LeaseLostError, get_task_queue
+from services.credit_ledger import get_credit_ledger
+
+# Number of tasks a single worker process runs at once
+TASK_WORKER_CONCURRENCY = int(os.getenv("TASK_WORKER_CONCURRENCY", "10"))
+# Whether the API process drains the queue itself after enqueueing work
+TASK_QUEUE_INLINE = os.getenv("TASK_QUEUE_INLINE", "true").lower() == "true"
+# Seconds between sweeps for batches whose last worker died before finishing them
+BATCH_SWEEP_INTERVAL_SECONDS = int(os.getenv("BATCH_SWEEP_INTERVAL_SECONDS", "300"))
+# Age a reservation must reach before it is swept, so its tasks are queued by then
+BATCH_SWEEP_GRACE_SECONDS = int(os.getenv("BATCH_SWEEP_GRACE_SECONDS", "300"))
+
+
+class PermanentTaskError(Exception):
+    """Raised when retrying a task cannot succeed."""
+
+
+async def _get_processor(payload: dict) -> CandidateProcessor:
+    job_data = await limiter.run_in_threadpool(
+        "firestore", firestore.get_job, payload["job_id"], payload["user_id"]
+    )
+    if not job_data:
+        raise PermanentTaskError(f"Job {payload['job_id']} not found")
+    return CandidateProcessor(payload["job_id"], job_data, payload["user_id"])
+
+
+async def process_url_task(task: QueuedTask) -> bool:
+    """Fetch and evaluate a candidate from a LinkedIn URL.
+
+    Returns:
+        bool: Whether the candidate consumed a search credit
+    """
+    payload = task.payload
+    processor = await _get_processor(payload)
+    candidate = await processor.aget_candidate_record({"url": payload["url"]})
+    if candidate is None:
+        raise PermanentTaskError(f"Could not fetch profile for {payload['url']}")
+    return await processor.process_single_candidate(
+        candidate,
+        payload["search_mode"],
+        final_attempt=task.attempts >= TASK_MAX_ATTEMPTS,
+    )
+
+
+async def evaluate_candidate_task(task: QueuedTask) -> None:
+    """Reevaluate a candidate already attached to a job."""
+    payload = task.payload
+    processor = await _get_processor(payload)
+    in_job = await limiter.run_in_threadpool(
+        "firestore",
+        firestore.check_candidate_in_job,
+        payload["job_id"],
+        payload["candidate_id"],
+        payload["user_id"],
+    )
+    if not in_job:
+        raise PermanentTaskError(f"Candidate {payload['candidate_id']} was removed")
+    candidate = await limiter.run_in_threadpool(
+        "firestore",
+        firestore.get_full_candidate,
+        payload["job_id"],
+        payload["candidate_id"],
+        payload["user_id"],
+    )
+    await processor.process_single_candidate(
+        candidate,
+        payload["search_mode"],
+        final_attempt=task.attempts >= TASK_MAX_ATTEMPTS,
+    )
+
+
+TASK_HANDLERS = {
+    "process_url": process_url_task,
+    "evaluate_candidate": evaluate_candidate_task,
+}
+
+
+async def run_task(task: QueuedTask) -> None:
+    """Run a claimed task and record its outcome in the queue."""
+    queue = get_task_queue()
+    if task.status == "failed":
+        # The queue gave up on a task whose worker died on its last attempt
+        logging.error(f"Task {task.id} ({task.kind}) failed: {task.error}")
+        charged = False
+    else:
+        try:
+            handler = TASK_HANDLERS.get(task.kind)
+            if handler is None:
+                raise PermanentTaskError(f"Unknown task kind: {task.kind}")
+            result = await handler(task)
+        except Exception as e:
+            logging.error(f"Task {task.id} ({task.kind}) failed: {str(e)}")
+            retry = not isinstance(e, PermanentTaskError)
+            try:
+                if await run_in_threadpool(queue.fail, task, str(e), retry):
+                    return
+            except LeaseLostError:
+                logging.warning(f"Task {task.id} lost its lease; dropping its failure")
+                return
+            charged = False
+        else:
+            try:
+                await run_in_threadpool(queue.complete, task)
+            except LeaseLostError:
+                # Another worker holds the task now and records its own outcome
+                logging.warning(f"Task {task.id} lost its lease; dropping its result")
+                return
+            charged = bool(result)
+    # The credit is recorded only once the task is finished under this lease
+    try:
+        await _record_credit(task, charged=charged)
+        if task.batch_id and task.kind == "process_url":
+            await _finish_batch(task)
+    except Exception as e:
+        logging.error(f"Task {task.id} ({task.kind}) finished but not settled: {e}")
+
+
+async def _record_credit(task: QueuedTask, charged: bool) -> None:
+    """Commit or refund the credit reserved for a URL task."""
+    if task.kind != "process_url":
+        return
+    reservation_id = task.payload.get("reservation_id")
+    if reservation_id:
+        ledger = get_credit_ledger()
+        if charged:
+            await limiter.run_in_threadpool(
+                "firestore", ledger.commit, reservation_id, task.id
+            )
+        elif not await limiter.run_in_threadpool(
+            "firestore", ledger.refund, reservation_id, task.id
+        ):
+            logging.warning(f"Task {task.id} already committed its credit; not refunded")
+    elif charged:
+        # Tasks queued before reservations existed pay as they complete
+        await limiter.run_in_threadpool(
+            "firestore", firestore.decrement_search_credits, task.payload["user_id"]
+        )
+
+
+async def _finish_batch(task: QueuedTask) -> None:
+    """
+    Remove the loading indicator and refund unused credits once every task in
+    its batch is finished.
+    """
+    queue = get_task_queue()
+    if await run_in_threadpool(queue.count_open, task.batch_id) == 0:
+        await _settle_batch(
+            task.batch_id,
+            task.payload["job_id"],
+            task.payload["user_id"],
+            task.payload.get("reservation_id"),
+        )
+
+
+async def _settle_batch(
+    batch_id: str, job_id: str | None, user_id: str, reservation_id: str | None
+) -> None:
+    if reservation_id:
+        await run_in_threadpool(get_credit_ledger().settle, reservation_id)
+    await run_in_threadpool(firestore.delete_candidate, batch_id)
+    if job_id:
+        await run_in_threadpool(
+            firestore.remove_candidate_from_job, job_id, batch_id, user_id
+        )
+
+
+async def sweep_finished_batches() -> int:
+    """
+    Finish batches whose tasks are all done but which were never settled,
+    because the worker that ran their last task died before it could.
+
+    Returns:
+        int: The number of batches settled
+    """
+    queue = get_task_queue()
+    reservations = await limiter.run_in_threadpool(
+        "firestore",
+        get_credit_ledger().open_reservations,
+        time.time() - BATCH_SWEEP_GRACE_SECONDS,
+    )
+    settled = 0
+    for reservation in reservations:
+        if await run_in_threadpool(queue.count_open, reservation["id"]):
+            continue
+        logging.warning(f"Settling batch {reservation['id']} left open by its worker")
+        # The reservation ID doubles as the batch ID and the loading row's ID
+        await _settle_batch(
+            reservation["id"],
+            reservation.get("job_id"),
+            reservation["user_id"],
+            reservation["id"],
+        )
+        settled += 1
+    return settled
+
+
+async def _sweep_safely() -> None:
+    try:
+        await sweep_finished_batches()
+    except Exception as e:
+        logging.error(f"Sweeping finished batches failed: {str(e)}")
+
+
+async def drain_task_queue(
+    concurrency: int = TASK_WORKER_CONCURRENCY, stop_when_empty: bool = True
+) -> None:
+    """
+    Claim and run tasks with up to `concurrency` in flight.
+
+    With stop_when_empty the workers exit once no runnable task is left;
+    otherwise they poll for new work forever. Batches left unsettled by a
+    dead worker are swept after the drain, or every
+    BATCH_SWEEP_INTERVAL_SECONDS while polling.
+    """
+    queue = get_task_queue()
+
+    async def worker():
+        while True:
+            task = await run_in_threadpool(queue.claim)
+            if task is None:
+                if stop_when_empty:
+                    return
+                await asyncio.sleep(5)
+                continue
+            await run_task(task)
+
+    async def sweeper():
+        while True:
+            await _sweep_safely()
+            await asyncio.sleep(BATCH_SWEEP_INTERVAL_SECONDS)
+
+    workers = [worker() for _ in range(max(1, concurrency))]
+    if stop_when_empty:
+        await asyncio.gather(*workers)
+        await _sweep_safely()
+    else:
+        await asyncio.gather(*workers, sweeper())
+
+
+_drain_requests = 0
+_draining = False
+
+
+async def request_drain() -> None:
+    """
+    Drain the queue from the API process when no separate workers are deployed.
+
+    Only one inline drain runs per process; requests arriving while it runs
+    make it check the queue again before exiting.
+    """
+    global _drain_requests, _draining
+    if not TASK_QUEUE_INLINE:
+        return
+    _drain_requests += 1
+    if _draining:
+        return
+    _draining = True
+    try:
+        seen = -1
+        while seen != _drain_requests:
+            seen = _drain_requests
+            await drain_task_queue()
+    finally:
+        _draining = False
@@ -10,6 +10,7 @@ from fastapi import (
 )
 from fastapi.middleware.cors import CORSMiddleware
 import services.firestore as firestore
+import services.firestore_async as firestore_async
 from models.jobs import Job, JobDescription, Candidate
 from models.api import (
     BulkLinkedInPayload,
@@ -28,35 +29,52 @@ from models.api import (
     HeadlessEvaluationPayload,
 )
 from dotenv import load_dotenv
-from services.proxycurl import get_email, get_linkedin_profile
+from services.proxycurl import aget_email, get_linkedin_profile
 from agents.helper_functions import (
     get_key_traits,
-    get_reachout_message,
     get_calibrated_profiles_linkedin,
     edit_key_traits_llm_helper,
     edit_job_description_llm_helper,
-    headless_evaluate_helper,
+    aheadless_evaluate_helper,
+    aget_reachout_message,
+)
+from services.firebase_auth import (
+    verify_firebase_token,
+    token_cache,
 )
-from services.firebase_auth import verify_firebase_token
 from agents.candidate_processor import CandidateProcessor
+from agents.task_worker import request_drain
+from services.credit_ledger import InsufficientCreditsError
 from services.stripe import create_checkout_session
 import logging
 import sys
-from services.firestore import (
-    get_user_templates,
-    set_user_templates,
-    get_custom_instructions,
-    set_custom_instructions,
-)
 from models.templates import UserTemplates
 from models.instructions import CustomInstructions
 from pydantic import BaseModel
 from services.proxycurl import get_linkedin_profile
+from services.get_secret import secret_cache
+from services.eval_cache import eval_cache
+from services.evaluate import graph_clients
+from services.llms import llm_health
+from services.proxycurl import aget_linkedin_profile, proxycurl_client
+from contextlib import asynccontextmanager
+from fastapi.concurrency import run_in_threadpool
+import asyncio
 
 
 load_dotenv()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the secret cache so the first requests don't wait on Secret Manager
+    secret_cache.prefetch()
+    yield
+    await proxycurl_client.close()
+    await graph_clients.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -180,20 +198,22 @@ async def generate_reachout(
     user_id: str = Depends(validate_user_id),
 ):
     try:
-        job = firestore.get_job(job_id, user_id)
+        job = await firestore_async.get_job(job_id, user_id)
         if not job:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Job with id {job_id} not found",
             )
-        candidate = firestore.get_full_candidate(job_id, candidate_id, user_id)
+        candidate = await firestore_async.get_full_candidate(
+            job_id, candidate_id, user_id
+        )
         if not candidate:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Candidate with id {candidate_id} not found",
             )
 
-        reachout = get_reachout_message(
+        reachout = await aget_reachout_message(
             name=candidate["name"],
             job_description=job["job_description"],
             sections=candidate["sections"],
@@ -212,10 +232,23 @@ async def generate_reachout(
 
 @app.post("/headless_evaluate")
 async def headless_evaluate(payload: HeadlessEvaluationPayload):
-    if payload.url:
-        _, candidate, _ = get_linkedin_profile(payload.url)
-    else:
-        candidate = payload.candidate
+    async def resolve_profile(url, profile):
+        if url:
+            _, profile, _ = await aget_linkedin_profile(url)
+        return profile
+
+    # Fetch the candidate and every calibration profile concurrently
+    candidate_result, *calibration_results = await asyncio.gather(
+        resolve_profile(payload.url, payload.candidate),
+        *(
+            resolve_profile(calibration.url, calibration.candidate)
+            for calibration in payload.calibrations
+        ),
+        return_exceptions=True,
+    )
+    if isinstance(candidate_result, Exception):
+        raise candidate_result
+    candidate = candidate_result
 
     if not candidate:
         raise HTTPException(
@@ -223,12 +256,12 @@ async def headless_evaluate(payload: HeadlessEvaluationPayload):
             detail=f"Candidate with id {payload.url} not found",
         )
     calibrations = []
-    for calibration in payload.calibrations:
+    for calibration, calibration_candidate in zip(
+        payload.calibrations, calibration_results
+    ):
         try:
-            if calibration.url:
-                _, calibration_candidate, _ = get_linkedin_profile(calibration.url)
-            else:
-                calibration_candidate = calibration.candidate
+            if isinstance(calibration_candidate, Exception):
+                raise calibration_candidate
             calibrations.append({
                 "candidate_name": calibration_candidate.full_name,
                 "candidate_context": calibration_candidate.to_context_string(),
@@ -238,7 +271,7 @@ async def headless_evaluate(payload: HeadlessEvaluationPayload):
             print(e)
             continue
     
-    return headless_evaluate_helper(candidate.full_name, candidate.to_context_string(), payload.job_description, calibrations)
+    return await aheadless_evaluate_helper(candidate.full_name, candidate.to_context_string(), payload.job_description, calibrations)
     
 
 # Candidate Management Endpoints
@@ -250,14 +283,7 @@ async def create_candidate(
     background_tasks: BackgroundTasks,
     user_id: str = Depends(validate_user_id),
 ):
-    search_credits = firestore.get_search_credits(user_id)
-    if search_credits <= 0:
-        raise HTTPException(
-            status_code=status.HTTP_402_PAYMENT_REQUIRED,
-            detail="You have no search credits remaining",
-        )
-
-    job_data = firestore.get_job(job_id, user_id)
+    job_data = await firestore_async.get_job(job_id, user_id)
     if not job_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -265,10 +291,17 @@ async def create_candidate(
         )
 
     processor = CandidateProcessor(job_id, job_data, user_id)
+    try:
+        await run_in_threadpool(
+            processor.enqueue_urls, [candidate.url], search_mode=candidate.search_mode
+        )
+    except InsufficientCreditsError:
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail="You have no search credits remaining",
+        )
 
-    background_tasks.add_task(
-        processor.process_urls, [candidate.url], search_mode=candidate.search_mode
-    )
+    background_tasks.add_task(request_drain)
     return {"message": "Candidate processing started"}
 
 
@@ -278,11 +311,31 @@ def get_candidates(
     filter_traits: list[str] | None = Query(
         None, description="List of traits to filter by"
     ),
+    limit: int | None = Query(
+        None,
+        ge=1,
+        le=200,
+        description="Page size; when set, returns a list-view page and a cursor",
+    ),
+    cursor: str | None = Query(
+        None, description="Cursor returned by the previous page"
+    ),
     user_id: str = Depends(validate_user_id),
 ):
     try:
+        if limit or cursor:
+            candidates, next_cursor = firestore.get_candidates_page(
+                job_id, user_id, limit or 50, cursor, filter_traits
+            )
+            return {"candidates": candidates, "next_cursor": next_cursor}
+
         candidates = firestore.get_candidates(job_id, user_id, filter_traits)
         return {"candidates": candidates}
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except Exception as e:
         print(e)
         raise HTTPException(
@@ -313,27 +366,31 @@ async def create_candidates_bulk(
     payload: BulkLinkedInPayload,
     user_id: str = Depends(validate_user_id),
 ):
-    search_credits = firestore.get_search_credits(user_id)
-    num_urls = len(payload.urls)
-
-    if search_credits < num_urls:
-        raise HTTPException(
-            status_code=status.HTTP_402_PAYMENT_REQUIRED,
-            detail=f"Insufficient search credits. You have {search_credits} credits but need {num_urls} credits to process all URLs.",
-        )
-
-    job_data = firestore.get_job(job_id, user_id)
+    job_data = await firestore_async.get_job(job_id, user_id)
     if not job_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Job with id {job_id} not found",
         )
+    if not payload.urls:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No LinkedIn URLs provided",
+        )
 
+    # Credits for every URL are reserved atomically before any work is queued
     processor = CandidateProcessor(job_id, job_data, user_id)
+    try:
+        await run_in_threadpool(
+            processor.enqueue_urls, payload.urls, search_mode=payload.search_mode
+        )
+    except InsufficientCreditsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail=str(e),
+        )
 
-    background_tasks.add_task(
-        processor.process_urls, payload.urls, search_mode=payload.search_mode
-    )
+    background_tasks.add_task(request_drain)
     return {"message": "Candidates processing started"}
 
 
@@ -396,7 +453,8 @@ def edit_key_traits(
         )
 
     processor = CandidateProcessor(job_id, job_data, user_id)
-    background_tasks.add_task(processor.reevaluate_candidates)
+    processor.enqueue_reevaluation()
+    background_tasks.add_task(request_drain)
 
     return {"message": "Candidate processing started"}
 
@@ -435,7 +493,8 @@ def edit_job_description(
         )
     
     processor = CandidateProcessor(job_id, job_data, user_id)
-    background_tasks.add_task(processor.reevaluate_candidates)
+    processor.enqueue_reevaluation()
+    background_tasks.add_task(request_drain)
 
     return {"message": "Candidate processing started"}
 
@@ -465,7 +524,7 @@ async def recalibrate_candidate(
 ):
     """Recalibrate a single candidate"""
     try:
-        job_data = firestore.get_job(job_id, user_id)
+        job_data = await firestore_async.get_job(job_id, user_id)
         if not job_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -480,6 +539,7 @@ async def recalibrate_candidate(
             payload.fit,
             payload.reasoning,
         )
+        background_tasks.add_task(request_drain)
         return {"message": "Candidate recalibration started"}
     except Exception as e:
         raise HTTPException(
@@ -497,7 +557,7 @@ async def bulk_recalibrate_candidates(
 ):
     """Recalibrate multiple candidates in bulk"""
     try:
-        job_data = firestore.get_job(job_id, user_id)
+        job_data = await firestore_async.get_job(job_id, user_id)
         if not job_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -506,6 +566,7 @@ async def bulk_recalibrate_candidates(
 
         processor = CandidateProcessor(job_id, job_data, user_id)
         background_tasks.add_task(processor.bulk_calibrate_candidates, payload.feedback)
+        background_tasks.add_task(request_drain)
         return {"message": "Bulk recalibration started"}
     except Exception as e:
         raise HTTPException(
@@ -569,18 +630,23 @@ def get_linkedin_context_request(url: str, user_id: str = Depends(validate_user_
 
 
 @app.post("/get-email")
-def get_email_request(
+async def get_email_request(
     payload: GetEmailPayload, user_id: str = Depends(validate_user_id)
 ):
     try:
-        email = get_email(payload.linkedin_profile_url)
-        return {"email": email}
+        email = await aget_email(payload.linkedin_profile_url)
     except Exception as e:
         print(e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving email: {str(e)}",
         )
+    if email is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No email found for this LinkedIn profile",
+        )
+    return {"email": email}
 
 
 # User Settings and Templates
@@ -590,7 +656,7 @@ async def update_user_templates(
     user_id: str = Depends(validate_user_id),
 ):
     """Update user's templates"""
-    return set_user_templates(user_id, templates)
+    return await firestore_async.set_user_templates(user_id, templates)
 
 
 @app.get("/settings/templates", response_model=UserTemplates)
@@ -598,7 +664,7 @@ async def get_all_user_templates(
     user_id: str = Depends(validate_user_id),
 ):
     """Get user's templates"""
-    return get_user_templates(user_id)
+    return await firestore_async.get_user_templates(user_id)
 
 
 @app.put("/settings/evaluation-instructions", response_model=CustomInstructions)
@@ -607,7 +673,7 @@ async def update_evaluation_instructions(
     user_id: str = Depends(validate_user_id),
 ):
     """Update user's custom evaluation instructions"""
-    return set_custom_instructions(user_id, instructions)
+    return await firestore_async.set_custom_instructions(user_id, instructions)
 
 
 @app.get("/settings/evaluation-instructions", response_model=CustomInstructions)
@@ -615,7 +681,7 @@ async def get_evaluation_instructions(
     user_id: str = Depends(validate_user_id),
 ):
     """Get user's custom evaluation instructions"""
-    return get_custom_instructions(user_id)
+    return await firestore_async.get_custom_instructions(user_id)
 
 
 # Payment and Credits
@@ -660,7 +726,7 @@ async def stripe_webhook(request: Request):
 
         from services.stripe_webhook import handle_stripe_webhook
 
-        return await handle_stripe_webhook(payload_str, sig_header)
+        return await run_in_threadpool(handle_stripe_webhook, payload_str, sig_header)
 
     except HTTPException:
         raise
@@ -753,7 +819,7 @@ async def test_reachout_template(
         }
 
         # Generate message with test template
-        reachout = get_reachout_message(
+        reachout = await aget_reachout_message(
             name=fake_candidate["name"],
             job_description=fake_job["job_description"],
             sections=fake_candidate["sections"],
@@ -782,7 +848,7 @@ async def update_calibrated_profiles(
 ):
     """Update calibrated profiles for a job"""
     try:
-        job_data = firestore.get_job(job_id, user_id)
+        job_data = await firestore_async.get_job(job_id, user_id)
         if not job_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -790,8 +856,8 @@ async def update_calibrated_profiles(
             )
 
         # Get LinkedIn profiles for calibrated candidates
-        calibrated_profiles = get_calibrated_profiles_linkedin(
-            payload.calibrated_profiles
+        calibrated_profiles = await run_in_threadpool(
+            get_calibrated_profiles_linkedin, payload.calibrated_profiles
         )
 
         # Update the calibrated candidates
@@ -803,9 +869,10 @@ async def update_calibrated_profiles(
         ]
 
         # Update the job in Firestore
-        firestore.edit_job(job_id, user_id, job_data)
+        await firestore_async.edit_job(job_id, user_id, job_data)
         processor = CandidateProcessor(job_id, job_data, user_id)
-        background_tasks.add_task(processor.reevaluate_candidates)
+        await run_in_threadpool(processor.enqueue_reevaluation)
+        background_tasks.add_task(request_drain)
 
         return {
             "calibrated_profiles": job_data["calibrated_profiles"],
@@ -835,3 +902,15 @@ def get_candidate(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving candidate: {str(e)}",
         )
+
+
+# Monitoring
+@app.get("/metrics")
+def get_metrics(user_id: str = Depends(validate_user_id)):
+    """Cache and dependency health counters"""
+    return {
+        "secrets": secret_cache.stats(),
+        "evaluation_cache": eval_cache.stats(),
+        "auth_tokens": token_cache.stats(),
+        "llm": llm_health(),
+    }
@@ -2,10 +2,13 @@
 LinkedIn data models with standardized serialization.
 """
 
+import bisect
+import itertools
 import re
+import threading
 from datetime import date
+from pydantic import PrivateAttr
 from .serializable import SerializableModel
-from services.firestore import db
 from .career import CareerMetrics, FundingType
 
 
@@ -19,7 +22,163 @@ class Funding(SerializableModel):
     investor_list: list[str] = []
 
 
-class LinkedInCompany(SerializableModel):
+class FundingTimeline:
+    """Dated funding rounds of a company in announcement order, searchable by date."""
+
+    def __init__(self, funding_data: list[Funding]):
+        # sorted() is stable, so rounds announced on the same day keep their order
+        rounds = sorted(
+            (f for f in funding_data if f.announced_date),
+            key=lambda f: f.announced_date,
+        )
+        self.dates = [f.announced_date for f in rounds]
+        self.stages = [f.funding_type for f in rounds]
+
+    def stage_at(self, target_date: date) -> FundingType:
+        """Stage of the last round announced on or before `target_date`."""
+        i = bisect.bisect_right(self.dates, target_date)
+        return self.stages[i - 1] if i else FundingType.UNKNOWN
+
+    def stages_between(
+        self, start_date: date, end_date: date, cutoff_date: date | None = None
+    ) -> list[FundingType]:
+        """
+        Stage reached by `end_date` followed by each stage change after
+        `start_date`, ignoring rounds announced before `cutoff_date`.
+        """
+        first_valid = bisect.bisect_left(self.dates, cutoff_date) if cutoff_date else 0
+        if first_valid == len(self.dates):
+            return [FundingType.UNKNOWN]
+
+        current_stage = self.stage_at(start_date)
+        relevant_rounds = []
+        lo = max(bisect.bisect_right(self.dates, start_date), first_valid)
+        hi = bisect.bisect_right(self.dates, end_date)
+        for stage in self.stages[lo:hi]:
+            if stage != current_stage:
+                relevant_rounds.append(stage)
+                current_stage = stage
+
+        # Enum hashing is slow, and these lists are short, so dedupe by scanning
+        stages = [current_stage]
+        for stage in relevant_rounds:
+            if stage not in stages:
+                stages.append(stage)
+        return stages
+
+
+# Bumped on every field assignment to a TrackedModel
+_mutations = itertools.count(1)
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+class FrozenList(list):
+    """
+    List field of a TrackedModel. In-place changes would not be seen by the
+    render caches, so they raise TypeError; assign a new list instead.
+    """
+
+    def _refuse(self, *args, **kwargs):
+        raise TypeError(
+            "Lists on LinkedIn models cannot be changed in place; assign a new list"
+        )
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _refuse
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _refuse
+
+    def __reduce__(self):
+        # Copies are rebuilt from a plain list, since extend() is refused
+        return (FrozenList, (list(self),))
+
+
+class TrackedModel(SerializableModel):
+    """
+    Model that counts assignments to its fields, so text rendered from it can
+    be cached and thrown away when it changes.
+
+    List fields are stored as FrozenList, so they can only change by being
+    assigned.
+    """
+
+    _revision: int = PrivateAttr(default=0)
+    _rendered: tuple | None = PrivateAttr(default=None)
+    _read_only: bool = PrivateAttr(default=False)
+
+    def model_post_init(self, context) -> None:
+        fields = self.__dict__
+        for name, value in fields.items():
+            if type(value) is list:
+                fields[name] = FrozenList(value)
+
+    def __setattr__(self, name, value):
+        global _generation
+        if not name.startswith("_") and self.__pydantic_private__["_read_only"]:
+            raise TypeError(
+                f"{type(self).__name__} is shared and read-only; "
+                "assign to a model_copy() instead"
+            )
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            fields = self.__dict__
+            if type(fields.get(name)) is list:
+                fields[name] = FrozenList(fields[name])
+            private = self.__pydantic_private__
+            with _generation_lock:
+                private["_revision"] += 1
+                private["_rendered"] = None
+                _generation = next(_mutations)
+
+    def make_read_only(self) -> None:
+        """Refuse further field assignments, for models shared between callers."""
+        self.__pydantic_private__["_read_only"] = True
+
+    def model_copy(self, *, update=None, deep: bool = False):
+        """Copy the model; the copy is writable even if this model is read-only."""
+        global _generation
+        copied = super().model_copy(update=update, deep=deep)
+        private = copied.__pydantic_private__
+        private["_read_only"] = False
+        if update:
+            copied.model_post_init(None)
+            with _generation_lock:
+                private["_revision"] += 1
+                private["_rendered"] = None
+                _generation = next(_mutations)
+        return copied
+
+    @property
+    def revision(self) -> int:
+        """Number of field assignments made to this model."""
+        # Read the private dict directly; attribute access goes through
+        # pydantic's __getattr__, which is slow on the rendering hot path
+        return self.__pydantic_private__["_revision"]
+
+    def _cached_render(self, signature, render) -> str:
+        """
+        Return cached text while `signature()` is unchanged, else `render()`.
+
+        The signature is only recomputed after some tracked model has been
+        assigned to since the text was cached.
+        """
+        private = self.__pydantic_private__
+        generation = _generation
+        if private["_rendered"] is not None:
+            cached_generation, cached_signature, text = private["_rendered"]
+            if cached_generation == generation:
+                return text
+            current = signature()
+            if current == cached_signature:
+                private["_rendered"] = (generation, current, text)
+                return text
+        else:
+            current = signature()
+        text = render()
+        private["_rendered"] = (generation, current, text)
+        return text
+
+
+class LinkedInCompany(TrackedModel):
     """Model for LinkedIn company profile data."""
 
     company_id: str
@@ -35,6 +194,8 @@ class LinkedInCompany(SerializableModel):
     ipo_status: str | None = None
     operating_status: str | None = None
 
+    _funding_timeline: tuple | None = PrivateAttr(default=None)
+
     @property
     def funding_stage(self) -> FundingType:
         """Get the current funding stage of the company."""
@@ -42,26 +203,21 @@ class LinkedInCompany(SerializableModel):
             return FundingType.UNKNOWN
         return self.funding_data[-1].funding_type
 
+    @property
+    def funding_timeline(self) -> FundingTimeline:
+        """Funding rounds sorted by date, rebuilt when the company is assigned to."""
+        private = self.__pydantic_private__
+        cached = private["_funding_timeline"]
+        if cached is None or cached[0] != self.revision:
+            cached = (self.revision, FundingTimeline(self.funding_data))
+            private["_funding_timeline"] = cached
+        return cached[1]
+
     def get_funding_stage_at_date(self, target_date: date) -> FundingType:
         """Get the company's funding stage at a specific date."""
         if not self.funding_data:
             return FundingType.UNKNOWN
-
-        current_stage = FundingType.UNKNOWN
-
-        for funding in sorted(
-            [f for f in self.funding_data if f.announced_date],
-            key=lambda x: x.announced_date,
-        ):
-            try:
-                if funding.announced_date <= target_date:
-                    current_stage = funding.funding_type
-                else:
-                    break
-            except (ValueError, TypeError):
-                continue
-
-        return current_stage
+        return self.funding_timeline.stage_at(target_date)
 
     def get_funding_stages_between_dates(
         self, start_date: date, end_date: date = None, cutoff_date: date = None
@@ -76,41 +232,23 @@ class LinkedInCompany(SerializableModel):
         if not self.funding_data:
             return []
 
-        end_date = end_date or date.today()
-        relevant_rounds = []
-
-        # Filter funding data by cutoff date if provided
-        valid_funding = [
-            f
-            for f in self.funding_data
-            if f.announced_date and (not cutoff_date or f.announced_date) >= cutoff_date
-        ]
-
-        if not valid_funding:
-            return [FundingType.UNKNOWN]
-
-        # Get initial stage from valid funding rounds
-        current_stage = self.get_funding_stage_at_date(start_date)
+        return self.funding_timeline.stages_between(
+            start_date, end_date or date.today(), cutoff_date
+        )
 
-        for funding in sorted(valid_funding, key=lambda x: x.announced_date):
-            try:
-                funding_date = funding.announced_date
-                if start_date < funding_date <= end_date:
-                    stage = funding.funding_type
-                    if stage != current_stage:
-                        relevant_rounds.append(stage)
-                        current_stage = stage
-            except (ValueError, TypeError):
-                continue
+    def to_context_string(self) -> str:
+        """Convert the company profile to a formatted string context.
 
-        return list(dict.fromkeys([current_stage] + relevant_rounds))
+        Company objects are shared between profiles by the company cache, so
+        the rendered text is kept on the instance and reused by each of them.
+        """
+        return self._cached_render(lambda: self.revision, self._render_context)
 
-    def to_context_string(self) -> str:
-        """Convert the company profile to a formatted string context."""
-        context = f"Company: {self.name}\n\n"
+    def _render_context(self) -> str:
+        parts = [f"Company: {self.name}\n\n"]
 
         if self.description:
-            context += f"Description: {self.description}\n\n"
+            parts.append(f"Description: {self.description}\n\n")
 
         if self.location:
             location_str = ", ".join(
@@ -124,53 +262,47 @@ class LinkedInCompany(SerializableModel):
                 )
             )
             if location_str:
-                context += f"Location: {location_str}\n\n"
+                parts.append(f"Location: {location_str}\n\n")
 
         if self.industries:
-            context += f"Industries: {', '.join(self.industries)}\n\n"
+            parts.append(f"Industries: {', '.join(self.industries)}\n\n")
 
         if self.founded_on:
-            context += f"Founded: {self.founded_on}\n\n"
+            parts.append(f"Founded: {self.founded_on}\n\n")
 
         if self.funding_data:
-            # Calculate total funding using proper attribute access
             total_funding = sum(
                 round.money_raised
                 for round in self.funding_data
                 if round.money_raised is not None
             )
             if total_funding:
-                context += f"Total Funding: ${total_funding:,.0f}\n"
+                parts.append(f"Total Funding: ${total_funding:,.0f}\n")
 
-            # Add latest funding round using proper date comparison
-            latest_funding = next(
-                (
-                    round
-                    for round in sorted(
-                        self.funding_data,
-                        key=lambda x: x.announced_date or date.min,
-                        reverse=True,
-                    )
-                    if round.announced_date
-                ),
-                None,
+            # Latest dated round; ties keep the first one listed
+            latest_funding = max(
+                (round for round in self.funding_data if round.announced_date),
+                key=lambda round: round.announced_date,
+                default=None,
             )
 
             if latest_funding:
-                context += f"Latest Funding: {latest_funding.funding_type.value}"
+                parts.append(f"Latest Funding: {latest_funding.funding_type.value}")
                 if latest_funding.money_raised is not None:
-                    context += f" (${latest_funding.money_raised:,.0f})"
+                    parts.append(f" (${latest_funding.money_raised:,.0f})")
                 if latest_funding.investor_list:
-                    context += f"\nInvestors: {', '.join(latest_funding.investor_list)}"
-                context += "\n\n"
+                    parts.append(
+                        f"\nInvestors: {', '.join(latest_funding.investor_list)}"
+                    )
+                parts.append("\n\n")
 
         if self.ipo_status:
-            context += f"IPO Status: {self.ipo_status}\n"
+            parts.append(f"IPO Status: {self.ipo_status}\n")
 
         if self.operating_status:
-            context += f"Status: {self.operating_status}\n"
+            parts.append(f"Status: {self.operating_status}\n")
 
-        return context.strip()
+        return "".join(parts).strip()
 
 
 class AILinkedinJobDescription(SerializableModel):
@@ -180,7 +312,7 @@ class AILinkedinJobDescription(SerializableModel):
     sources: list[str]
 
 
-class LinkedInExperience(SerializableModel):
+class LinkedInExperience(TrackedModel):
     title: str | None
     company: str | None
     description: str | None
@@ -192,6 +324,8 @@ class LinkedInExperience(SerializableModel):
     summarized_job_description: AILinkedinJobDescription | None = None
     experience_tags: list[str] | None = None
 
+    _tenure_stages: tuple | None = PrivateAttr(default=None)
+
     @property
     def funding_stages_during_tenure(self) -> list[FundingType] | None:
         """Calculate the funding stages of the company during this person's tenure."""
@@ -202,23 +336,23 @@ class LinkedInExperience(SerializableModel):
         ):
             return []
 
-        if not self.company_data and "school" not in self.company_linkedin_profile_url:
-            company_id = re.search(
-                r"linkedin\.com/company/([^/?]+)", self.company_linkedin_profile_url
-            ).group(1)
-            company_data = db.collection("companies").document(company_id).get()
-
-            if company_data:
-                self.company_data = LinkedInCompany(**company_data.to_dict())
+        # Cached until the experience or its company is assigned to
+        key = (self.revision, id(self.company_data), self.company_data.revision)
+        private = self.__pydantic_private__
+        cached = private["_tenure_stages"]
+        if cached is not None and cached[0] == key:
+            return list(cached[1])
 
         # Calculate cutoff date (2 years before start date)
         two_years_before = date(
             year=self.starts_at.year - 2, month=self.starts_at.month, day=1
         )
 
-        return self.company_data.get_funding_stages_between_dates(
+        stages = self.company_data.get_funding_stages_between_dates(
             self.starts_at, self.ends_at, cutoff_date=two_years_before
         )
+        private["_tenure_stages"] = (key, stages)
+        return list(stages)
 
     @property
     def duration_months(self) -> int | None:
@@ -234,8 +368,8 @@ class LinkedInExperience(SerializableModel):
 
     def dict(self, *args, **kwargs) -> dict:
         """Override dict to exclude company_data by default and include calculated fields."""
-        exclude = kwargs.get("exclude", set())
-        if self.company_data and "company_data" not in exclude:
+        exclude = set(kwargs.get("exclude") or ())
+        if self.company_data:
             exclude.add("company_data")
         kwargs["exclude"] = exclude
 
@@ -244,15 +378,14 @@ class LinkedInExperience(SerializableModel):
 
         # Add calculated fields
         d["duration_months"] = self.duration_months
-        if self.funding_stages_during_tenure:
-            d["funding_stages_during_tenure"] = [
-                stage for stage in self.funding_stages_during_tenure
-            ]
+        funding_stages = self.funding_stages_during_tenure
+        if funding_stages:
+            d["funding_stages_during_tenure"] = funding_stages
 
         return d
 
 
-class LinkedInEducation(SerializableModel):
+class LinkedInEducation(TrackedModel):
     school: str | None = None
     degree_name: str | None = None
     field_of_study: str | None = None
@@ -293,7 +426,7 @@ class LinkedInEducation(SerializableModel):
         return d
 
 
-class LinkedInProfile(SerializableModel):
+class LinkedInProfile(TrackedModel):
     full_name: str
     occupation: str | None
     headline: str | None
@@ -315,61 +448,86 @@ class LinkedInProfile(SerializableModel):
         self.career_metrics = analyze_career(self)
 
     def to_context_string(self) -> str:
-        """Convert the profile to a formatted string context."""
-        context = ""
+        """Convert the profile to a formatted string context.
+
+        The text is cached on the profile until the profile, one of its
+        experiences, educations or companies is reassigned.
+        """
+        return self._cached_render(self._render_signature, self._render_context)
+
+    def _render_signature(self) -> tuple:
+        return (
+            self.revision,
+            tuple(
+                (
+                    id(exp),
+                    exp.revision,
+                    id(exp.company_data),
+                    exp.company_data.revision if exp.company_data else 0,
+                    id(exp.summarized_job_description),
+                )
+                for exp in self.experiences
+            ),
+            tuple((id(edu), edu.revision) for edu in self.education),
+        )
+
+    def _render_context(self) -> str:
+        parts = []
 
         if self.occupation:
-            context += f"Current Occupation: {self.occupation}\n\n---------\n"
+            parts.append(f"Current Occupation: {self.occupation}\n\n---------\n")
         if self.headline:
-            context += f"Headline: {self.headline}\n\n---------\n"
+            parts.append(f"Headline: {self.headline}\n\n---------\n")
         if self.summary:
-            context += f"Summary: {self.summary}\n\n---------\n"
+            parts.append(f"Summary: {self.summary}\n\n---------\n")
         if self.city and self.country:
-            context += f"Location of this candidate: {self.city}, {self.country}\n\n---------\n"
+            parts.append(
+                f"Location of this candidate: {self.city}, {self.country}\n\n---------\n"
+            )
 
         for exp in self.experiences:
-            context += f"Experience: {exp.title} at {exp.company}\n"
+            parts.append(f"Experience: {exp.title} at {exp.company}\n")
             if exp.description:
-                context += f"Description: {exp.description}\n"
+                parts.append(f"Description: {exp.description}\n")
             if exp.starts_at:
-                context += f"Start Year: {exp.starts_at.year}\n"
-                context += f"Start Month: {exp.starts_at.month}\n"
+                parts.append(f"Start Year: {exp.starts_at.year}\n")
+                parts.append(f"Start Month: {exp.starts_at.month}\n")
             if exp.ends_at:
-                context += f"End Year: {exp.ends_at.year}\n"
-                context += f"End Month: {exp.ends_at.month}\n"
+                parts.append(f"End Year: {exp.ends_at.year}\n")
+                parts.append(f"End Month: {exp.ends_at.month}\n")
 
             if exp.company_data:
-                context += exp.company_data.to_context_string()
+                parts.append(exp.company_data.to_context_string())
 
             if exp.summarized_job_description:
-                context += (
-                    f"Role Summary: {exp.summarized_job_description.role_summary}\n"
-                )
-                context += f"Skills: {exp.summarized_job_description.skills}\n"
-                context += (
-                    f"Requirements: {exp.summarized_job_description.requirements}\n"
-                )
-            context += "\n---------\n"
+                summary = exp.summarized_job_description
+                parts.append(f"Role Summary: {summary.role_summary}\n")
+                parts.append(f"Skills: {summary.skills}\n")
+                parts.append(f"Requirements: {summary.requirements}\n")
+            parts.append("\n---------\n")
 
         for edu in self.education:
             if edu.school and edu.degree_name and edu.field_of_study:
-                context += f"Education: {edu.school}; {edu.degree_name} in {edu.field_of_study}\n"
+                parts.append(
+                    f"Education: {edu.school}; {edu.degree_name} in {edu.field_of_study}\n"
+                )
                 if edu.starts_at:
-                    context += f"Start Year: {edu.starts_at.year}\n"
-                    context += f"Start Month: {edu.starts_at.month}\n"
+                    parts.append(f"Start Year: {edu.starts_at.year}\n")
+                    parts.append(f"Start Month: {edu.starts_at.month}\n")
                 if edu.ends_at:
-                    context += f"End Year: {edu.ends_at.year}\n"
-                    context += f"End Month: {edu.ends_at.month}\n"
-                context += "\n---------\n"
+                    parts.append(f"End Year: {edu.ends_at.year}\n")
+                    parts.append(f"End Month: {edu.ends_at.month}\n")
+                parts.append("\n---------\n")
 
-        return context
+        return "".join(parts)
 
     def dict(self, *args, **kwargs) -> dict:
         """Override dict to handle nested serialization properly."""
-        # Get base dictionary
-        d = super().dict(*args, **kwargs)
+        # Experiences and education are left out of the base dictionary so they
+        # are serialized once, by their own dict() methods
+        exclude = set(kwargs.get("exclude") or ()) | {"experiences", "education"}
+        d = super().dict(*args, **{**kwargs, "exclude": exclude})
 
-        # Manually serialize experiences to ensure their custom dict() method is called
         d["experiences"] = [exp.dict(*args, **kwargs) for exp in self.experiences]
         d["education"] = [edu.dict(*args, **kwargs) for edu in self.education]
 
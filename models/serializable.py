@@ -1,4 +1,15 @@
-from typing import TypeVar, Type
+import types
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Literal,
+    TypeVar,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
 from datetime import date, datetime
 from pydantic import BaseModel
 
@@ -11,15 +22,20 @@ class SerializableModel(BaseModel):
 
     def dict(self, *args, **kwargs) -> dict:
         """Convert model to a Firestore-compatible dictionary."""
-        d = super().dict(*args, **kwargs)
-        return self._serialize_dict(d)
+        d = self.model_dump(*args, **kwargs)
+        if kwargs.get("by_alias"):
+            # Plans are keyed by field name, so walk aliased output in full
+            return self._serialize_dict(d)
+        return _apply_plan(d, _serializer.plan(type(self)))
 
     @classmethod
     def from_dict(cls: Type[T], data: dict) -> T | None:
         """Create model instance from a Firestore dictionary."""
         if not data:
             return None
-        return cls(**cls._deserialize_dict(data))
+        # Typed fields, dates included, are parsed by validation; only fields
+        # whose type does not say what they hold are searched for ISO strings
+        return cls.model_validate(_apply_plan(data, _deserializer.plan(cls)))
 
     @staticmethod
     def _serialize_dict(d: dict) -> dict:
@@ -46,46 +62,149 @@ class SerializableModel(BaseModel):
     def _deserialize_dict(d: dict) -> dict:
         """Recursively deserialize dictionary values."""
         for key, value in d.items():
-            if isinstance(value, str):
-                try:
-                    # Try parsing as datetime first
-                    try:
-                        d[key] = datetime.fromisoformat(value)
-                    except ValueError:
-                        # If that fails, try parsing as date
-                        d[key] = date.fromisoformat(value)
-                except ValueError:
-                    pass
-            elif isinstance(value, dict):
-                d[key] = SerializableModel._deserialize_dict(value)
-            elif isinstance(value, list):
-                d[key] = [
-                    SerializableModel._deserialize_dict(item)
-                    if isinstance(item, dict)
-                    else datetime.fromisoformat(item)
-                    if isinstance(item, str)
-                    and SerializableModel._is_iso_datetime(item)
-                    else date.fromisoformat(item)
-                    if isinstance(item, str) and SerializableModel._is_iso_date(item)
-                    else item
-                    for item in value
-                ]
+            d[key] = _parse_walk(value)
         return d
 
-    @staticmethod
-    def _is_iso_date(value: str) -> bool:
-        """Check if a string is an ISO format date."""
-        try:
-            date.fromisoformat(value)
-            return True
-        except ValueError:
-            return False
 
-    @staticmethod
-    def _is_iso_datetime(value: str) -> bool:
-        """Check if a string is an ISO format datetime."""
-        try:
-            datetime.fromisoformat(value)
-            return True
-        except ValueError:
-            return False
+def _isoformat(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def _walk(value):
+    """Convert dates in a value whose type is not known up front, as _serialize_dict does."""
+    if isinstance(value, dict):
+        return SerializableModel._serialize_dict(value)
+    if isinstance(value, list):
+        return SerializableModel._serialize_dict({"items": value})["items"]
+    return _isoformat(value)
+
+
+def _parse_iso(value: str):
+    """Parse an ISO datetime or date string, returning anything else unchanged."""
+    # Every ISO date starts with a four digit year; skip free text without parsing
+    if not value[:4].isdigit():
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return value
+
+
+def _parse_walk(value):
+    """Parse ISO strings in a value whose type is not known up front."""
+    if isinstance(value, str):
+        return _parse_iso(value)
+    if isinstance(value, dict):
+        return SerializableModel._deserialize_dict(value)
+    if isinstance(value, list):
+        return [
+            SerializableModel._deserialize_dict(item)
+            if isinstance(item, dict)
+            else _parse_iso(item)
+            if isinstance(item, str)
+            else item
+            for item in value
+        ]
+    return value
+
+
+def _apply_plan(d: dict, plan: dict[str, Callable]) -> dict:
+    for name, convert in plan.items():
+        value = d.get(name)
+        if value is not None:
+            d[name] = convert(value)
+    return d
+
+
+class _PlanCompiler:
+    """
+    Compiles, per model class, converters for the fields that need date
+    handling, from the fields' type annotations.
+
+    `on_date` converts a date field (None leaves date fields alone) and
+    `on_unknown` handles fields whose type does not say what they hold.
+    Fields that can only hold text, numbers, enums or models without such
+    fields are left out of a plan and never visited.
+    """
+
+    def __init__(self, on_date: Callable | None, on_unknown: Callable):
+        self.on_date = on_date
+        self.on_unknown = on_unknown
+        self.plans: dict[type, dict[str, Callable]] = {}
+
+    def plan(self, cls: type) -> dict[str, Callable]:
+        """Field name -> converter for the fields of `cls` that need one."""
+        plan = self.plans.get(cls)
+        if plan is None:
+            # Registered before compiling so self-referencing models terminate
+            plan = self.plans[cls] = {}
+            for name, field in cls.model_fields.items():
+                convert = self.converter(field.annotation)
+                if convert:
+                    plan[name] = convert
+        return plan
+
+    def converter(self, annotation) -> Callable | None:
+        """Converter for a value of type `annotation`, or None if it needs none."""
+        origin = get_origin(annotation)
+        args = get_args(annotation)
+
+        if origin is Annotated:
+            return self.converter(args[0])
+
+        if origin is Literal:
+            return None
+
+        if origin in (Union, types.UnionType):
+            converters = [c for c in map(self.converter, args) if c]
+            if len(converters) > 1:
+                return self.on_unknown
+            return converters[0] if converters else None
+
+        if origin is list:
+            item = self.converter(args[0]) if args else self.on_unknown
+            if item is None:
+                return None
+            return lambda value: (
+                [item(v) for v in value] if isinstance(value, list) else value
+            )
+
+        if origin is dict:
+            if args and self.converter(args[1]) is None:
+                return None
+            return self.on_unknown
+
+        # typing.Any is a class on Python 3.11+, so it must be caught by identity
+        if annotation is Any or annotation in (list, dict, object):
+            return self.on_unknown
+
+        if not isinstance(annotation, type) or origin is not None:
+            # Type variables, tuples, sets and other generics
+            return None if origin in (tuple, set, frozenset) else self.on_unknown
+
+        if issubclass(annotation, (date, datetime)):
+            return self.on_date
+
+        if issubclass(annotation, SerializableModel):
+            plan = self.plan(annotation)
+            if not plan:
+                return None
+            return lambda value: (
+                _apply_plan(value, plan) if isinstance(value, dict) else value
+            )
+
+        if issubclass(annotation, BaseModel):
+            return self.on_unknown
+
+        return None
+
+
+# Serializers turn dates into ISO strings after model_dump()
+_serializer = _PlanCompiler(on_date=_isoformat, on_unknown=_walk)
+
+# Deserializers leave dates to validation and parse ISO strings in untyped fields
+_deserializer = _PlanCompiler(on_date=None, on_unknown=_parse_walk)
@@ -0,0 +1,17 @@
+from typing import Literal
+from .serializable import SerializableModel
+
+
+class QueuedTask(SerializableModel):
+    """A durable unit of background work"""
+
+    id: str
+    kind: str
+    payload: dict
+    batch_id: str | None = None
+    status: Literal["pending", "running", "done", "failed"] = "pending"
+    attempts: int = 0
+    lease_until: float | None = None
+    # Changes on every claim; only its holder may complete or fail the task
+    lease_token: str | None = None
+    error: str | None = None
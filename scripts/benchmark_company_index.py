@@ -0,0 +1,82 @@
+"""
+Benchmark company classification over a synthetic profile corpus.
+
+Compares the old exact-match membership checks against the big_tech, unicorns
+and quant lists with the compiled company index, and reports how many
+experiences each approach tags.
+
+    python scripts/benchmark_company_index.py --profiles 10000
+"""
+
+import sys
+import os
+import argparse
+import random
+import time
+
+# Add the project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.constants import big_tech, quant, unicorns
+from agents.company_index import classify_company
+
+SUFFIXES = ["", "", "", " Inc.", " LLC", ", Inc.", " Corporation", " Ltd"]
+
+
+def build_corpus(profiles: int, experiences: int, seed: int) -> list[list[str]]:
+    """Company names per profile: mostly unlisted companies, some listed ones with suffixes."""
+    rng = random.Random(seed)
+    listed = big_tech + unicorns + quant
+    corpus = []
+    for _ in range(profiles):
+        companies = []
+        for _ in range(experiences):
+            if rng.random() < 0.3:
+                companies.append(rng.choice(listed) + rng.choice(SUFFIXES))
+            else:
+                companies.append(f"Company {rng.randrange(50000)}")
+        corpus.append(companies)
+    return corpus
+
+
+def classify_with_lists(company: str) -> set[str]:
+    categories = set()
+    if company in big_tech:
+        categories.add("big_tech")
+    if company in unicorns:
+        categories.add("unicorn")
+    if company in quant:
+        categories.add("quant")
+    return categories
+
+
+def run(corpus: list[list[str]], classify) -> tuple[float, int]:
+    start = time.perf_counter()
+    tagged = 0
+    for companies in corpus:
+        for company in companies:
+            if classify(company):
+                tagged += 1
+    return time.perf_counter() - start, tagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark company classification")
+    parser.add_argument("--profiles", type=int, default=10000)
+    parser.add_argument("--experiences", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.profiles, args.experiences, args.seed)
+    lists_seconds, lists_tagged = run(corpus, classify_with_lists)
+    index_seconds, index_tagged = run(corpus, classify_company)
+
+    lookups = args.profiles * args.experiences
+    print(f"{lookups} company lookups over {args.profiles} profiles")
+    print(f"lists: {lists_seconds:.3f}s, {lists_tagged} tagged")
+    print(f"index: {index_seconds:.3f}s, {index_tagged} tagged")
+    print(f"speedup: {lists_seconds / index_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
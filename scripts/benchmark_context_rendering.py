@@ -0,0 +1,156 @@
+"""
+Benchmark LinkedInProfile.to_context_string over synthetic profiles.
+
+Profiles share company objects the way the company cache hands them out, so
+the first pass shows the cost of rendering each company once, the second pass
+the cost of returning cached text, and the last pass the cost of re-rendering
+after every profile has been edited.
+
+    python scripts/benchmark_context_rendering.py --profiles 10000
+"""
+
+import sys
+import os
+import argparse
+import random
+import time
+from datetime import date
+
+# Add the project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.career import FundingType
+from models.linkedin import (
+    AILinkedinJobDescription,
+    Funding,
+    LinkedInCompany,
+    LinkedInEducation,
+    LinkedInExperience,
+    LinkedInProfile,
+)
+
+ROUNDS = [
+    FundingType.SEED,
+    FundingType.SERIES_A,
+    FundingType.SERIES_B,
+    FundingType.SERIES_C,
+    FundingType.SERIES_D,
+]
+
+
+def build_companies(count: int, rng: random.Random) -> list[LinkedInCompany]:
+    companies = []
+    for i in range(count):
+        rounds = rng.randint(0, len(ROUNDS))
+        companies.append(
+            LinkedInCompany(
+                company_id=f"company-{i}",
+                name=f"Company {i}",
+                description="Builds software for other companies. " * 5,
+                location={"city": "San Francisco", "state": "CA", "country": "US"},
+                industries=["Software Development", "Financial Services"],
+                founded_on=str(rng.randint(1990, 2020)),
+                funding_data=[
+                    Funding(
+                        funding_type=ROUNDS[r],
+                        money_raised=rng.randint(1, 100) * 1_000_000,
+                        announced_date=date(2010 + r * 2, rng.randint(1, 12), 1),
+                        investor_list=["Sequoia Capital", "Accel"],
+                    )
+                    for r in range(rounds)
+                ],
+                operating_status="Active",
+            )
+        )
+    return companies
+
+
+def build_profiles(
+    profiles: int, experiences: int, companies: int, seed: int
+) -> list[LinkedInProfile]:
+    """Profiles whose experiences point at a shared pool of company objects."""
+    rng = random.Random(seed)
+    pool = build_companies(companies, rng)
+    summary = AILinkedinJobDescription(
+        role_summary="Owns the backend services for payments.",
+        skills=["Python", "Go", "Postgres"],
+        requirements=["5+ years of experience"],
+        sources=[],
+    )
+    result = []
+    for i in range(profiles):
+        exps = []
+        for j in range(experiences):
+            company = rng.choice(pool)
+            start = date(2008 + j * 2, rng.randint(1, 12), 1)
+            exps.append(
+                LinkedInExperience(
+                    title="Software Engineer",
+                    company=company.name,
+                    description="Worked on distributed systems. " * 4,
+                    starts_at=start,
+                    ends_at=date(start.year + 2, start.month, 1),
+                    location="San Francisco",
+                    company_linkedin_profile_url=(
+                        f"https://www.linkedin.com/company/{company.company_id}"
+                    ),
+                    company_data=company,
+                    summarized_job_description=summary if j == 0 else None,
+                )
+            )
+        result.append(
+            LinkedInProfile(
+                full_name=f"Candidate {i}",
+                occupation="Software Engineer",
+                headline="Backend engineer",
+                summary="Engineer who likes hard problems. " * 3,
+                city="San Francisco",
+                country="US",
+                public_identifier=f"candidate-{i}",
+                experiences=exps,
+                education=[
+                    LinkedInEducation(
+                        school="Stanford University",
+                        degree_name="BS",
+                        field_of_study="Computer Science",
+                        starts_at=date(2004, 9, 1),
+                        ends_at=date(2008, 6, 1),
+                    )
+                ],
+            )
+        )
+    return result
+
+
+def render_all(profiles: list[LinkedInProfile]) -> tuple[float, int]:
+    start = time.perf_counter()
+    chars = sum(len(profile.to_context_string()) for profile in profiles)
+    return time.perf_counter() - start, chars
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark profile context rendering")
+    parser.add_argument("--profiles", type=int, default=10000)
+    parser.add_argument("--experiences", type=int, default=6)
+    parser.add_argument("--companies", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    profiles = build_profiles(
+        args.profiles, args.experiences, args.companies, args.seed
+    )
+
+    cold_seconds, chars = render_all(profiles)
+    warm_seconds, _ = render_all(profiles)
+    for profile in profiles:
+        profile.headline = "Staff backend engineer"
+    edited_seconds, _ = render_all(profiles)
+
+    print(f"{args.profiles} profiles, {chars / args.profiles:,.0f} chars each")
+    print(f"cold:   {cold_seconds:.3f}s")
+    print(f"warm:   {warm_seconds:.3f}s")
+    print(f"edited: {edited_seconds:.3f}s (company text reused)")
+
+
+if __name__ == "__main__":
+    main()
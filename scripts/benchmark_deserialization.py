@@ -0,0 +1,127 @@
+"""
+Benchmark SerializableModel.from_dict over a dump of the candidates collection.
+
+Compares the legacy deserializer, which tried to parse every string in a
+document as an ISO datetime and then as a date, with the schema-driven
+from_dict, and reports throughput in documents per second. Write the dump
+with scripts/check_serialization.py --write-dump.
+
+    python scripts/benchmark_deserialization.py --dump candidates.json
+"""
+
+import sys
+import os
+import argparse
+import copy
+import json
+import time
+from datetime import date, datetime
+
+# Add the project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.jobs import Candidate
+from models.linkedin import LinkedInProfile
+
+MODELS = {"profile": LinkedInProfile, "candidate": Candidate}
+
+
+def _is_iso_date(value: str) -> bool:
+    try:
+        date.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+def _is_iso_datetime(value: str) -> bool:
+    try:
+        datetime.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+def legacy_deserialize_dict(d: dict) -> dict:
+    """SerializableModel._deserialize_dict before schema-driven deserialization."""
+    for key, value in d.items():
+        if isinstance(value, str):
+            try:
+                try:
+                    d[key] = datetime.fromisoformat(value)
+                except ValueError:
+                    d[key] = date.fromisoformat(value)
+            except ValueError:
+                pass
+        elif isinstance(value, dict):
+            d[key] = legacy_deserialize_dict(value)
+        elif isinstance(value, list):
+            d[key] = [
+                legacy_deserialize_dict(item)
+                if isinstance(item, dict)
+                else datetime.fromisoformat(item)
+                if isinstance(item, str) and _is_iso_datetime(item)
+                else date.fromisoformat(item)
+                if isinstance(item, str) and _is_iso_date(item)
+                else item
+                for item in value
+            ]
+    return d
+
+
+def load_documents(dump: str, model: str) -> list[dict]:
+    with open(dump) as f:
+        candidates = json.load(f)
+    if model == "profile":
+        return [c["profile"] for c in candidates if c.get("profile")]
+    return candidates
+
+
+def run(documents: list[dict], deserialize) -> tuple[float, list]:
+    # from_dict converts documents in place, so each run gets its own copies
+    documents = copy.deepcopy(documents)
+    start = time.perf_counter()
+    models = []
+    for document in documents:
+        try:
+            models.append(deserialize(document))
+        except Exception:
+            models.append(None)
+    return time.perf_counter() - start, models
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark document deserialization")
+    parser.add_argument("--dump", required=True, help="JSON dump of candidate documents")
+    parser.add_argument("--model", choices=sorted(MODELS), default="profile")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cls = MODELS[args.model]
+    documents = load_documents(args.dump, args.model)
+
+    def legacy(document):
+        return cls(**legacy_deserialize_dict(document))
+
+    legacy_seconds = schema_seconds = 0.0
+    for _ in range(args.repeat):
+        seconds, expected = run(documents, legacy)
+        legacy_seconds += seconds
+        seconds, actual = run(documents, cls.from_dict)
+        schema_seconds += seconds
+
+    # Compare only fields stored in the document; the rest are defaults such as now()
+    differing = sum(
+        (old and old.model_dump(include=set(document)))
+        != (new and new.model_dump(include=set(document)))
+        for document, old, new in zip(documents, expected, actual)
+    )
+    total = len(documents) * args.repeat
+    print(f"{len(documents)} {args.model} documents, {differing} differ")
+    print(f"legacy:        {total / legacy_seconds:>10,.0f} docs/s")
+    print(f"schema-driven: {total / schema_seconds:>10,.0f} docs/s")
+    print(f"speedup: {legacy_seconds / schema_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
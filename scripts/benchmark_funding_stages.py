@@ -0,0 +1,170 @@
+"""
+Benchmark funding-stage lookups and profile serialization on long histories.
+
+Compares the old per-call filter-and-sort of a company's funding rounds with
+the bisectable FundingTimeline. Each experience is looked up twice, as
+LinkedInExperience.dict() used to, and profiles share a pool of companies the
+way the company cache hands them out. Then times LinkedInProfile.dict() on
+the same profiles.
+
+    python scripts/benchmark_funding_stages.py --profiles 2000 --rounds 20
+"""
+
+import sys
+import os
+import argparse
+import random
+import time
+from datetime import date
+
+# Add the project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.career import FundingType
+from models.linkedin import (
+    Funding,
+    LinkedInCompany,
+    LinkedInExperience,
+    LinkedInProfile,
+)
+
+STAGES = [stage for stage in FundingType if stage != FundingType.UNKNOWN]
+
+
+def build_companies(count: int, rounds: int, rng: random.Random) -> list[LinkedInCompany]:
+    return [
+        LinkedInCompany(
+            company_id=f"company-{i}",
+            name=f"Company {i}",
+            funding_data=[
+                Funding(
+                    funding_type=rng.choice(STAGES),
+                    money_raised=rng.randint(1, 100) * 1_000_000,
+                    announced_date=date(rng.randint(1995, 2024), rng.randint(1, 12), 1),
+                )
+                for _ in range(rounds)
+            ],
+        )
+        for i in range(count)
+    ]
+
+
+def build_profiles(
+    profiles: int, experiences: int, companies: int, rounds: int, seed: int
+) -> list[LinkedInProfile]:
+    rng = random.Random(seed)
+    pool = build_companies(companies, rounds, rng)
+    result = []
+    for i in range(profiles):
+        exps = []
+        for _ in range(experiences):
+            company = rng.choice(pool)
+            start = date(rng.randint(2000, 2020), rng.randint(1, 12), 1)
+            exps.append(
+                LinkedInExperience(
+                    title="Software Engineer",
+                    company=company.name,
+                    description=None,
+                    starts_at=start,
+                    ends_at=date(start.year + rng.randint(1, 4), start.month, 1),
+                    location=None,
+                    company_linkedin_profile_url=(
+                        f"https://www.linkedin.com/company/{company.company_id}"
+                    ),
+                    company_data=company,
+                )
+            )
+        result.append(
+            LinkedInProfile(
+                full_name=f"Candidate {i}",
+                occupation=None,
+                headline=None,
+                summary=None,
+                city=None,
+                country=None,
+                public_identifier=f"candidate-{i}",
+                experiences=exps,
+            )
+        )
+    return result
+
+
+def stages_by_sorting(exp: LinkedInExperience) -> list[FundingType]:
+    """Tenure stages the way they were computed before FundingTimeline."""
+    funding_data = exp.company_data.funding_data
+    cutoff_date = date(exp.starts_at.year - 2, exp.starts_at.month, 1)
+    end_date = exp.ends_at or date.today()
+    valid_funding = [
+        f
+        for f in funding_data
+        if f.announced_date and f.announced_date >= cutoff_date
+    ]
+    if not valid_funding:
+        return [FundingType.UNKNOWN]
+
+    current_stage = FundingType.UNKNOWN
+    for funding in sorted(
+        [f for f in funding_data if f.announced_date],
+        key=lambda x: x.announced_date,
+    ):
+        if funding.announced_date <= exp.starts_at:
+            current_stage = funding.funding_type
+        else:
+            break
+
+    relevant_rounds = []
+    for funding in sorted(valid_funding, key=lambda x: x.announced_date):
+        if exp.starts_at < funding.announced_date <= end_date:
+            if funding.funding_type != current_stage:
+                relevant_rounds.append(funding.funding_type)
+                current_stage = funding.funding_type
+    return list(dict.fromkeys([current_stage] + relevant_rounds))
+
+
+def timed(func) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark funding stage lookups")
+    parser.add_argument("--profiles", type=int, default=2000)
+    parser.add_argument("--experiences", type=int, default=10)
+    parser.add_argument("--companies", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    profiles = build_profiles(
+        args.profiles, args.experiences, args.companies, args.rounds, args.seed
+    )
+    experiences = [exp for profile in profiles for exp in profile.experiences]
+
+    sort_seconds, sorted_stages = timed(
+        lambda: [
+            (stages_by_sorting(exp), stages_by_sorting(exp)) for exp in experiences
+        ]
+    )
+    bisect_seconds, bisect_stages = timed(
+        lambda: [
+            (exp.funding_stages_during_tenure, exp.funding_stages_during_tenure)
+            for exp in experiences
+        ]
+    )
+    if sorted_stages != bisect_stages:
+        sys.exit("funding stages differ between the two implementations")
+    dict_seconds, _ = timed(lambda: [profile.dict() for profile in profiles])
+
+    print(
+        f"{len(experiences)} experiences at {args.companies} companies, "
+        f"{args.rounds} funding rounds each"
+    )
+    print(f"sort per lookup:  {sort_seconds:.3f}s")
+    print(f"bisect timeline:  {bisect_seconds:.3f}s")
+    print(f"speedup: {sort_seconds / bisect_seconds:.1f}x")
+    print(f"profile.dict():   {dict_seconds:.3f}s for {len(profiles)} profiles")
+
+
+if __name__ == "__main__":
+    main()
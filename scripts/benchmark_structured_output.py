@@ -0,0 +1,59 @@
+"""
+Micro-benchmark of structured-output binding overhead per LLM call.
+
+Compares rebinding `with_structured_output` on every call, as the wrappers
+used to, with the memoized runnable from services.llms. No request is sent;
+the model is built with placeholder credentials.
+
+    python scripts/benchmark_structured_output.py --iterations 200
+"""
+
+import sys
+import os
+import argparse
+import time
+
+# Add the project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_openai import AzureChatOpenAI
+from models.evaluation import HeadlessEvaluationOutput, KeyTraitsOutput
+from services.llms import LazyProvider, get_structured_runnable
+
+
+def _time_per_call(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark structured output binding")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    provider = LazyProvider(
+        "benchmark-gpt-4o",
+        lambda: AzureChatOpenAI(
+            deployment_name="gpt-4o",
+            openai_api_version="2024-08-01-preview",
+            azure_endpoint="https://example.openai.azure.com",
+            openai_api_key="placeholder",
+        ),
+    )
+
+    print(f"{'output class':<28} {'rebind us':>10} {'memoized us':>12}")
+    for cls in (KeyTraitsOutput, HeadlessEvaluationOutput):
+        rebind = _time_per_call(
+            lambda: provider.with_structured_output(cls), args.iterations
+        )
+        get_structured_runnable(provider, cls)
+        memoized = _time_per_call(
+            lambda: get_structured_runnable(provider, cls), args.iterations
+        )
+        print(f"{cls.__name__:<28} {rebind * 1e6:>10.1f} {memoized * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Check that SerializableModel.dict() matches the legacy serializer on stored profiles.
+
+The legacy serializer dumped the model and then walked the whole result
+converting dates. This script serializes every candidate profile both ways,
+reports any profile whose output differs and the time each way took, and exits
+non-zero on a mismatch.
+
+Profiles come from the `candidates` collection, or from a JSON dump of it so
+the check can run offline:
+
+    python scripts/check_serialization.py --limit 500 --write-dump candidates.json
+    python scripts/check_serialization.py --dump candidates.json
+"""
+
+import sys
+import os
+import argparse
+import json
+import time
+from contextlib import contextmanager
+
+# Add the project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import BaseModel
+from models.linkedin import LinkedInProfile
+from models.serializable import SerializableModel
+
+
+def legacy_dict(self, *args, **kwargs) -> dict:
+    """SerializableModel.dict() before the compiled serializers."""
+    d = BaseModel.model_dump(self, *args, **kwargs)
+    return SerializableModel._serialize_dict(d)
+
+
+@contextmanager
+def legacy_serializer():
+    current = SerializableModel.dict
+    SerializableModel.dict = legacy_dict
+    try:
+        yield
+    finally:
+        SerializableModel.dict = current
+
+
+def load_candidates(dump: str | None, limit: int) -> list[dict]:
+    if dump:
+        with open(dump) as f:
+            return json.load(f)[:limit]
+
+    from services.firestore import db
+
+    docs = db.collection("candidates").limit(limit).stream()
+    return [{"id": doc.id, **doc.to_dict()} for doc in docs]
+
+
+def serialize_all(profiles: list[LinkedInProfile]) -> tuple[float, list[dict]]:
+    start = time.perf_counter()
+    result = [profile.dict() for profile in profiles]
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check profile serialization")
+    parser.add_argument("--dump", help="JSON dump of candidate documents to read")
+    parser.add_argument(
+        "--write-dump", help="Write the candidate documents read to this file"
+    )
+    parser.add_argument("--limit", type=int, default=1000)
+    args = parser.parse_args()
+
+    candidates = load_candidates(args.dump, args.limit)
+    if args.write_dump:
+        with open(args.write_dump, "w") as f:
+            json.dump(candidates, f, default=str)
+
+    profiles = []
+    for candidate in candidates:
+        if not candidate.get("profile"):
+            continue
+        try:
+            profiles.append(LinkedInProfile(**candidate["profile"]))
+        except Exception as e:
+            print(f"skipping candidate {candidate.get('id')}: {e}", file=sys.stderr)
+
+    with legacy_serializer():
+        legacy_seconds, expected = serialize_all(profiles)
+    seconds, actual = serialize_all(profiles)
+
+    mismatches = [
+        profile.public_identifier
+        for profile, old, new in zip(profiles, expected, actual)
+        if old != new
+    ]
+    for public_identifier in mismatches[:20]:
+        print(f"mismatch: {public_identifier}")
+
+    print(f"{len(profiles)} profiles, {len(mismatches)} mismatches")
+    print(f"legacy:   {legacy_seconds:.3f}s")
+    print(f"compiled: {seconds:.3f}s")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
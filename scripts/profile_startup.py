@@ -0,0 +1,122 @@
+"""
+Profile a cold `import main` and check it against a startup time budget.
+
+The import runs in a fresh interpreter with `-X importtime` and with all
+outbound network connections blocked, so any module that talks to Secret
+Manager, Stripe or an LLM provider at import time fails the check. Exits
+non-zero when the import fails or takes longer than the budget, so it can run
+as a CI step:
+
+    python scripts/profile_startup.py --budget 5
+"""
+
+import sys
+import os
+import argparse
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds a cold `import main` may take
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "5"))
+
+# Runs in the child interpreter: block the network, then time the import
+CHILD_SCRIPT = """
+import json, socket, sys, time
+
+def _blocked(*args, **kwargs):
+    raise OSError("network access during import is not allowed")
+
+socket.socket.connect = _blocked
+socket.socket.connect_ex = _blocked
+socket.create_connection = _blocked
+socket.getaddrinfo = _blocked
+
+start = time.perf_counter()
+try:
+    import {module}
+    error = None
+except BaseException as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+print(json.dumps({{"seconds": time.perf_counter() - start, "error": error}}))
+"""
+
+# Placeholder settings so clients can be constructed without real credentials
+STUB_ENV = {
+    "FIRESTORE_EMULATOR_HOST": "localhost:8080",
+    "GOOGLE_CLOUD_PROJECT": "startup-profile",
+    "PROJECT_ID": "startup-profile",
+    "DB": "(default)",
+}
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Parse `-X importtime` output into (module, self_us, cumulative_us) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = [part.strip() for part in line[len("import time:") :].split("|")]
+        if len(parts) != 3 or not parts[0].isdigit():
+            continue
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+
+def profile_import(module: str = "main") -> dict:
+    """Import `module` in a fresh interpreter and return its timing report."""
+    env = {**os.environ, **{k: v for k, v in STUB_ENV.items() if k not in os.environ}}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_SCRIPT.format(module=module)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    lines = result.stdout.strip().splitlines()
+    report = (
+        json.loads(lines[-1])
+        if lines
+        else {"seconds": None, "error": result.stderr.strip()[-2000:]}
+    )
+    report["modules"] = parse_importtime(result.stderr)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile cold start import time")
+    parser.add_argument("--module", default="main", help="Module to import")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=STARTUP_BUDGET_SECONDS,
+        help="Fail if the import takes longer than this many seconds",
+    )
+    parser.add_argument(
+        "--top", type=int, default=25, help="Number of slowest modules to show"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print the full report as JSON"
+    )
+    args = parser.parse_args()
+
+    report = profile_import(args.module)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+        slowest = sorted(report["modules"], key=lambda row: row[2], reverse=True)
+        for name, self_us, cumulative_us in slowest[: args.top]:
+            print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    if report["error"]:
+        print(f"import {args.module} failed: {report['error']}", file=sys.stderr)
+        sys.exit(1)
+    print(f"import {args.module}: {report['seconds']:.2f}s (budget {args.budget:.2f}s)")
+    if report["seconds"] > args.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import sys
+import os
+import argparse
+import asyncio
+import logging
+
+# Add the project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.task_worker import drain_task_queue, TASK_WORKER_CONCURRENCY
+from services.evaluate import graph_clients
+from services.proxycurl import proxycurl_client
+
+
+async def run(concurrency: int, once: bool):
+    try:
+        await drain_task_queue(concurrency=concurrency, stop_when_empty=once)
+    finally:
+        await graph_clients.aclose()
+        await proxycurl_client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drain the candidate task queue")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=TASK_WORKER_CONCURRENCY,
+        help="Number of tasks to run at once",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Exit when the queue is empty instead of polling for new tasks",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(args.concurrency, args.once))
+
+
+if __name__ == "__main__":
+    main()
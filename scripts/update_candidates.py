@@ -6,49 +6,74 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import logging
 from services.firestore import (
-    get_cached_candidate,
-    check_cached_candidate_exists,
     create_candidate,
     db,
 )
 from models.linkedin import LinkedInProfile
+from agents.linkedin_processor import get_experience_companies_batch
+from agents.career_analyzer import prime_career_levels
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
-def process_candidate(candidate_id):
-    """Process a single candidate."""
+def process_candidate(candidate: dict, profile: LinkedInProfile):
+    """Process a single candidate whose profile already has company data attached."""
+    candidate_id = candidate.get("id")
     try:
-        if check_cached_candidate_exists(candidate_id):
-            candidate = get_cached_candidate(candidate_id)
+        # Analyze career metrics
+        profile.analyze_career()
 
-            # Convert candidate profile to LinkedInProfile object
-            profile = LinkedInProfile(**candidate["profile"])
-
-            # Analyze career metrics
-            profile.analyze_career()
-
-            candidate["profile"] = profile.dict()
+        candidate["profile"] = profile.dict()
 
-            # Update candidate in Firestore
-            create_candidate(candidate)
+        # Update candidate in Firestore
+        create_candidate(candidate)
 
         logging.info(f"Candidate {candidate_id} updated successfully.")
     except Exception as e:
         logging.error(f"Error processing candidate {candidate_id}: {str(e)}")
 
 
-def update_all_candidates_parallel(max_workers=100):
+def load_profiles(docs) -> list[tuple[dict, LinkedInProfile]]:
+    """Build profiles for a chunk of candidate documents and enrich them in one batch."""
+    loaded = []
+    for doc in docs:
+        candidate = doc.to_dict()
+        try:
+            # Convert candidate profile to LinkedInProfile object
+            loaded.append((candidate, LinkedInProfile(**candidate["profile"])))
+        except Exception as e:
+            logging.error(f"Error loading candidate {doc.id}: {str(e)}")
+
+    # Resolve companies and classify unseen career levels for the whole chunk at once
+    profiles = [profile for _, profile in loaded]
+    get_experience_companies_batch(profiles)
+    try:
+        prime_career_levels(profiles)
+    except Exception as e:
+        logging.error(f"Error classifying career levels: {str(e)}")
+    return loaded
+
+
+def update_all_candidates_parallel(max_workers=100, batch_size=500):
     try:
-        # Fetch all candidate IDs from Firestore
-        candidate_ids = [doc.id for doc in db.collection("candidates").stream()]
+        docs = db.collection("candidates").stream()
 
         # Use ThreadPoolExecutor for parallel processing
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit tasks for each candidate
-            futures = {
-                executor.submit(process_candidate, candidate_id): candidate_id
-                for candidate_id in candidate_ids
-            }
+            futures = {}
+            chunk = []
+            for doc in docs:
+                chunk.append(doc)
+                if len(chunk) < batch_size:
+                    continue
+                for candidate, profile in load_profiles(chunk):
+                    futures[executor.submit(process_candidate, candidate, profile)] = (
+                        candidate.get("id")
+                    )
+                chunk = []
+            for candidate, profile in load_profiles(chunk):
+                futures[executor.submit(process_candidate, candidate, profile)] = (
+                    candidate.get("id")
+                )
 
             # Wait for all tasks to complete
             for future in as_completed(futures):
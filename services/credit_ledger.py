@@ -0,0 +1,199 @@
+"""
+Search credit ledger.
+
+Bulk requests reserve their credits up front in one transaction on the user
+document. Each candidate then records whether it consumed its credit in its
+own document under the reservation, so concurrent workers never contend on
+the user document. When the batch finishes, the reservation is settled and
+every credit that was not consumed is refunded with a single atomic
+increment. A 1,000-candidate job writes the user document twice.
+Reservations whose batch finished without being settled are found with
+open_reservations() and settled by the task worker's sweep.
+"""
+
+import threading
+import time
+from google.api_core.exceptions import AlreadyExists
+from google.cloud import firestore as gcf
+
+# Credits granted to users whose document has no balance yet
+DEFAULT_SEARCH_CREDITS = 100
+# Firestore batches are limited to 500 writes
+MAX_BATCH_WRITES = 500
+
+
+class InsufficientCreditsError(Exception):
+    """Raised when a user does not have enough credits for a reservation."""
+
+    def __init__(self, available: int, requested: int):
+        self.available = available
+        self.requested = requested
+        super().__init__(
+            f"Insufficient search credits. You have {available} credits but need "
+            f"{requested} credits to process all URLs."
+        )
+
+
+class CreditLedger:
+    """Reserve, commit, refund and settle search credits in Firestore."""
+
+    def __init__(self, collection: str = "credit_reservations"):
+        from services.firestore import db
+
+        self.db = db
+        self.users = db.collection("users")
+        self.reservations = db.collection(collection)
+
+    def reserve(
+        self,
+        user_id: str,
+        reservation_id: str,
+        amount: int,
+        job_id: str | None = None,
+    ) -> int:
+        """
+        Take `amount` credits from the user's balance and hold them under
+        `reservation_id`. Reserving the same ID twice is a no-op. `job_id`
+        is kept with the reservation so a sweep can clean up after its batch.
+
+        Returns:
+            int: The user's remaining balance
+
+        Raises:
+            InsufficientCreditsError: If the balance is lower than `amount`
+        """
+        user_ref = self.users.document(user_id)
+        reservation_ref = self.reservations.document(reservation_id)
+
+        @gcf.transactional
+        def _reserve(transaction):
+            user = user_ref.get(transaction=transaction)
+            user_dict = user.to_dict() if user.exists else {}
+            available = user_dict.get("search_credits", DEFAULT_SEARCH_CREDITS)
+            if reservation_ref.get(transaction=transaction).exists:
+                return available
+            if available < amount:
+                raise InsufficientCreditsError(available, amount)
+            transaction.set(
+                user_ref, {"search_credits": available - amount}, merge=True
+            )
+            transaction.set(
+                reservation_ref,
+                {
+                    "user_id": user_id,
+                    "job_id": job_id,
+                    "amount": amount,
+                    "status": "open",
+                    "created_at": time.time(),
+                },
+            )
+            return available - amount
+
+        return _reserve(self.db.transaction())
+
+    def commit(self, reservation_id: str, key: str) -> None:
+        """Mark the credit held for `key` as consumed. Committing twice is a no-op."""
+        self.record_many(reservation_id, {key: True})
+
+    def refund(self, reservation_id: str, key: str) -> bool:
+        """
+        Mark the credit held for `key` as not consumed, unless it was already
+        committed. Refunding twice is a no-op.
+
+        A task whose credit was committed may still fail afterwards, for
+        example while being marked complete; its retry must not hand the
+        credit back.
+
+        Returns:
+            bool: False if the refund was refused because the credit was committed
+        """
+        outcome_ref = (
+            self.reservations.document(reservation_id)
+            .collection("outcomes")
+            .document(key)
+        )
+        try:
+            # create() fails if any outcome was recorded, so a commit is never undone
+            outcome_ref.create({"charged": False})
+        except AlreadyExists:
+            return not outcome_ref.get().get("charged")
+        return True
+
+    def record_many(self, reservation_id: str, outcomes: dict[str, bool]) -> None:
+        """
+        Record whether each key consumed its credit, in as few batched writes
+        as possible. Recording a key again overwrites its previous outcome, so
+        retried tasks are never charged twice. Use refund() to hand back a
+        single credit; unlike recording False here, it never undoes a commit.
+        """
+        outcomes_ref = self.reservations.document(reservation_id).collection(
+            "outcomes"
+        )
+        items = list(outcomes.items())
+        for start in range(0, len(items), MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            for key, charged in items[start : start + MAX_BATCH_WRITES]:
+                batch.set(outcomes_ref.document(key), {"charged": charged})
+            batch.commit()
+
+    def settle(self, reservation_id: str) -> int:
+        """
+        Close a reservation and return every credit that was not committed to
+        the user. Settling an already settled or unknown reservation is a no-op.
+
+        Returns:
+            int: The number of credits refunded
+        """
+        reservation_ref = self.reservations.document(reservation_id)
+        committed = (
+            reservation_ref.collection("outcomes")
+            .where("charged", "==", True)
+            .count()
+            .get()[0][0]
+            .value
+        )
+
+        @gcf.transactional
+        def _settle(transaction):
+            snapshot = reservation_ref.get(transaction=transaction)
+            data = snapshot.to_dict() if snapshot.exists else None
+            if not data or data.get("status") != "open":
+                return 0
+            refund = max(0, data["amount"] - committed)
+            if refund:
+                transaction.set(
+                    self.users.document(data["user_id"]),
+                    {"search_credits": gcf.Increment(refund)},
+                    merge=True,
+                )
+            transaction.update(
+                reservation_ref,
+                {"status": "settled", "committed": committed, "refunded": refund},
+            )
+            return refund
+
+        return _settle(self.db.transaction())
+
+    def open_reservations(self, created_before: float) -> list[dict]:
+        """Reservations created before `created_before` that are still open."""
+        query = self.reservations.where("status", "==", "open").where(
+            "created_at", "<", created_before
+        )
+        return [{"id": doc.id, **doc.to_dict()} for doc in query.stream()]
+
+    def release(self, reservation_id: str) -> int:
+        """Refund a whole reservation whose work was never started."""
+        return self.settle(reservation_id)
+
+
+_credit_ledger: CreditLedger | None = None
+_credit_ledger_lock = threading.Lock()
+
+
+def get_credit_ledger() -> CreditLedger:
+    """Get the process-wide credit ledger."""
+    global _credit_ledger
+    with _credit_ledger_lock:
+        if _credit_ledger is None:
+            _credit_ledger = CreditLedger()
+        return _credit_ledger
@@ -0,0 +1,228 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+load_dotenv()
+
+EVAL_CACHE_BACKEND = os.getenv("EVAL_CACHE_BACKEND", "memory")
+EVAL_CACHE_TTL_SECONDS = int(os.getenv("EVAL_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+EVAL_CACHE_MAX_ENTRIES = int(os.getenv("EVAL_CACHE_MAX_ENTRIES", "2000"))
+
+
+class EvalCacheBackend(ABC):
+    """Storage for cached graph results as (value, expires_at) pairs."""
+
+    @abstractmethod
+    def get(self, key: str) -> tuple[dict, float] | None:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: dict, expires_at: float) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+
+class MemoryBackend(EvalCacheBackend):
+    """
+    Process-local LRU.
+
+    Values are copied on the way in and out, so callers that edit a graph
+    result cannot change what later hits return.
+    """
+
+    def __init__(self, max_entries: int = EVAL_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[dict, float] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        value, expires_at = entry
+        return copy.deepcopy(value), expires_at
+
+    def set(self, key: str, value: dict, expires_at: float) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class FirestoreBackend(EvalCacheBackend):
+    """Cache shared by every instance, stored in a Firestore collection."""
+
+    def __init__(self, collection: str = "eval_cache"):
+        from services.firestore import db
+
+        self.db = db
+        self.collection = db.collection(collection)
+
+    def get(self, key: str) -> tuple[dict, float] | None:
+        doc = self.collection.document(key).get()
+        if not doc.exists:
+            return None
+        data = doc.to_dict()
+        return json.loads(data["value"]), data["expires_at"]
+
+    def set(self, key: str, value: dict, expires_at: float) -> None:
+        # Stored as JSON so arbitrary graph output round-trips unchanged
+        self.collection.document(key).set(
+            {"value": json.dumps(value, default=str), "expires_at": expires_at}
+        )
+
+    def delete(self, key: str) -> None:
+        self.collection.document(key).delete()
+
+    def clear(self) -> None:
+        from services.firestore import delete_collection
+
+        delete_collection(self.collection)
+
+
+class DiskBackend(EvalCacheBackend):
+    """One JSON file per entry in a local directory, for tests and local runs."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def get(self, key: str) -> tuple[dict, float] | None:
+        try:
+            with open(self._file(key)) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return data["value"], data["expires_at"]
+
+    def set(self, key: str, value: dict, expires_at: float) -> None:
+        tmp = f"{self._file(key)}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"value": value, "expires_at": expires_at}, f, default=str)
+        os.replace(tmp, self._file(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._file(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self.path):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.path, name))
+
+
+class EvaluationCache:
+    """
+    Content-addressed cache of remote graph results.
+
+    Keys hash the graph name and the serialized input state, so the same
+    profile evaluated against an identical job and instructions is only sent
+    to the graph once per TTL.
+    """
+
+    def __init__(self, backend: EvalCacheBackend | None, ttl_seconds: int):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        # get() runs on threadpool threads, so the counters are updated under a lock
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(graph: str, state: BaseModel) -> str:
+        """Hash of an input state, ignoring the job's creation time."""
+        payload = state.model_dump(mode="json", exclude={"job": {"created_at"}})
+        encoded = json.dumps(
+            [graph, payload], sort_keys=True, default=str, separators=(",", ":")
+        )
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        if self.backend is None:
+            return None
+        try:
+            entry = self.backend.get(key)
+        except Exception as e:
+            logging.error(f"Error reading evaluation cache: {str(e)}")
+            entry = None
+        hit = entry is not None and entry[1] >= time.time()
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry[0] if hit else None
+
+    def set(self, key: str, value: dict) -> None:
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(key, value, time.time() + self.ttl_seconds)
+        except Exception as e:
+            logging.error(f"Error writing evaluation cache: {str(e)}")
+
+    def invalidate(self, key: str) -> None:
+        if self.backend is not None:
+            self.backend.delete(key)
+
+    def invalidate_all(self) -> None:
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+        }
+
+
+def _create_backend(name: str) -> EvalCacheBackend | None:
+    if name == "memory":
+        return MemoryBackend()
+    if name == "firestore":
+        return FirestoreBackend()
+    if name == "disk":
+        return DiskBackend(os.getenv("EVAL_CACHE_PATH", ".eval_cache"))
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown evaluation cache backend: {name}")
+
+
+eval_cache = EvaluationCache(_create_backend(EVAL_CACHE_BACKEND), EVAL_CACHE_TTL_SECONDS)
@@ -1,4 +1,8 @@
+import asyncio
+import logging
+import httpx
 from langserve import RemoteRunnable
+from fastapi.concurrency import run_in_threadpool
 from models.evaluation import (
     SearchInputState,
     EvaluationOutputState,
@@ -7,6 +11,172 @@ from models.evaluation import (
 import os
 from models.linkedin import LinkedInProfile
 from models.jobs import Job
+from services.scheduler import limiter
+from services.eval_cache import eval_cache
+
+GRAPH_ENDPOINT_ENV = {"search": "SEARCH_ENDPOINT", "eval": "EVAL_ENDPOINT"}
+# Connections kept open to each remote graph
+GRAPH_MAX_CONNECTIONS = int(os.getenv("GRAPH_MAX_CONNECTIONS", "100"))
+# Seconds a single graph call may take before it is abandoned
+GRAPH_TIMEOUT_SECONDS = float(os.getenv("GRAPH_TIMEOUT_SECONDS", "600"))
+# Concurrent calls coalesced into one batch request; 1 disables batching
+GRAPH_BATCH_SIZE = int(os.getenv("GRAPH_BATCH_SIZE", "1"))
+# Seconds to wait for more calls before sending a partial batch
+GRAPH_BATCH_WAIT_SECONDS = float(os.getenv("GRAPH_BATCH_WAIT_SECONDS", "0.05"))
+
+
+class GraphBatcher:
+    """
+    Coalesces concurrent calls to one graph into `abatch` requests.
+
+    Calls are sent once `max_batch` are waiting or `max_wait` seconds after the
+    first one arrives. If a batch request fails, its calls are retried one by
+    one so a single bad input does not fail the others.
+    """
+
+    def __init__(self, pool: "GraphClientPool", graph: str, max_batch: int, max_wait: float):
+        self.pool = pool
+        self.graph = graph
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending: list[tuple[object, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        # The loop only keeps weak references to tasks, so hold on to running batches
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, state, timeout: float):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((state, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        return await asyncio.wait_for(future, timeout)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._batch_done)
+
+    def _batch_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logging.error(
+                f"Batch for {self.graph} graph failed: {str(task.exception())}"
+            )
+
+    async def _run(self, batch: list) -> None:
+        try:
+            client = self.pool.get(self.graph)
+            try:
+                async with limiter.limit(self.graph):
+                    results = await client.abatch([state for state, _ in batch])
+            except Exception as e:
+                logging.error(
+                    f"Batch call to {self.graph} graph failed, retrying individually: {str(e)}"
+                )
+                results = await asyncio.gather(
+                    *(self.pool.invoke_single(self.graph, state) for state, _ in batch),
+                    return_exceptions=True,
+                )
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        except Exception as e:
+            # Never leave callers waiting out their timeout on a batch that died
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+
+
+class GraphClientPool:
+    """
+    Long-lived RemoteRunnable clients, one per remote graph.
+
+    Each client keeps an HTTP keep-alive pool of up to GRAPH_MAX_CONNECTIONS
+    connections, so evaluations reuse TLS sessions instead of opening new ones.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = GRAPH_MAX_CONNECTIONS,
+        timeout_seconds: float = GRAPH_TIMEOUT_SECONDS,
+        batch_size: int = GRAPH_BATCH_SIZE,
+        batch_wait_seconds: float = GRAPH_BATCH_WAIT_SECONDS,
+    ):
+        self.max_connections = max_connections
+        self.timeout_seconds = timeout_seconds
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self._clients: dict[str, RemoteRunnable] = {}
+        self._batchers: dict[str, GraphBatcher] = {}
+
+    def get(self, graph: str) -> RemoteRunnable:
+        """Return the shared client for a graph, creating it on first use."""
+        client = self._clients.get(graph)
+        if client is None:
+            client = RemoteRunnable(
+                os.getenv(GRAPH_ENDPOINT_ENV[graph]),
+                timeout=self.timeout_seconds,
+                client_kwargs={
+                    "limits": httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    )
+                },
+            )
+            self._clients[graph] = client
+        return client
+
+    async def invoke_single(self, graph: str, state, timeout: float | None = None):
+        async with limiter.limit(graph):
+            return await asyncio.wait_for(
+                self.get(graph).ainvoke(state), timeout or self.timeout_seconds
+            )
+
+    async def invoke(self, graph: str, state, timeout: float | None = None):
+        """Run a graph on one input, through the batcher when batching is enabled."""
+        if self.batch_size <= 1:
+            return await self.invoke_single(graph, state, timeout)
+        batcher = self._batchers.get(graph)
+        if batcher is None:
+            batcher = GraphBatcher(
+                self, graph, self.batch_size, self.batch_wait_seconds
+            )
+            self._batchers[graph] = batcher
+        return await batcher.submit(state, timeout or self.timeout_seconds)
+
+    async def abatch(self, graph: str, states: list, timeout: float | None = None) -> list:
+        """Run a graph on many inputs in a single round trip."""
+        async with limiter.limit(graph):
+            return await asyncio.wait_for(
+                self.get(graph).abatch(states), timeout or self.timeout_seconds
+            )
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.async_client.aclose()
+            client.sync_client.close()
+        self._clients.clear()
+        self._batchers.clear()
+
+
+graph_clients = GraphClientPool()
 
 
 async def run_graph(
@@ -19,40 +189,49 @@ async def run_graph(
     citations: list[dict] = [],
     source_str: str = "",
     custom_instructions: str = None,
+    use_cache: bool = True,
+    timeout: float | None = None,
 ) -> EvaluationOutputState:
-    """Run the evaluation graph with optional search mode and caching."""
-    search_graph = RemoteRunnable(os.getenv("SEARCH_ENDPOINT"))
-    eval_graph = RemoteRunnable(os.getenv("EVAL_ENDPOINT"))
-
-    if search_mode:
-        if not cached or source_str == "linkedin_only":
-            return await search_graph.ainvoke(
-                SearchInputState(
-                    profile=profile,
-                    job=job,
-                    number_of_queries=number_of_queries,
-                    confidence_threshold=confidence_threshold,
-                    custom_instructions=custom_instructions,
-                )
-            )
-        else:
-            return await eval_graph.ainvoke(
-                EvaluationInputState(
-                    source_str=source_str,
-                    profile=profile,
-                    job=job,
-                    citations=citations,
-                    custom_instructions=custom_instructions,
-                )
-            )
+    """Run the evaluation graph with optional search mode and caching.
+
+    Results are served from the evaluation cache when the same inputs were
+    evaluated before; pass use_cache=False to force a fresh run.
+    """
+    if search_mode and (not cached or source_str == "linkedin_only"):
+        graph = "search"
+        state = SearchInputState(
+            profile=profile,
+            job=job,
+            number_of_queries=number_of_queries,
+            confidence_threshold=confidence_threshold,
+            custom_instructions=custom_instructions,
+        )
+    elif search_mode:
+        graph = "eval"
+        state = EvaluationInputState(
+            source_str=source_str,
+            profile=profile,
+            job=job,
+            citations=citations,
+            custom_instructions=custom_instructions,
+        )
     else:
-        return await eval_graph.ainvoke(
-            EvaluationInputState(
-                source_str="",
-                profile=profile,
-                job=job,
-                citations=[],
-                custom_instructions=custom_instructions,
-            )
+        graph = "eval"
+        state = EvaluationInputState(
+            source_str="",
+            profile=profile,
+            job=job,
+            citations=[],
+            custom_instructions=custom_instructions,
         )
-    
\ No newline at end of file
+
+    key = eval_cache.key_for(graph, state)
+    if use_cache:
+        result = await run_in_threadpool(eval_cache.get, key)
+        if result is not None:
+            return result
+
+    result = await graph_clients.invoke(graph, state, timeout)
+
+    await run_in_threadpool(eval_cache.set, key, result)
+    return result
@@ -1,20 +1,158 @@
 from firebase_admin import auth, credentials, initialize_app
 import firebase_admin
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from collections import OrderedDict
+from dotenv import load_dotenv
+import asyncio
+import hashlib
+import os
+import threading
+import time
+
+load_dotenv()
 
 # Initialize Firebase Admin if not already initialized
 if not firebase_admin._apps:
     cred = credentials.ApplicationDefault()
     initialize_app(cred)
 
+# Maximum number of verified tokens kept in memory
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+# Seconds before a token's exp at which it stops being served from the cache
+TOKEN_CACHE_EXPIRY_LEEWAY_SECONDS = int(
+    os.getenv("TOKEN_CACHE_EXPIRY_LEEWAY_SECONDS", "30")
+)
+
+
+class TokenCache:
+    """
+    Cache of verified Firebase ID tokens, keyed by a hash of the token.
+
+    A cached token is trusted until shortly before its `exp`, so repeated
+    requests with the same token skip signature verification. Only successful
+    verifications are cached; concurrent requests with an unverified token
+    share a single verification.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = TOKEN_CACHE_MAX_ENTRIES,
+        leeway_seconds: int = TOKEN_CACHE_EXPIRY_LEEWAY_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.leeway_seconds = leeway_seconds
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        # Requests that waited for another request's verification of the same token
+        self.shared = 0
+        self.failures = 0
+        self.verify_seconds = 0.0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> str | None:
+        """Return the user ID of a cached, unexpired token."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            uid, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return uid
+
+    def put(self, token: str, decoded_token: dict) -> None:
+        expires_at = decoded_token.get("exp", 0) - self.leeway_seconds
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._entries[self._key(token)] = (decoded_token["uid"], expires_at)
+            self._entries.move_to_end(self._key(token))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def verify(self, token: str) -> str:
+        """Return the user ID for a token, verifying it in a worker thread on a miss."""
+        uid = self.get(token)
+        if uid is not None:
+            self.hits += 1
+            return uid
+
+        key = self._key(token)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.shared += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # Only the verifying request was cancelled; verify the token again
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            return await self.verify(token)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            start = time.monotonic()
+            try:
+                decoded_token = await run_in_threadpool(auth.verify_id_token, token)
+            finally:
+                self.verify_seconds += time.monotonic() - start
+        except Exception as e:
+            self.failures += 1
+            future.set_exception(e)
+            # Waiters re-raise the error; don't warn when there are none
+            future.exception()
+            raise
+        else:
+            self.put(token, decoded_token)
+            future.set_result(decoded_token["uid"])
+            return decoded_token["uid"]
+        finally:
+            del self._inflight[key]
+            if not future.done():
+                # The verifying request was cancelled; release its waiters
+                future.cancel()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and the verification time the cache avoided."""
+        total = self.hits + self.misses + self.shared
+        avg_verify = self.verify_seconds / self.misses if self.misses else 0.0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "failures": self.failures,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "cached": len(self._entries),
+            "avg_verify_ms": avg_verify * 1000,
+            "estimated_ms_saved": self.hits * avg_verify * 1000,
+        }
+
+
+token_cache = TokenCache()
+
 
 async def verify_firebase_token(token: str) -> str:
     """
     Verify Firebase ID token and return the user ID
     """
     try:
-        decoded_token = auth.verify_id_token(token)
-        return decoded_token["uid"]
+        return await token_cache.verify(token)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
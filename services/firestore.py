@@ -1,4 +1,7 @@
 from google.cloud import firestore
+from google.api_core.exceptions import FailedPrecondition, NotFound
+import base64
+import json
 import os
 import dotenv
 from google.cloud.firestore_v1.vector import Vector
@@ -24,7 +27,7 @@ def get_search_credits(user_id: str) -> int:
     user_dict = doc.to_dict() if doc.exists else {}
     if "search_credits" not in user_dict:
         user_dict["search_credits"] = 100
-        doc_ref.set(user_dict)
+        doc_ref.set({"search_credits": 100}, merge=True)
     return user_dict["search_credits"]
 
 
@@ -44,15 +47,12 @@ def set_popup_shown(user_id: str):
 
 
 def decrement_search_credits(user_id: str) -> int:
-    """Decrement the number of search credits remaining for a user"""
+    """Atomically take one search credit from a user who has no reservation"""
     doc_ref = db.collection("users").document(user_id)
-    doc = doc_ref.get()
-    user_dict = doc.to_dict() if doc.exists else {}
-    if "search_credits" not in user_dict:
-        user_dict["search_credits"] = 100
-    user_dict["search_credits"] -= 1
-    doc_ref.set(user_dict)
-    return user_dict["search_credits"]
+    # Make sure new users start from the default balance before decrementing
+    get_search_credits(user_id)
+    doc_ref.update({"search_credits": firestore.Increment(-1)})
+    return doc_ref.get(["search_credits"]).get("search_credits")
 
 
 def edit_key_traits(job_id: str, user_id: str, key_traits: dict):
@@ -197,7 +197,34 @@ def add_candidate_to_job(
         .collection("candidates")
         .document(candidate_id)
     )
-    job_ref.set(candidate_data)
+    job_ref.set(_with_sort_keys(candidate_data))
+
+
+def get_job_candidate(job_id: str, candidate_id: str, user_id: str) -> dict | None:
+    """Get the job-specific data for a candidate, or None if it is not in the job"""
+    doc = (
+        db.collection("users")
+        .document(user_id)
+        .collection("jobs")
+        .document(job_id)
+        .collection("candidates")
+        .document(candidate_id)
+        .get()
+    )
+    return doc.to_dict() if doc.exists else None
+
+
+def update_job_candidate(job_id: str, candidate_id: str, user_id: str, data: dict):
+    """Update fields of a candidate in a job"""
+    (
+        db.collection("users")
+        .document(user_id)
+        .collection("jobs")
+        .document(job_id)
+        .collection("candidates")
+        .document(candidate_id)
+        .update(data)
+    )
 
 
 def remove_candidate_from_job(job_id: str, candidate_id: str, user_id: str):
@@ -292,6 +319,221 @@ def get_candidates(
     return loading_indicators + sorted_candidates
 
 
+# Bump when the denormalized sort keys change so existing jobs are backfilled
+SORT_KEYS_VERSION = 1
+LOADING_INDICATOR_RANK = 10**12
+PROCESSING_RANK = -1
+# Fields returned by the paginated candidate list view
+CANDIDATE_LIST_FIELDS = [
+    "status",
+    "name",
+    "sections",
+    "summary",
+    "required_met",
+    "optional_met",
+    "fit",
+    "favorite",
+    "search_mode",
+    "is_loading_indicator",
+    "rank",
+    "trait_values",
+]
+CANDIDATE_BASE_LIST_FIELDS = ["name", "url", "public_identifier"]
+# Candidates read at most for one filtered page before returning what was found
+CANDIDATE_FILTER_MAX_SCAN = int(os.getenv("CANDIDATE_FILTER_MAX_SCAN", "1000"))
+
+# Jobs whose candidates are known to carry the current sort keys
+_sort_keys_ready: set[tuple[str, str]] = set()
+
+
+def _with_sort_keys(candidate_data: dict) -> dict:
+    """
+    Add denormalized sort keys to job-candidate data.
+
+    `rank` orders candidates by (required_met, optional_met, fit) with loading
+    indicators first and in-progress candidates last; `trait_values` stores
+    the boolean value of each evaluated trait for filtering.
+    """
+    if candidate_data.get("is_loading_indicator"):
+        rank = LOADING_INDICATOR_RANK
+    elif "required_met" in candidate_data:
+        rank = (
+            (candidate_data.get("required_met") or 0) * 1_000_000
+            + (candidate_data.get("optional_met") or 0) * 1_000
+            + (candidate_data.get("fit") or 0)
+        )
+    else:
+        rank = PROCESSING_RANK
+
+    return {
+        **candidate_data,
+        "rank": rank,
+        "sort_keys_version": SORT_KEYS_VERSION,
+        "trait_values": {
+            section["section"]: section["value"]
+            for section in candidate_data.get("sections", [])
+            if isinstance(section, dict)
+            and "section" in section
+            and isinstance(section.get("value"), bool)
+        },
+    }
+
+
+def _backfill_sort_keys(doc, attempts: int = 3) -> bool:
+    """
+    Write sort keys on a job candidate that lacks the current version of them.
+
+    The write is conditioned on the document being unchanged since it was
+    read, so a result saved in the meantime never gets stale keys; the
+    current version is read and checked again instead.
+
+    Returns:
+        bool: False if the candidate kept changing and still lacks sort keys
+    """
+    for _ in range(attempts):
+        data = doc.to_dict() if doc.exists else None
+        if not data or data.get("sort_keys_version") == SORT_KEYS_VERSION:
+            return True
+        sort_keys = _with_sort_keys(data)
+        try:
+            doc.reference.update(
+                {
+                    field: sort_keys[field]
+                    for field in ("rank", "sort_keys_version", "trait_values")
+                },
+                option=db.write_option(last_update_time=doc.update_time),
+            )
+            return True
+        except NotFound:
+            return True
+        except FailedPrecondition:
+            doc = doc.reference.get()
+    return False
+
+
+def _ensure_sort_keys(job_id: str, user_id: str) -> None:
+    """
+    Backfill sort keys on candidates written before they were denormalized.
+
+    Each job is checked once per process; candidates written afterwards get
+    their sort keys from add_candidate_to_job. The job is only marked as
+    backfilled once every candidate has its keys.
+    """
+    if (user_id, job_id) in _sort_keys_ready:
+        return
+    job_ref = db.collection("users").document(user_id).collection("jobs").document(job_id)
+    job = job_ref.get(field_paths=["candidate_sort_keys"])
+    if job.exists and (job.to_dict() or {}).get("candidate_sort_keys") == SORT_KEYS_VERSION:
+        _sort_keys_ready.add((user_id, job_id))
+        return
+
+    complete = True
+    for doc in job_ref.collection("candidates").stream():
+        if not _backfill_sort_keys(doc):
+            logging.warning(f"Could not backfill sort keys for candidate {doc.id}")
+            complete = False
+
+    if job.exists and complete:
+        job_ref.update({"candidate_sort_keys": SORT_KEYS_VERSION})
+        _sort_keys_ready.add((user_id, job_id))
+
+
+def _encode_cursor(rank: int, candidate_id: str) -> str:
+    return base64.urlsafe_b64encode(
+        json.dumps({"rank": rank, "id": candidate_id}).encode()
+    ).decode()
+
+
+def _decode_cursor(cursor: str) -> dict:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return {"rank": data["rank"], "__name__": data["id"]}
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def get_candidates_page(
+    job_id: str,
+    user_id: str,
+    limit: int = 50,
+    cursor: str | None = None,
+    filter_traits: list[str] | None = None,
+) -> tuple[list, str | None]:
+    """
+    Get one page of a job's candidates in list-view form.
+
+    Candidates are ordered by Firestore on the denormalized `rank` key and
+    returned without their profile, context or citations. Trait filters are
+    applied to the stored per-trait booleans while paging; a filtered page
+    stops after reading CANDIDATE_FILTER_MAX_SCAN candidates and may then hold
+    fewer than `limit`, with a cursor to continue from.
+
+    Returns:
+        tuple[list, str | None]: Candidates and an opaque cursor for the next
+        page (None on the last page)
+    """
+    if cursor is None:
+        # A cursor comes from an earlier page, which already backfilled the job
+        _ensure_sort_keys(job_id, user_id)
+
+    query = (
+        db.collection("users")
+        .document(user_id)
+        .collection("jobs")
+        .document(job_id)
+        .collection("candidates")
+        .order_by("rank", direction=firestore.Query.DESCENDING)
+        .order_by("__name__", direction=firestore.Query.DESCENDING)
+        .select(CANDIDATE_LIST_FIELDS)
+    )
+    after = _decode_cursor(cursor) if cursor else None
+    # Read one candidate past the page to know whether there is a next page,
+    # and extra documents when filtering since some will be skipped
+    scan_size = limit * 4 if filter_traits else limit + 1
+
+    page = []
+    scanned = 0
+    has_more = False
+    while not has_more:
+        chunk_query = query.start_after(after) if after else query
+        docs = list(chunk_query.limit(scan_size).stream())
+        for doc in docs:
+            data = doc.to_dict()
+            position = {"rank": data.get("rank"), "__name__": doc.id}
+            trait_values = data.pop("trait_values", {}) or {}
+            if filter_traits and not data.get("is_loading_indicator"):
+                if not all(trait_values.get(trait) is True for trait in filter_traits):
+                    after = position
+                    continue
+            if len(page) == limit:
+                has_more = True
+                break
+            page.append({**data, "id": doc.id})
+            after = position
+        else:
+            scanned += len(docs)
+            if len(docs) < scan_size:
+                break
+            if filter_traits and scanned >= CANDIDATE_FILTER_MAX_SCAN:
+                # Hand back what was found; the cursor resumes the scan
+                has_more = True
+
+    if page:
+        # Fill in list-view fields from the base candidate documents
+        base_refs = [db.collection("candidates").document(c["id"]) for c in page]
+        base_docs = {
+            doc.id: doc.to_dict()
+            for doc in db.get_all(base_refs, field_paths=CANDIDATE_BASE_LIST_FIELDS)
+            if doc.exists
+        }
+        page = [{**base_docs.get(c["id"], {}), **c} for c in page]
+
+    next_cursor = None
+    if has_more and after:
+        next_cursor = _encode_cursor(after["rank"], after["__name__"])
+    return page, next_cursor
+
+
 def _meets_trait_requirements(sections: list[dict], required_traits: list[str]) -> bool:
     """Check if candidate meets all required trait requirements."""
     trait_values = {
@@ -382,16 +624,8 @@ def add_search_credits(user_id: str, credits: int) -> int:
         The new total number of credits
     """
     doc_ref = db.collection("users").document(user_id)
-    doc = doc_ref.get()
-    user_dict = doc.to_dict() if doc.exists else {}
-
-    current_credits = user_dict.get("search_credits", 0)
-    new_total = current_credits + credits
-
-    user_dict["search_credits"] = new_total
-    doc_ref.set(user_dict)
-
-    return new_total
+    doc_ref.set({"search_credits": firestore.Increment(credits)}, merge=True)
+    return doc_ref.get(["search_credits"]).get("search_credits")
 
 
 def get_user_templates(user_id: str) -> UserTemplates:
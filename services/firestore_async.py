@@ -0,0 +1,117 @@
+"""
+Async Firestore access for request handlers.
+
+Mirrors the read/write helpers in services/firestore.py that async routes
+call, using the AsyncClient so they never block the event loop.
+"""
+
+import asyncio
+import os
+import dotenv
+from google.cloud import firestore
+from models.templates import UserTemplates
+from models.instructions import CustomInstructions
+import logging
+
+dotenv.load_dotenv()
+
+db = firestore.AsyncClient(database=os.getenv("DB"))
+
+
+def _settings(user_id: str):
+    return db.collection("users").document(user_id).collection("settings")
+
+
+async def get_job(job_id: str, user_id: str) -> dict:
+    """Get a specific job for a user"""
+    doc_ref = (
+        db.collection("users").document(user_id).collection("jobs").document(job_id)
+    )
+    doc = await doc_ref.get()
+    if doc.exists:
+        job = doc.to_dict()
+        job["id"] = doc.id
+        return job
+    return None
+
+
+async def edit_job(job_id: str, user_id: str, job_data: dict) -> bool:
+    """Edit a job's data"""
+    try:
+        doc_ref = (
+            db.collection("users").document(user_id).collection("jobs").document(job_id)
+        )
+        await doc_ref.update(job_data)
+        return True
+    except Exception as e:
+        logging.error(f"Error editing job: {str(e)}")
+        return False
+
+
+async def get_full_candidate(job_id: str, candidate_id: str, user_id: str) -> dict:
+    """Get a specific candidate for a job, or None if either document is missing"""
+    candidate_job_doc, candidate_doc = await asyncio.gather(
+        db.collection("users")
+        .document(user_id)
+        .collection("jobs")
+        .document(job_id)
+        .collection("candidates")
+        .document(candidate_id)
+        .get(),
+        db.collection("candidates").document(candidate_id).get(),
+    )
+    if not candidate_job_doc.exists or not candidate_doc.exists:
+        return None
+    return {**candidate_doc.to_dict(), **candidate_job_doc.to_dict()}
+
+
+async def get_user_templates(user_id: str) -> UserTemplates:
+    """Get user's templates"""
+    templates_ref = _settings(user_id)
+    linkedin_doc, email_doc = await asyncio.gather(
+        templates_ref.document("linkedin_template").get(),
+        templates_ref.document("email_template").get(),
+    )
+
+    return UserTemplates(
+        linkedin_template=linkedin_doc.get("content") if linkedin_doc.exists else None,
+        email_template=email_doc.get("content") if email_doc.exists else None,
+    )
+
+
+async def set_user_templates(user_id: str, templates: UserTemplates) -> UserTemplates:
+    """Set user's templates"""
+    templates_ref = _settings(user_id)
+    batch = db.batch()
+
+    if templates.linkedin_template is not None:
+        linkedin_ref = templates_ref.document("linkedin_template")
+        batch.set(linkedin_ref, {"content": templates.linkedin_template})
+
+    if templates.email_template is not None:
+        email_ref = templates_ref.document("email_template")
+        batch.set(email_ref, {"content": templates.email_template})
+
+    await batch.commit()
+    return await get_user_templates(user_id)
+
+
+async def get_custom_instructions(user_id: str) -> CustomInstructions:
+    """Get user's custom evaluation instructions"""
+    doc = await _settings(user_id).document("evaluation_instructions").get()
+
+    return CustomInstructions(
+        evaluation_instructions=doc.get("content") if doc.exists else ""
+    )
+
+
+async def set_custom_instructions(
+    user_id: str, instructions: CustomInstructions
+) -> CustomInstructions:
+    """Set user's custom evaluation instructions"""
+    if instructions.evaluation_instructions is not None:
+        await _settings(user_id).document("evaluation_instructions").set(
+            {"content": instructions.evaluation_instructions}
+        )
+
+    return await get_custom_instructions(user_id)
@@ -1,13 +1,110 @@
 from google.cloud import secretmanager
 from dotenv import load_dotenv
+import logging
 import os
+import threading
+import time
 
 load_dotenv()
 
+# Seconds a fetched secret is served from memory before it is read again
+SECRET_TTL_SECONDS = int(os.getenv("SECRET_TTL_SECONDS", "3600"))
 
-def get_secret(secret_id: str, version_id: str):
-    client = secretmanager.SecretManagerServiceClient()
-    name = f"projects/{os.getenv('PROJECT_ID')}/secrets/{secret_id}/versions/{version_id}"
+# Secrets the API reads on its hot paths, fetched in the background at startup
+KNOWN_SECRETS = [
+    ("azure-openai-endpoint", "1"),
+    ("azure-openai-api-key", "1"),
+    ("azure-openai-endpoint", "2"),
+    ("azure-openai-api-key", "2"),
+    ("proxycurl-api-key", "1"),
+    ("stripe-api-key", "1"),
+    ("stripe-webhook-secret", "1"),
+]
+
+
+class SecretCache:
+    """Process-wide cache of Secret Manager values with TTL-based refresh."""
+
+    def __init__(self, ttl_seconds: int = SECRET_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._client = None
+        self._values: dict[tuple[str, str], tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple[str, str], threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def client(self) -> secretmanager.SecretManagerServiceClient:
+        """Shared Secret Manager client, created on first use."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = secretmanager.SecretManagerServiceClient()
+        return self._client
+
+    def get(self, secret_id: str, version_id: str) -> str:
+        """Return a secret, reading Secret Manager only when the cached value expired."""
+        key = (secret_id, version_id)
+        cached = self._values.get(key)
+        if cached and cached[1] > time.monotonic():
+            self.hits += 1
+            return cached[0]
+
+        # Only one thread fetches a given secret; the rest wait for its result
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            cached = self._values.get(key)
+            if cached and cached[1] > time.monotonic():
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+            value = self._fetch(secret_id, version_id)
+            self._values[key] = (value, time.monotonic() + self.ttl_seconds)
+            return value
+
+    def _fetch(self, secret_id: str, version_id: str) -> str:
+        name = f"projects/{os.getenv('PROJECT_ID')}/secrets/{secret_id}/versions/{version_id}"
+        response = self.client.access_secret_version(request={"name": name})
+        return response.payload.data.decode("UTF-8")
+
+    def invalidate(self, secret_id: str | None = None) -> None:
+        """Drop one secret (all versions) or every secret from the cache."""
+        with self._lock:
+            if secret_id is None:
+                self._values.clear()
+            else:
+                for key in [k for k in self._values if k[0] == secret_id]:
+                    del self._values[key]
 
-    response = client.access_secret_version(request={"name": name})
-    return response.payload.data.decode("UTF-8")
+    def prefetch(self, secrets: list[tuple[str, str]] = KNOWN_SECRETS) -> threading.Thread:
+        """Warm the cache in a background thread."""
+
+        def run():
+            for secret_id, version_id in secrets:
+                try:
+                    self.get(secret_id, version_id)
+                except Exception as e:
+                    logging.error(f"Error prefetching secret {secret_id}: {str(e)}")
+
+        thread = threading.Thread(target=run, name="secret-prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "cached": len(self._values),
+        }
+
+
+secret_cache = SecretCache()
+
+
+def get_secret(secret_id: str, version_id: str):
+    return secret_cache.get(secret_id, version_id)
@@ -1,54 +1,470 @@
-from typing import Any
-from openai import AzureOpenAI
-from langchain_openai import AzureChatOpenAI
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Callable
+from dotenv import load_dotenv
 from langchain_core.language_models import BaseLanguageModel
 from services.get_secret import get_secret
-from langchain_google_vertexai import ChatVertexAI
 
+if TYPE_CHECKING:
+    from openai import AzureOpenAI
 
-openai_4o = AzureChatOpenAI(
-    deployment_name="gpt-4o",
-    openai_api_version="2024-08-01-preview",
-    azure_endpoint=get_secret("azure-openai-endpoint", "2"),
-    openai_api_key=get_secret("azure-openai-api-key", "2"),
-    temperature=0,
-    max_retries=5,
-)
+load_dotenv()
 
-openai_4o_mini = AzureChatOpenAI(
-    deployment_name="gpt-4o-mini",
-    openai_api_version="2024-08-01-preview",
-    azure_endpoint=get_secret("azure-openai-endpoint", "2"),
-    openai_api_key=get_secret("azure-openai-api-key", "2"),
-    temperature=0,
-    max_retries=5,
-)
+# Seconds one call may take across all providers before it is abandoned
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+# Timeout and retries of a single request inside each provider client
+LLM_REQUEST_TIMEOUT_SECONDS = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+# Send a second request to the fallback once the primary is slower than its p95
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "1"))
+# Consecutive failures that open a provider's circuit, and how long it stays open
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+# Maximum in-flight requests per provider, for sync and async callers each
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+
+
+class LazyProvider:
+    """
+    A chat model that is built on first use, once per process.
+
+    Construction imports the provider SDK and reads its secrets, so modules
+    that never call an LLM don't pay for it at import time. Attribute access
+    is forwarded to the built model.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], BaseLanguageModel]):
+        self.name = name
+        self._factory = factory
+        self._model: BaseLanguageModel | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> BaseLanguageModel:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._factory()
+        return self._model
+
+    @property
+    def initialized(self) -> bool:
+        return self._model is not None
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.get(), name)
+
+
+def _azure_chat(deployment_name: str) -> BaseLanguageModel:
+    from langchain_openai import AzureChatOpenAI
+
+    return AzureChatOpenAI(
+        deployment_name=deployment_name,
+        openai_api_version="2024-08-01-preview",
+        azure_endpoint=get_secret("azure-openai-endpoint", "2"),
+        openai_api_key=get_secret("azure-openai-api-key", "2"),
+        temperature=0,
+        timeout=LLM_REQUEST_TIMEOUT_SECONDS,
+        max_retries=LLM_MAX_RETRIES,
+    )
+
+
+def _gemini_2_flash() -> BaseLanguageModel:
+    from langchain_google_vertexai import ChatVertexAI
+
+    return ChatVertexAI(
+        model="gemini-2.0-flash-001",
+        timeout=LLM_REQUEST_TIMEOUT_SECONDS,
+        max_retries=LLM_MAX_RETRIES,
+    )
+
+
+openai_4o = LazyProvider("gpt-4o", lambda: _azure_chat("gpt-4o"))
+openai_4o_mini = LazyProvider("gpt-4o-mini", lambda: _azure_chat("gpt-4o-mini"))
+gemini_2_flash = LazyProvider("gemini-2.0-flash", _gemini_2_flash)
+
+
+class ProviderUnavailableError(Exception):
+    """Raised when every provider's circuit is open."""
+
+
+class ProviderHealth:
+    """
+    Circuit breaker and recent latencies for one LLM provider.
+
+    After LLM_BREAKER_FAILURES consecutive failures the circuit opens and
+    calls go straight to the fallbacks. Once LLM_BREAKER_RESET_SECONDS have
+    passed a single trial call is let through; its outcome closes or reopens
+    the circuit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = LLM_BREAKER_FAILURES,
+        reset_seconds: float = LLM_BREAKER_RESET_SECONDS,
+        window: int = 200,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+    ):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.thread_slots = threading.BoundedSemaphore(self.max_concurrency)
+        self.async_slots = asyncio.Semaphore(self.max_concurrency)
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_started_at: float | None = None
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.hedges = 0
+        self.short_circuited = 0
+
+    def allow(self) -> bool:
+        """Whether a call may be sent to this provider now."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            now = time.monotonic()
+            if self.state == "open":
+                if now - self.opened_at < self.reset_seconds:
+                    self.short_circuited += 1
+                    return False
+                self.state = "half_open"
+            # Half open: one trial at a time, replaced if it never reported back
+            if (
+                self._trial_started_at is not None
+                and now - self._trial_started_at < self.reset_seconds
+            ):
+                self.short_circuited += 1
+                return False
+            self._trial_started_at = now
+            return True
+
+    def record_success(self, seconds: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self._latencies.append(seconds)
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += 1
+            self.consecutive_failures += 1
+            self._trial_started_at = None
+            if (
+                self.state == "half_open"
+                or self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def p95(self) -> float | None:
+        """95th percentile latency of recent successful calls."""
+        with self._lock:
+            if len(self._latencies) < LLM_HEDGE_MIN_SAMPLES:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[int(0.95 * (len(latencies) - 1))]
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait on this provider before hedging to the next one."""
+        p95 = self.p95()
+        return None if p95 is None else max(p95, LLM_HEDGE_MIN_DELAY_SECONDS)
+
+    def stats(self) -> dict:
+        p95 = self.p95()
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "calls": self.calls,
+            "errors": self.errors,
+            "hedges": self.hedges,
+            "short_circuited": self.short_circuited,
+            "max_concurrency": self.max_concurrency,
+            "p95_ms": p95 * 1000 if p95 is not None else None,
+        }
+
+
+_provider_health: dict[str, ProviderHealth] = {}
+_provider_health_lock = threading.Lock()
+
+
+def _provider_name(provider: Any) -> str:
+    return getattr(provider, "name", None) or type(provider).__name__
+
+
+def get_provider_health(provider: Any) -> ProviderHealth:
+    """Health of a provider, shared by every wrapper that uses it."""
+    name = _provider_name(provider)
+    with _provider_health_lock:
+        if name not in _provider_health:
+            _provider_health[name] = ProviderHealth(name)
+        return _provider_health[name]
+
+
+_structured_runnables: dict[tuple[str, Any], Any] = {}
+_structured_runnables_lock = threading.Lock()
+
+
+def get_structured_runnable(provider: Any, cls: Any):
+    """
+    `provider.with_structured_output(cls)`, bound once per process.
+
+    Binding converts the output class to a JSON schema and builds a new
+    runnable, which is wasted work when repeated on every call.
+    """
+    key = (_provider_name(provider), cls)
+    runnable = _structured_runnables.get(key)
+    if runnable is None:
+        with _structured_runnables_lock:
+            runnable = _structured_runnables.get(key)
+            if runnable is None:
+                runnable = provider.with_structured_output(cls)
+                _structured_runnables[key] = runnable
+    return runnable
 
-gemini_2_flash = ChatVertexAI(
-    model="gemini-2.0-flash-001",
+
+def llm_health() -> dict:
+    """Circuit state and latency of every provider that has been called."""
+    return {name: health.stats() for name, health in _provider_health.items()}
+
+
+# Threads that run sync provider calls so they can be abandoned at the deadline
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("LLM_THREAD_POOL_SIZE", "64")),
+    thread_name_prefix="llm",
 )
 
 
+class _FallbackAttempts:
+    """
+    State of one call across the primary and its fallbacks.
+
+    Providers are tried in order, skipping those whose circuit is open. Each
+    provider gets an equal share of the time left for itself and the
+    providers after it. The next provider is started when the current one
+    fails, uses up its share or, with hedging, runs past its p95 latency.
+    Slower attempts keep running and the first success wins.
+    """
+
+    def __init__(self, providers: list, timeout: float, hedge: bool):
+        self.providers = providers
+        self.hedge = hedge
+        self.deadline = time.monotonic() + timeout
+        self.index = 0
+        self.hedged = False
+        self.share_ends = self.deadline
+        self.pending: dict[Any, tuple[ProviderHealth, float]] = {}
+        self.errors: list[Exception] = []
+
+    def next_provider(self) -> Any | None:
+        while self.index < len(self.providers):
+            provider = self.providers[self.index]
+            self.index += 1
+            if get_provider_health(provider).allow():
+                return provider
+        return None
+
+    def track(self, provider: Any, future: Any) -> None:
+        now = time.monotonic()
+        self.pending[future] = (get_provider_health(provider), now)
+        remaining = len(self.providers) - self.index + 1
+        self.share_ends = now + (self.deadline - now) / remaining
+
+    def wait_timeout(self) -> float:
+        """Seconds until the deadline or the next provider is due."""
+        now = time.monotonic()
+        timeout = self.deadline - now
+        fallback_at = self._fallback_at()
+        if fallback_at is not None:
+            timeout = min(timeout, fallback_at - now)
+        return max(0.0, timeout)
+
+    def _fallback_at(self) -> float | None:
+        if self.index >= len(self.providers):
+            return None
+        hedge_at = self._hedge_at()
+        return self.share_ends if hedge_at is None else min(hedge_at, self.share_ends)
+
+    def _hedge_at(self) -> float | None:
+        if (
+            not self.hedge
+            or self.hedged
+            or len(self.pending) != 1
+            or self.index >= len(self.providers)
+        ):
+            return None
+        health, started = next(iter(self.pending.values()))
+        delay = health.hedge_delay()
+        return None if delay is None else started + delay
+
+    def fallback_due(self) -> bool:
+        """Whether the next provider should start alongside the pending ones."""
+        now = time.monotonic()
+        hedge_at = self._hedge_at()
+        if hedge_at is not None and now >= hedge_at:
+            self.hedged = True
+            next(iter(self.pending.values()))[0].hedges += 1
+            return True
+        return self.index < len(self.providers) and now >= self.share_ends
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+    def finish(self, future: Any) -> bool:
+        """Record a finished attempt and return whether it succeeded."""
+        health, started = self.pending.pop(future)
+        error = future.exception()
+        if error is None:
+            health.record_success(time.monotonic() - started)
+            return True
+        health.record_failure()
+        self.errors.append(error)
+        return False
+
+    def give_up(self) -> Exception:
+        """Abandon unfinished attempts and return the error to raise."""
+        if self.pending:
+            for future, (health, _) in self.pending.items():
+                future.cancel()
+                health.record_failure()
+            self.pending.clear()
+            return TimeoutError("LLM call did not finish before its deadline")
+        if self.errors:
+            return self.errors[0]
+        return ProviderUnavailableError("Every LLM provider's circuit is open")
+
+
 class LLMWithFallbacks:
+    """
+    An LLM that falls back to other providers when the primary fails.
+
+    Each call has an overall deadline shared out between the providers, skips
+    providers whose circuit breaker is open, and can hedge to the next
+    provider when the current one is slower than usual.
+    """
+
     def __init__(
-        self, primary_llm: BaseLanguageModel, fallbacks: list[BaseLanguageModel]
+        self,
+        primary_llm: BaseLanguageModel,
+        fallbacks: list[BaseLanguageModel],
+        timeout: float = LLM_TIMEOUT_SECONDS,
+        hedge: bool = LLM_HEDGE_ENABLED,
     ):
         self.primary_llm = primary_llm
         self.fallbacks = fallbacks
+        self.timeout = timeout
+        self.hedge = hedge
+        self._structured: dict[Any, StructuredLLMWithFallbacks] = {}
+
+    @property
+    def providers(self) -> list:
+        return [self.primary_llm, *self.fallbacks]
 
     def with_structured_output(self, cls):
-        return StructuredLLMWithFallbacks(self, cls)
+        structured = self._structured.get(cls)
+        if structured is None:
+            structured = self._structured.setdefault(
+                cls, StructuredLLMWithFallbacks(self, cls)
+            )
+        return structured
 
     def invoke(self, *args, **kwargs):
+        return self._call(lambda provider: provider, args, kwargs)
+
+    async def ainvoke(self, *args, **kwargs):
+        return await self._acall(lambda provider: provider, args, kwargs)
+
+    def batch(self, inputs: list, return_exceptions: bool = False, **kwargs) -> list:
+        """Invoke every input in parallel, each with its own fallbacks."""
+        return _batch(self.invoke, inputs, return_exceptions, kwargs)
+
+    async def abatch(
+        self, inputs: list, return_exceptions: bool = False, **kwargs
+    ) -> list:
+        """Async counterpart of batch."""
+        return await _abatch(self.ainvoke, inputs, return_exceptions, kwargs)
+
+    def _call(self, build: Callable[[Any], Any], args: tuple, kwargs: dict):
+        """Invoke `build(provider)` on the providers in a worker thread each."""
+        attempts = _FallbackAttempts(self.providers, self.timeout, self.hedge)
+
+        def start() -> bool:
+            provider = attempts.next_provider()
+            if provider is None:
+                return False
+            def run():
+                with get_provider_health(provider).thread_slots:
+                    return build(provider).invoke(*args, **kwargs)
+
+            future = _executor.submit(run)
+            attempts.track(provider, future)
+            return True
+
+        start()
+        while attempts.pending and not attempts.expired():
+            done, _ = wait(
+                attempts.pending,
+                timeout=attempts.wait_timeout(),
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                if attempts.finish(future):
+                    for other in attempts.pending:
+                        other.cancel()
+                    return future.result()
+            if (not done and attempts.fallback_due()) or not attempts.pending:
+                start()
+        raise attempts.give_up()
+
+    async def _acall(self, build: Callable[[Any], Any], args: tuple, kwargs: dict):
+        """Async counterpart of _call, running each attempt as a task."""
+        attempts = _FallbackAttempts(self.providers, self.timeout, self.hedge)
+
+        def start() -> bool:
+            provider = attempts.next_provider()
+            if provider is None:
+                return False
+
+            async def run():
+                async with get_provider_health(provider).async_slots:
+                    return await build(provider).ainvoke(*args, **kwargs)
+
+            attempts.track(provider, asyncio.ensure_future(run()))
+            return True
+
+        start()
         try:
-            return self.primary_llm.invoke(*args, **kwargs)
-        except Exception as e:
-            for fallback in self.fallbacks:
-                try:
-                    return fallback.invoke(*args, **kwargs)
-                except Exception:
-                    continue
-            raise e
+            while attempts.pending and not attempts.expired():
+                done, _ = await asyncio.wait(
+                    attempts.pending,
+                    timeout=attempts.wait_timeout(),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if attempts.finish(task):
+                        return task.result()
+                if (not done and attempts.fallback_due()) or not attempts.pending:
+                    start()
+            raise attempts.give_up()
+        finally:
+            # Cancel hedged losers, and everything if the caller was cancelled
+            for task in attempts.pending:
+                task.cancel()
 
 
 class StructuredLLMWithFallbacks:
@@ -56,25 +472,66 @@ class StructuredLLMWithFallbacks:
         self.llm_with_fallbacks = llm_with_fallbacks
         self.cls = cls
 
+    def _structured(self, provider: Any):
+        return get_structured_runnable(provider, self.cls)
+
     def invoke(self, *args, **kwargs):
-        primary = self.llm_with_fallbacks.primary_llm.with_structured_output(self.cls)
+        return self.llm_with_fallbacks._call(self._structured, args, kwargs)
+
+    async def ainvoke(self, *args, **kwargs):
+        return await self.llm_with_fallbacks._acall(self._structured, args, kwargs)
+
+    def batch(self, inputs: list, return_exceptions: bool = False, **kwargs) -> list:
+        """Invoke every input in parallel, each with its own fallbacks."""
+        return _batch(self.invoke, inputs, return_exceptions, kwargs)
+
+    async def abatch(
+        self, inputs: list, return_exceptions: bool = False, **kwargs
+    ) -> list:
+        """Async counterpart of batch."""
+        return await _abatch(self.ainvoke, inputs, return_exceptions, kwargs)
+
+
+def _batch(
+    invoke: Callable[..., Any], inputs: list, return_exceptions: bool, kwargs: dict
+) -> list:
+    """
+    Run `invoke` over inputs on a pool of its own, so waiting calls never
+    hold the threads the provider requests run on. Provider slots bound how
+    many requests are actually in flight.
+    """
+    if not inputs:
+        return []
+
+    def run(input):
         try:
-            return primary.invoke(*args, **kwargs)
+            return invoke(input, **kwargs)
         except Exception as e:
-            for fallback in self.llm_with_fallbacks.fallbacks:
-                try:
-                    fallback_structured = fallback.with_structured_output(self.cls)
-                    return fallback_structured.invoke(*args, **kwargs)
-                except Exception:
-                    continue
-            raise e
+            if return_exceptions:
+                return e
+            raise
+
+    workers = min(len(inputs), LLM_MAX_CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-batch") as pool:
+        return list(pool.map(run, inputs))
+
+
+async def _abatch(
+    ainvoke: Callable[..., Any], inputs: list, return_exceptions: bool, kwargs: dict
+) -> list:
+    return await asyncio.gather(
+        *(ainvoke(input, **kwargs) for input in inputs),
+        return_exceptions=return_exceptions,
+    )
 
 
 llm = LLMWithFallbacks(openai_4o, [gemini_2_flash])
 llm_fast = LLMWithFallbacks(openai_4o_mini, [gemini_2_flash])
 
 
-def get_azure_openai() -> AzureOpenAI:
+def get_azure_openai() -> "AzureOpenAI":
+    from openai import AzureOpenAI
+
     return AzureOpenAI(
         api_key=get_secret("azure-openai-api-key", "1"),
         api_version="2024-08-01-preview",
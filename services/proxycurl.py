@@ -1,3 +1,9 @@
+import asyncio
+import logging
+import os
+import random
+import time
+import aiohttp
 import requests
 from models.linkedin import (
     LinkedInProfile,
@@ -7,29 +13,27 @@ from models.linkedin import (
 from services.get_secret import get_secret
 from utils.date_utils import convert_date_dict
 
+PROXYCURL_BASE_URL = "https://nubela.co/proxycurl/api"
+PROFILE_ENDPOINT = f"{PROXYCURL_BASE_URL}/v2/linkedin"
+PERSONAL_EMAIL_ENDPOINT = f"{PROXYCURL_BASE_URL}/contact-api/personal-email"
+WORK_EMAIL_ENDPOINT = f"{PROXYCURL_BASE_URL}/linkedin/profile/email"
 
-def get_linkedin_profile(url: str) -> tuple[str, LinkedInProfile, str]:
-    """
-    Get basic LinkedIn profile data without company information.
+# Requests per minute allowed by our ProxyCurl plan
+PROXYCURL_RATE_LIMIT_PER_MINUTE = int(os.getenv("PROXYCURL_RATE_LIMIT_PER_MINUTE", "300"))
+PROXYCURL_TIMEOUT_SECONDS = float(os.getenv("PROXYCURL_TIMEOUT_SECONDS", "30"))
+PROXYCURL_MAX_RETRIES = int(os.getenv("PROXYCURL_MAX_RETRIES", "4"))
+PROXYCURL_MAX_CONNECTIONS = int(os.getenv("PROXYCURL_MAX_CONNECTIONS", "20"))
 
-    Args:
-        url: LinkedIn profile URL
+_session = requests.Session()
 
-    Returns:
-        tuple[str, LinkedInProfile, str]: Tuple of (full name, profile object, public identifier)
-    """
-    api_key = get_secret("proxycurl-api-key", "1")
-    headers = {"Authorization": "Bearer " + api_key}
-    api_endpoint = "https://nubela.co/proxycurl/api/v2/linkedin"
-    params = {"linkedin_profile_url": url}
-    response = requests.get(api_endpoint, params=params, headers=headers)
-    if response.status_code != 200:
-        raise ValueError("Missing required profile data from LinkedIn API")
 
-    data = response.json()
+def _headers() -> dict:
+    return {"Authorization": "Bearer " + get_secret("proxycurl-api-key", "1")}
 
-    # Convert the raw response into our structured model
-    profile = LinkedInProfile(
+
+def _parse_profile(data: dict) -> LinkedInProfile:
+    """Convert the raw ProxyCurl response into our structured model."""
+    return LinkedInProfile(
         full_name=data.get("full_name"),
         occupation=data.get("occupation"),
         headline=data.get("headline"),
@@ -65,19 +69,43 @@ def get_linkedin_profile(url: str) -> tuple[str, LinkedInProfile, str]:
         ],
     )
 
+
+def get_linkedin_profile(url: str) -> tuple[str, LinkedInProfile, str]:
+    """
+    Get basic LinkedIn profile data without company information.
+
+    Args:
+        url: LinkedIn profile URL
+
+    Returns:
+        tuple[str, LinkedInProfile, str]: Tuple of (full name, profile object, public identifier)
+    """
+    params = {"linkedin_profile_url": url}
+    response = _session.get(
+        PROFILE_ENDPOINT,
+        params=params,
+        headers=_headers(),
+        timeout=PROXYCURL_TIMEOUT_SECONDS,
+    )
+    if response.status_code != 200:
+        raise ValueError("Missing required profile data from LinkedIn API")
+
+    profile = _parse_profile(response.json())
     return profile.full_name, profile, profile.public_identifier
 
 
 def get_email(linkedin_profile_url: str) -> str:
     """Get email address associated with a LinkedIn profile."""
-    api_key = get_secret("proxycurl-api-key", "1")
-    headers = {"Authorization": "Bearer " + api_key}
-    api_endpoint = "https://nubela.co/proxycurl/api/contact-api/personal-email"
     params = {
         "linkedin_profile_url": linkedin_profile_url,
         "page_size": 1,
     }
-    response = requests.get(api_endpoint, params=params, headers=headers)
+    response = _session.get(
+        PERSONAL_EMAIL_ENDPOINT,
+        params=params,
+        headers=_headers(),
+        timeout=PROXYCURL_TIMEOUT_SECONDS,
+    )
     response = response.json()
     if not response["emails"]:
         return get_work_email(linkedin_profile_url)
@@ -85,13 +113,153 @@ def get_email(linkedin_profile_url: str) -> str:
 
 
 def get_work_email(linkedin_profile_url: str):
-    api_key = get_secret("proxycurl-api-key", "1")
-    headers = {"Authorization": "Bearer " + api_key}
-    api_endpoint = "https://nubela.co/proxycurl/api/linkedin/profile/email"
     params = {
         "linkedin_profile_url": linkedin_profile_url,
         "page_size": 1,
     }
-    response = requests.get(api_endpoint, params=params, headers=headers)
+    response = _session.get(
+        WORK_EMAIL_ENDPOINT,
+        params=params,
+        headers=_headers(),
+        timeout=PROXYCURL_TIMEOUT_SECONDS,
+    )
     response = response.json()
     return response["emails"][0]
+
+
+class TokenBucket:
+    """Async token bucket that spaces requests to stay within a rate limit."""
+
+    def __init__(self, rate_per_minute: int, capacity: int | None = None):
+        self.rate = rate_per_minute / 60
+        self.capacity = capacity or max(1, rate_per_minute // 60)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ProxyCurlClient:
+    """
+    Asyncio ProxyCurl client sharing one keep-alive connection pool.
+
+    Requests are paced by a token bucket matched to the plan quota and retried
+    with jittered exponential backoff on 429 and 5xx responses.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: int = PROXYCURL_RATE_LIMIT_PER_MINUTE,
+        max_retries: int = PROXYCURL_MAX_RETRIES,
+        timeout_seconds: float = PROXYCURL_TIMEOUT_SECONDS,
+        max_connections: int = PROXYCURL_MAX_CONNECTIONS,
+    ):
+        self.bucket = TokenBucket(rate_per_minute)
+        self.max_retries = max_retries
+        self.timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        self.max_connections = max_connections
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=self.timeout,
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _backoff(self, attempt: int, retry_after: str | None = None) -> float:
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return random.uniform(0, min(30, 2**attempt))
+
+    async def get(self, endpoint: str, params: dict) -> tuple[int, dict | None]:
+        """
+        GET a ProxyCurl endpoint.
+
+        Returns:
+            tuple[int, dict | None]: HTTP status and decoded JSON body (None on errors)
+        """
+        session = self._get_session()
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            try:
+                async with session.get(
+                    endpoint, params=params, headers=_headers()
+                ) as response:
+                    if response.status == 429 or response.status >= 500:
+                        if attempt >= self.max_retries:
+                            return response.status, None
+                        delay = self._backoff(
+                            attempt, response.headers.get("Retry-After")
+                        )
+                    elif response.status != 200:
+                        return response.status, None
+                    else:
+                        return response.status, await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                logging.warning(f"ProxyCurl request failed, retrying: {str(e)}")
+                delay = self._backoff(attempt)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def get_linkedin_profile(self, url: str) -> tuple[str, LinkedInProfile, str]:
+        """Async variant of get_linkedin_profile."""
+        status_code, data = await self.get(
+            PROFILE_ENDPOINT, {"linkedin_profile_url": url}
+        )
+        if status_code != 200 or data is None:
+            raise ValueError("Missing required profile data from LinkedIn API")
+
+        profile = _parse_profile(data)
+        return profile.full_name, profile, profile.public_identifier
+
+    async def get_email(self, linkedin_profile_url: str) -> str | None:
+        """
+        Async variant of get_email.
+
+        Returns:
+            str | None: The personal email, else the work email, or None if
+                ProxyCurl has neither
+        """
+        params = {"linkedin_profile_url": linkedin_profile_url, "page_size": 1}
+        for endpoint in (PERSONAL_EMAIL_ENDPOINT, WORK_EMAIL_ENDPOINT):
+            _, data = await self.get(endpoint, params)
+            if data and data.get("emails"):
+                return data["emails"][0]
+        return None
+
+
+proxycurl_client = ProxyCurlClient()
+
+
+async def aget_linkedin_profile(url: str) -> tuple[str, LinkedInProfile, str]:
+    return await proxycurl_client.get_linkedin_profile(url)
+
+
+async def aget_email(linkedin_profile_url: str) -> str | None:
+    return await proxycurl_client.get_email(linkedin_profile_url)
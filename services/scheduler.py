@@ -0,0 +1,41 @@
+import asyncio
+import os
+from typing import Any, Callable
+
+from dotenv import load_dotenv
+from fastapi.concurrency import run_in_threadpool
+
+load_dotenv()
+
+# Maximum number of in-flight calls per downstream dependency
+DEPENDENCY_LIMITS = {
+    "proxycurl": int(os.getenv("PROXYCURL_MAX_CONCURRENCY", "10")),
+    "firestore": int(os.getenv("FIRESTORE_MAX_CONCURRENCY", "20")),
+    "search": int(os.getenv("SEARCH_MAX_CONCURRENCY", "10")),
+    "eval": int(os.getenv("EVAL_MAX_CONCURRENCY", "20")),
+}
+
+
+class DependencyLimiter:
+    """Per-dependency semaphores shared by every request in the process."""
+
+    def __init__(self, limits: dict[str, int]):
+        self.limits = dict(limits)
+        self._semaphores = {
+            name: asyncio.Semaphore(max(1, limit)) for name, limit in limits.items()
+        }
+
+    def limit(self, dependency: str) -> asyncio.Semaphore:
+        """Return the semaphore guarding a dependency, for use with `async with`."""
+        return self._semaphores[dependency]
+
+    async def run_in_threadpool(
+        self, dependency: str, func: Callable[..., Any], *args, **kwargs
+    ) -> Any:
+        """Run a blocking call in the threadpool once a slot for the dependency is free."""
+        async with self.limit(dependency):
+            return await run_in_threadpool(func, *args, **kwargs)
+
+
+limiter = DependencyLimiter(DEPENDENCY_LIMITS)
+
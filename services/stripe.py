@@ -5,44 +5,103 @@ from dotenv import load_dotenv
 import services.firestore as firestore
 from services.firestore import add_search_credits, update_user_subscription
 import logging
+import threading
 
 load_dotenv()
 
-stripe.api_key = get_secret("stripe-api-key", "1")
-
-# Create products for paid tiers only
-growth_product = stripe.Product.create(
-    name="Growth",
-    description="Best for small teams and agencies - 1000 credits with rollover credits (2 months), unlimited jobs, and dedicated support.",
-)
-
-pro_product = stripe.Product.create(
-    name="Pro",
-    description="Best for large teams - 5000 credits with dedicated Slack channel and ATS integrations.",
-)
-
-# Create prices for the paid products
-growth_price = stripe.Price.create(
-    product=growth_product.id,
-    unit_amount=20000,  # $200.00 in cents
-    currency="usd",
-    recurring={"interval": "month"},
-    metadata={"credits": "1000"},
-)
-
-pro_price = stripe.Price.create(
-    product=pro_product.id,
-    unit_amount=75000,  # $750.00 in cents
-    currency="usd",
-    recurring={"interval": "month"},
-    metadata={"credits": "5000"},
-)
-
-PRICE_IDS = {
-    "growth": growth_price.id,
-    "pro": pro_price.id,
+# Paid plans, looked up in Stripe by lookup key and created only if missing
+PLANS = {
+    "growth": {
+        "lookup_key": "styx_growth_monthly",
+        "name": "Growth",
+        "description": "Best for small teams and agencies - 1000 credits with rollover credits (2 months), unlimited jobs, and dedicated support.",
+        "unit_amount": 20000,  # $200.00 in cents
+        "credits": "1000",
+    },
+    "pro": {
+        "lookup_key": "styx_pro_monthly",
+        "name": "Pro",
+        "description": "Best for large teams - 5000 credits with dedicated Slack channel and ATS integrations.",
+        "unit_amount": 75000,  # $750.00 in cents
+        "credits": "5000",
+    },
 }
 
+_api_key_lock = threading.Lock()
+
+
+def configure_stripe() -> None:
+    """Set the Stripe API key on first use instead of at import time."""
+    if stripe.api_key:
+        return
+    with _api_key_lock:
+        if not stripe.api_key:
+            stripe.api_key = get_secret("stripe-api-key", "1")
+
+
+class PriceCatalog:
+    """
+    Lazily resolved, memoized Stripe price IDs for the paid plans.
+
+    The first lookup lists existing prices by lookup key in one request and
+    creates the product and price only for plans Stripe does not know yet.
+    Later lookups are served from memory until refresh() is called.
+    """
+
+    def __init__(self, plans: dict = PLANS):
+        self.plans = plans
+        self._price_ids: dict[str, str] | None = None
+        self._lock = threading.Lock()
+
+    def get_price_id(self, plan_id: str) -> str | None:
+        return self.price_ids().get(plan_id.lower())
+
+    def price_ids(self) -> dict[str, str]:
+        if self._price_ids is None:
+            with self._lock:
+                if self._price_ids is None:
+                    self._price_ids = self._resolve()
+        return self._price_ids
+
+    def refresh(self) -> dict[str, str]:
+        """Look the prices up again, e.g. after they were changed in Stripe."""
+        with self._lock:
+            self._price_ids = self._resolve()
+        return self._price_ids
+
+    def _resolve(self) -> dict[str, str]:
+        configure_stripe()
+        lookup_keys = {plan["lookup_key"]: plan_id for plan_id, plan in self.plans.items()}
+        existing = stripe.Price.list(
+            lookup_keys=list(lookup_keys), active=True, limit=len(lookup_keys)
+        )
+        price_ids = {
+            lookup_keys[price.lookup_key]: price.id
+            for price in existing.data
+            if price.lookup_key in lookup_keys
+        }
+        for plan_id, plan in self.plans.items():
+            if plan_id not in price_ids:
+                price_ids[plan_id] = self._create_price(plan).id
+        return price_ids
+
+    def _create_price(self, plan: dict):
+        logging.info(f"Creating Stripe price {plan['lookup_key']}")
+        product = stripe.Product.create(
+            name=plan["name"], description=plan["description"]
+        )
+        return stripe.Price.create(
+            product=product.id,
+            unit_amount=plan["unit_amount"],
+            currency="usd",
+            recurring={"interval": "month"},
+            lookup_key=plan["lookup_key"],
+            metadata={"credits": plan["credits"]},
+        )
+
+
+price_catalog = PriceCatalog()
+
 
 def create_checkout_session(plan_id: str, user_id: str):
     """Create a Stripe checkout session for the specified plan"""
@@ -58,10 +117,11 @@ def create_checkout_session(plan_id: str, user_id: str):
                 else "https://app.styxlabs.co"
             ) + "/pricing/success"
 
-        price_id = PRICE_IDS.get(plan_id.lower())
+        price_id = price_catalog.get_price_id(plan_id)
         if not price_id:
             raise ValueError(f"Invalid plan ID: {plan_id}")
 
+        configure_stripe()
         checkout_session = stripe.checkout.Session.create(
             client_reference_id=user_id,
             line_items=[
@@ -3,6 +3,7 @@ from fastapi import HTTPException, status
 import logging
 from services.get_secret import get_secret
 import services.firestore as firestore
+from services.stripe import configure_stripe
 
 CREDITS_BY_PLAN = {
     "starter": 50,
@@ -11,7 +12,7 @@ CREDITS_BY_PLAN = {
 }
 
 
-async def handle_stripe_webhook(payload_str: str, sig_header: str):
+def handle_stripe_webhook(payload_str: str, sig_header: str):
     """Handle incoming Stripe webhook events"""
     try:
         if not sig_header:
@@ -62,6 +63,7 @@ async def handle_stripe_webhook(payload_str: str, sig_header: str):
             invoice = event["data"]["object"]
             subscription_id = invoice.get("subscription")
             if subscription_id:
+                configure_stripe()
                 subscription = stripe.Subscription.retrieve(subscription_id)
                 user_id = subscription.get("metadata", {}).get("user_id")
                 plan_id = subscription.get("metadata", {}).get("plan_id")
@@ -0,0 +1,363 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dotenv import load_dotenv
+from models.tasks import QueuedTask
+
+load_dotenv()
+
+# Seconds a claimed task stays leased before another worker may reclaim it
+TASK_LEASE_SECONDS = int(os.getenv("TASK_LEASE_SECONDS", "900"))
+# Attempts before a task is marked as permanently failed
+TASK_MAX_ATTEMPTS = int(os.getenv("TASK_MAX_ATTEMPTS", "3"))
+
+_LEASE_EXPIRED = "Lease expired on the final attempt"
+
+
+class LeaseLostError(Exception):
+    """Raised when a worker reports on a task it no longer holds the lease of."""
+
+
+class TaskQueue(ABC):
+    """
+    Durable queue of background tasks.
+
+    Tasks are claimed with a lease; a worker that crashes mid-task simply lets
+    the lease expire and the task is handed to another worker. Every claim
+    gets a new lease token, and only the worker holding the current token may
+    complete or fail the task. Completed tasks are never handed out again.
+    """
+
+    @abstractmethod
+    def enqueue(self, tasks: list[QueuedTask]) -> None:
+        """Persist new pending tasks."""
+
+    @abstractmethod
+    def claim(self, lease_seconds: int = TASK_LEASE_SECONDS) -> QueuedTask | None:
+        """
+        Lease the oldest runnable task, or return None if there is none.
+
+        A task whose lease expired on its last attempt is not run again: it is
+        marked failed and returned with status "failed" so the caller can clean
+        up after it.
+        """
+
+    @abstractmethod
+    def complete(self, task: QueuedTask) -> None:
+        """
+        Mark a claimed task as done.
+
+        Raises:
+            LeaseLostError: If the task's lease expired and it was reclaimed
+        """
+
+    @abstractmethod
+    def fail(self, task: QueuedTask, error: str, retry: bool = True) -> bool:
+        """
+        Record a failed attempt of a claimed task, retrying it unless `retry`
+        is False or the task has used up its attempts.
+
+        Returns:
+            bool: True if the task will be retried, False if it failed permanently
+
+        Raises:
+            LeaseLostError: If the task's lease expired and it was reclaimed
+        """
+
+    @abstractmethod
+    def count_open(self, batch_id: str) -> int:
+        """Number of tasks in a batch that are not finished yet."""
+
+
+class SQLiteTaskQueue(TaskQueue):
+    """Task queue backed by a local SQLite file, shared by processes on one machine."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    batch_id TEXT,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_until REAL,
+                    lease_token TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, created_at)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_batch ON tasks (batch_id)")
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(tasks)")]
+            if "lease_token" not in columns:
+                conn.execute("ALTER TABLE tasks ADD COLUMN lease_token TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, tasks: list[QueuedTask]) -> None:
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks "
+                "(id, kind, payload, batch_id, status, attempts, created_at) "
+                "VALUES (?, ?, ?, ?, 'pending', 0, ?)",
+                [
+                    (task.id, task.kind, json.dumps(task.payload), task.batch_id, now)
+                    for task in tasks
+                ],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def claim(self, lease_seconds: int = TASK_LEASE_SECONDS) -> QueuedTask | None:
+        now = time.time()
+        lease_token = uuid.uuid4().hex
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id, kind, payload, batch_id, attempts, status FROM tasks "
+                "WHERE status = 'pending' OR (status = 'running' AND lease_until < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            task_id, kind, payload, batch_id, attempts, status = row
+            exhausted = status == "running" and attempts >= TASK_MAX_ATTEMPTS
+            if exhausted:
+                conn.execute(
+                    "UPDATE tasks SET status = 'failed', lease_until = NULL, "
+                    "lease_token = NULL, error = ? WHERE id = ?",
+                    (_LEASE_EXPIRED, task_id),
+                )
+            else:
+                conn.execute(
+                    "UPDATE tasks SET status = 'running', attempts = ?, "
+                    "lease_until = ?, lease_token = ? WHERE id = ?",
+                    (attempts + 1, now + lease_seconds, lease_token, task_id),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if exhausted:
+            return QueuedTask(
+                id=task_id,
+                kind=kind,
+                payload=json.loads(payload),
+                batch_id=batch_id,
+                status="failed",
+                attempts=attempts,
+                error=_LEASE_EXPIRED,
+            )
+        return QueuedTask(
+            id=task_id,
+            kind=kind,
+            payload=json.loads(payload),
+            batch_id=batch_id,
+            status="running",
+            attempts=attempts + 1,
+            lease_until=now + lease_seconds,
+            lease_token=lease_token,
+        )
+
+    def complete(self, task: QueuedTask) -> None:
+        cursor = self._connect().execute(
+            "UPDATE tasks SET status = 'done', lease_until = NULL, lease_token = NULL "
+            "WHERE id = ? AND status = 'running' AND lease_token = ?",
+            (task.id, task.lease_token),
+        )
+        if cursor.rowcount != 1:
+            raise LeaseLostError(f"Task {task.id} is no longer leased to this worker")
+
+    def fail(self, task: QueuedTask, error: str, retry: bool = True) -> bool:
+        retry = retry and task.attempts < TASK_MAX_ATTEMPTS
+        cursor = self._connect().execute(
+            "UPDATE tasks SET status = ?, lease_until = NULL, lease_token = NULL, "
+            "error = ? WHERE id = ? AND status = 'running' AND lease_token = ?",
+            ("pending" if retry else "failed", error, task.id, task.lease_token),
+        )
+        if cursor.rowcount != 1:
+            raise LeaseLostError(f"Task {task.id} is no longer leased to this worker")
+        return retry
+
+    def count_open(self, batch_id: str) -> int:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT COUNT(*) FROM tasks WHERE batch_id = ? "
+                "AND status IN ('pending', 'running')",
+                (batch_id,),
+            )
+            .fetchone()
+        )
+        return row[0]
+
+
+class FirestoreTaskQueue(TaskQueue):
+    """Task queue backed by a Firestore collection, shared by every worker instance."""
+
+    def __init__(self, collection: str = "task_queue"):
+        from google.cloud import firestore as gcf
+        from services.firestore import db
+
+        self._gcf = gcf
+        self.db = db
+        self.collection = db.collection(collection)
+
+    def enqueue(self, tasks: list[QueuedTask]) -> None:
+        batch = self.db.batch()
+        now = time.time()
+        for i, task in enumerate(tasks, start=1):
+            batch.set(
+                self.collection.document(task.id),
+                {**task.model_dump(), "status": "pending", "created_at": now},
+            )
+            # Firestore batches are limited to 500 writes
+            if i % 500 == 0:
+                batch.commit()
+                batch = self.db.batch()
+        if len(tasks) % 500 != 0:
+            batch.commit()
+
+    def claim(self, lease_seconds: int = TASK_LEASE_SECONDS) -> QueuedTask | None:
+        now = time.time()
+        candidates = list(
+            self.collection.where("status", "==", "pending")
+            .order_by("created_at")
+            .limit(10)
+            .stream()
+        )
+        if not candidates:
+            candidates = list(
+                self.collection.where("status", "==", "running")
+                .where("lease_until", "<", now)
+                .limit(10)
+                .stream()
+            )
+
+        @self._gcf.transactional
+        def try_claim(transaction, ref):
+            snapshot = ref.get(transaction=transaction)
+            data = snapshot.to_dict() if snapshot.exists else None
+            if not data:
+                return None
+            runnable = data["status"] == "pending" or (
+                data["status"] == "running" and (data.get("lease_until") or 0) < now
+            )
+            if not runnable:
+                return None
+            exhausted = data.get("attempts", 0) >= TASK_MAX_ATTEMPTS
+            if data["status"] == "running" and exhausted:
+                update = {
+                    "status": "failed",
+                    "lease_until": None,
+                    "lease_token": None,
+                    "error": _LEASE_EXPIRED,
+                }
+                data.update(update)
+                transaction.update(ref, update)
+                return data
+            update = {
+                "status": "running",
+                "attempts": data.get("attempts", 0) + 1,
+                "lease_until": now + lease_seconds,
+                "lease_token": uuid.uuid4().hex,
+            }
+            data.update(update)
+            transaction.update(ref, update)
+            return data
+
+        # Another worker may win the race for a task; try the next one
+        for doc in candidates:
+            data = try_claim(self.db.transaction(), doc.reference)
+            if data:
+                return QueuedTask(**{k: v for k, v in data.items() if k != "created_at"})
+        return None
+
+    def _finish(self, task: QueuedTask, update: dict) -> None:
+        """Apply `update` to a task in one transaction if the caller holds its lease."""
+        ref = self.collection.document(task.id)
+
+        @self._gcf.transactional
+        def try_finish(transaction):
+            snapshot = ref.get(transaction=transaction)
+            data = snapshot.to_dict() if snapshot.exists else None
+            if (
+                not data
+                or data["status"] != "running"
+                or data.get("lease_token") != task.lease_token
+            ):
+                raise LeaseLostError(
+                    f"Task {task.id} is no longer leased to this worker"
+                )
+            transaction.update(
+                ref, {**update, "lease_until": None, "lease_token": None}
+            )
+
+        try_finish(self.db.transaction())
+
+    def complete(self, task: QueuedTask) -> None:
+        self._finish(task, {"status": "done"})
+
+    def fail(self, task: QueuedTask, error: str, retry: bool = True) -> bool:
+        retry = retry and task.attempts < TASK_MAX_ATTEMPTS
+        self._finish(task, {"status": "pending" if retry else "failed", "error": error})
+        return retry
+
+    def count_open(self, batch_id: str) -> int:
+        query = self.collection.where("batch_id", "==", batch_id).where(
+            "status", "in", ["pending", "running"]
+        )
+        return query.count().get()[0][0].value
+
+
+_task_queue: TaskQueue | None = None
+_task_queue_lock = threading.Lock()
+
+
+def get_task_queue() -> TaskQueue:
+    """
+    Get the process-wide task queue.
+
+    TASK_QUEUE_BACKEND selects "firestore" (default) or "sqlite"; the SQLite
+    file location is taken from TASK_QUEUE_PATH.
+    """
+    global _task_queue
+    with _task_queue_lock:
+        if _task_queue is None:
+            backend = os.getenv("TASK_QUEUE_BACKEND", "firestore")
+            if backend == "sqlite":
+                _task_queue = SQLiteTaskQueue(
+                    os.getenv("TASK_QUEUE_PATH", "task_queue.sqlite3")
+                )
+            elif backend == "firestore":
+                _task_queue = FirestoreTaskQueue()
+            else:
+                raise ValueError(f"Unknown task queue backend: {backend}")
+        return _task_queue
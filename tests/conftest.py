@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Add the project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Placeholder settings so clients can be constructed without real credentials
+os.environ.setdefault("FIRESTORE_EMULATOR_HOST", "localhost:8080")
+os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "styx-tests")
+os.environ.setdefault("PROJECT_ID", "styx-tests")
+os.environ.setdefault("DB", "(default)")
@@ -0,0 +1,58 @@
+import pytest
+
+from agents.career_levels import (
+    TITLE_MATCH_CONFIDENCE,
+    _confident_match,
+    _title_levels,
+    match_career_level,
+)
+
+
+@pytest.mark.parametrize(
+    "title, expected",
+    [
+        ("Software Engineer", ("L2", "ENG")),
+        ("Sr. Software Engineer", ("L3", "ENG")),
+        ("Staff Software Engineer", ("L4", "ENG")),
+        ("Senior Staff Engineer", ("L5", "ENG")),
+        ("Product Manager", ("L2", "PM")),
+        ("VP of Engineering", ("L5", "EM")),
+        ("Vice President of Engineering", ("L5", "EM")),
+    ],
+)
+def test_exact_titles_skip_the_llm(title, expected):
+    assert _confident_match(title) == expected
+    assert match_career_level(title).confidence == 1.0
+
+
+@pytest.mark.parametrize(
+    "title",
+    [
+        "Principal Software Engineer",
+        "Lead Software Engineer",
+        "Distinguished Software Engineer",
+        "Software Engineer III",
+        "Software Engineer Intern",
+        "Senior Staff Software Engineer",
+        "Staff Product Manager",
+        "Product Manager Intern",
+    ],
+)
+def test_contained_titles_go_to_the_llm(title):
+    match = match_career_level(title)
+    assert match is not None
+    assert match.confidence < TITLE_MATCH_CONFIDENCE
+    assert _confident_match(title) is None
+
+
+def test_unknown_title_has_no_match():
+    assert match_career_level("Chief Happiness Officer") is None
+
+
+def test_duplicate_title_patterns_are_rejected():
+    levels = {
+        "ENG": {"L2": ["software engineer"]},
+        "PM": {"L2": ["software engineer"]},
+    }
+    with pytest.raises(ValueError):
+        _title_levels(levels)
@@ -0,0 +1,141 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from threading import Thread
+
+import pytest
+
+import services.eval_cache as eval_cache_module
+from models.evaluation import SearchInputState
+from models.jobs import Job, KeyTrait
+from models.linkedin import LinkedInProfile
+from services.eval_cache import DiskBackend, EvaluationCache, MemoryBackend
+
+PROFILES = Path(__file__).parent / "fixtures" / "profiles.json"
+RESULT = {"sections": [{"section": "Backend", "content": "Strong"}], "fit": 3}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EvaluationCache(DiskBackend(str(tmp_path / "eval_cache")), ttl_seconds=60)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(eval_cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def make_state(created_at: datetime, description: str = "Backend engineer"):
+    with open(PROFILES) as f:
+        profile = json.load(f)[0]["profile"]
+    return SearchInputState(
+        profile=LinkedInProfile(**profile),
+        job=Job(
+            job_description=description,
+            key_traits=[KeyTrait(trait="Backend", description="Builds APIs")],
+            job_title="Engineer",
+            company_name="Acme",
+            created_at=created_at,
+        ),
+        number_of_queries=3,
+        confidence_threshold=0.5,
+    )
+
+
+def test_memory_backend_returns_copies():
+    backend = MemoryBackend()
+    result = {"sections": [{"section": "Backend", "content": "Strong"}]}
+    backend.set("key", result, expires_at=1.0)
+    result["sections"].append({"section": "Leadership", "content": "Some"})
+
+    hit, _ = backend.get("key")
+    hit["sections"][0]["content"] = "Edited"
+
+    assert backend.get("key") == (
+        {"sections": [{"section": "Backend", "content": "Strong"}]},
+        1.0,
+    )
+
+
+def test_disk_backend_round_trips_results(cache):
+    cache.set("key", RESULT)
+
+    assert cache.get("key") == RESULT
+    assert cache.get("other") is None
+
+
+def test_entries_expire_after_the_ttl(cache, clock):
+    cache.set("key", RESULT)
+
+    clock[0] += 60
+    assert cache.get("key") == RESULT
+    clock[0] += 1
+    assert cache.get("key") is None
+
+
+def test_invalidate_drops_one_entry(cache):
+    cache.set("key", RESULT)
+    cache.set("other", RESULT)
+
+    cache.invalidate("key")
+
+    assert cache.get("key") is None
+    assert cache.get("other") == RESULT
+
+
+def test_invalidate_all_drops_every_entry(cache):
+    cache.set("key", RESULT)
+    cache.set("other", RESULT)
+
+    cache.invalidate_all()
+
+    assert cache.get("key") is None
+    assert cache.get("other") is None
+
+
+def test_key_ignores_job_creation_time():
+    first = make_state(datetime(2024, 1, 1))
+    recreated = make_state(datetime(2024, 6, 1))
+    edited = make_state(datetime(2024, 1, 1), description="Frontend engineer")
+
+    assert EvaluationCache.key_for("eval", first) == EvaluationCache.key_for(
+        "eval", recreated
+    )
+    assert EvaluationCache.key_for("eval", first) != EvaluationCache.key_for(
+        "eval", edited
+    )
+    assert EvaluationCache.key_for("eval", first) != EvaluationCache.key_for(
+        "search", first
+    )
+
+
+def test_stats_report_the_hit_ratio(cache):
+    cache.set("key", RESULT)
+    for key in ["key", "key", "key", "missing"]:
+        cache.get(key)
+
+    stats = cache.stats()
+
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+    assert stats["hit_ratio"] == 0.75
+    assert stats["backend"] == "DiskBackend"
+
+
+def test_concurrent_lookups_are_all_counted():
+    cache = EvaluationCache(MemoryBackend(), ttl_seconds=60)
+    cache.set("key", RESULT)
+
+    def look_up():
+        for _ in range(500):
+            cache.get("key")
+            cache.get("missing")
+
+    threads = [Thread(target=look_up) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert (cache.hits, cache.misses) == (4000, 4000)
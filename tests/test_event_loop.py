@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import agents.helper_functions as helper_functions
+import main
+import services.firestore_async as firestore_async
+from models.templates import UserTemplates
+
+
+class BlockingLLM:
+    """LLM stub whose calls stay pending until the test releases them."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def ainvoke(self, messages):
+        self.started.set()
+        await self.release.wait()
+        return SimpleNamespace(content="Hi Ada, are you open to a chat?")
+
+
+@pytest.fixture
+def app(monkeypatch):
+    async def get_job(job_id, user_id):
+        return {"id": job_id, "job_description": "Backend engineer"}
+
+    async def get_full_candidate(job_id, candidate_id, user_id):
+        return {"name": "Ada Lovelace", "sections": [], "citations": []}
+
+    async def get_user_templates(user_id):
+        return UserTemplates(linkedin_template=None, email_template=None)
+
+    monkeypatch.setattr(firestore_async, "get_job", get_job)
+    monkeypatch.setattr(firestore_async, "get_full_candidate", get_full_candidate)
+    monkeypatch.setattr(firestore_async, "get_user_templates", get_user_templates)
+    main.app.dependency_overrides[main.validate_user_id] = lambda: "user-1"
+    yield main.app
+    main.app.dependency_overrides.clear()
+
+
+def test_requests_are_served_while_an_llm_call_is_pending(app, monkeypatch):
+    async def scenario():
+        llm = BlockingLLM()
+        monkeypatch.setattr(helper_functions, "llm", llm)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            reachout = asyncio.create_task(
+                client.post(
+                    "/jobs/job-1/candidates/ada/generate-reachout",
+                    json={"format": "linkedin"},
+                )
+            )
+            await asyncio.wait_for(llm.started.wait(), timeout=5)
+
+            # The LLM call is still pending, yet other requests get answered
+            templates = await asyncio.wait_for(
+                client.get("/settings/templates"), timeout=5
+            )
+            assert templates.status_code == 200
+            assert not reachout.done()
+
+            llm.release.set()
+            response = await asyncio.wait_for(reachout, timeout=5)
+            assert response.status_code == 200
+            assert response.json() == {"reachout": "Hi Ada, are you open to a chat?"}
+
+    asyncio.run(scenario())
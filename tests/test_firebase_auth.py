@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import services.firebase_auth as firebase_auth
+from services.firebase_auth import TokenCache
+
+
+@pytest.fixture
+def verify_calls(monkeypatch):
+    calls = []
+
+    def verify_id_token(token):
+        calls.append(token)
+        time.sleep(0.05)
+        return {"uid": f"user-{token}", "exp": time.time() + 3600}
+
+    monkeypatch.setattr(firebase_auth.auth, "verify_id_token", verify_id_token)
+    return calls
+
+
+def test_cached_token_is_not_verified_again(verify_calls):
+    cache = TokenCache()
+
+    async def scenario():
+        return [await cache.verify("a"), await cache.verify("a")]
+
+    assert asyncio.run(scenario()) == ["user-a", "user-a"]
+    assert verify_calls == ["a"]
+    assert (cache.hits, cache.misses, cache.shared) == (1, 1, 0)
+
+
+def test_concurrent_requests_share_one_verification(verify_calls):
+    cache = TokenCache()
+
+    async def scenario():
+        return await asyncio.gather(*(cache.verify("a") for _ in range(3)))
+
+    assert asyncio.run(scenario()) == ["user-a"] * 3
+    assert verify_calls == ["a"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["shared"]) == (0, 1, 2)
+    assert stats["estimated_ms_saved"] == 0
+
+
+def test_waiters_verify_again_when_the_verifying_request_is_cancelled(monkeypatch):
+    calls = []
+    release = threading.Event()
+
+    def verify_id_token(token):
+        calls.append(token)
+        release.wait(5)
+        return {"uid": f"user-{token}", "exp": time.time() + 3600}
+
+    monkeypatch.setattr(firebase_auth.auth, "verify_id_token", verify_id_token)
+    cache = TokenCache()
+
+    async def scenario():
+        owner = asyncio.create_task(cache.verify("a"))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.create_task(cache.verify("a"))
+        await asyncio.sleep(0.05)
+        owner.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return await asyncio.wait_for(waiter, timeout=5)
+
+    assert asyncio.run(scenario()) == "user-a"
+    assert calls == ["a", "a"]
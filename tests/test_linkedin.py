@@ -0,0 +1,96 @@
+from datetime import date
+
+import pytest
+
+from models.linkedin import LinkedInCompany, LinkedInExperience, LinkedInProfile
+
+
+def make_company() -> LinkedInCompany:
+    return LinkedInCompany(company_id="acme-analytics", name="Acme Analytics")
+
+
+def test_read_only_company_refuses_assignment():
+    company = make_company()
+    company.make_read_only()
+
+    with pytest.raises(TypeError):
+        company.name = "Renamed"
+    assert company.name == "Acme Analytics"
+
+
+def test_copy_of_read_only_company_is_writable():
+    company = make_company()
+    company.make_read_only()
+
+    copy = company.model_copy()
+    copy.name = "Renamed"
+
+    assert copy.name == "Renamed"
+    assert company.name == "Acme Analytics"
+
+
+def test_copy_with_update_renders_new_text():
+    company = make_company()
+    before = company.to_context_string()
+
+    renamed = company.model_copy(update={"name": "Renamed"})
+
+    assert company.to_context_string() == before
+    assert "Renamed" in renamed.to_context_string()
+
+
+def make_profile() -> LinkedInProfile:
+    return LinkedInProfile(
+        full_name="Candidate One",
+        occupation=None,
+        headline=None,
+        summary=None,
+        city=None,
+        country=None,
+        public_identifier="candidate-001",
+        experiences=[
+            LinkedInExperience(
+                title="Software Engineer",
+                company="Acme Analytics",
+                description=None,
+                starts_at=date(2019, 2, 1),
+                ends_at=None,
+                location=None,
+                company_linkedin_profile_url=None,
+            )
+        ],
+    )
+
+
+def test_lists_cannot_be_changed_in_place():
+    profile = make_profile()
+
+    with pytest.raises(TypeError):
+        profile.experiences.append(profile.experiences[0])
+    with pytest.raises(TypeError):
+        profile.experiences[0] = profile.experiences[0]
+    assert len(profile.experiences) == 1
+
+
+def test_assigning_a_new_list_renders_new_text():
+    profile = make_profile()
+    before = profile.to_context_string()
+
+    profile.experiences = [
+        *profile.experiences,
+        profile.experiences[0].model_copy(update={"title": "Staff Engineer"}),
+    ]
+
+    assert "Staff Engineer" in profile.to_context_string()
+    assert before != profile.to_context_string()
+    with pytest.raises(TypeError):
+        profile.experiences.append(profile.experiences[0])
+
+
+def test_copies_keep_their_lists_frozen():
+    profile = make_profile()
+
+    for copy in (profile.model_copy(), profile.model_copy(deep=True)):
+        assert copy.experiences == profile.experiences
+        with pytest.raises(TypeError):
+            copy.experiences.append(copy.experiences[0])
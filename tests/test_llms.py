@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+import pytest
+
+from services.llms import LLMWithFallbacks
+
+
+class HangingProvider:
+    """Provider whose calls never answer until the test releases them."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.release = threading.Event()
+
+    def invoke(self, input):
+        self.release.wait()
+        return "primary"
+
+    async def ainvoke(self, input):
+        await asyncio.Event().wait()
+
+
+class AnsweringProvider:
+    def __init__(self, name: str):
+        self.name = name
+
+    def invoke(self, input):
+        return "fallback"
+
+    async def ainvoke(self, input):
+        return "fallback"
+
+
+@pytest.fixture
+def primary(request):
+    # Provider health is shared by name, so every test gets its own providers
+    provider = HangingProvider(f"hanging-{request.node.name}")
+    yield provider
+    provider.release.set()
+
+
+@pytest.fixture
+def fallback(request):
+    return AnsweringProvider(f"answering-{request.node.name}")
+
+
+def test_hanging_primary_falls_back_within_the_deadline(primary, fallback):
+    llm = LLMWithFallbacks(primary, [fallback], timeout=0.5)
+
+    assert llm.invoke("hello") == "fallback"
+
+
+def test_hanging_primary_falls_back_within_the_deadline_async(primary, fallback):
+    llm = LLMWithFallbacks(primary, [fallback], timeout=0.5)
+
+    assert asyncio.run(llm.ainvoke("hello")) == "fallback"
+
+
+def test_hanging_last_provider_times_out(primary):
+    llm = LLMWithFallbacks(primary, [], timeout=0.2)
+
+    with pytest.raises(TimeoutError):
+        llm.invoke("hello")
@@ -0,0 +1,72 @@
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from models.linkedin import LinkedInProfile
+from models.serializable import SerializableModel, _deserializer, _serializer
+from scripts.check_serialization import legacy_serializer
+
+# Anonymized candidate documents in the shape scripts/check_serialization.py dumps
+PROFILES = Path(__file__).parent / "fixtures" / "profiles.json"
+
+
+class Untyped(SerializableModel):
+    value: Any = None
+    mapping: dict[str, Any] = {}
+    items: list[Any] = []
+    name: str = ""
+
+
+@pytest.mark.parametrize("compiler", [_serializer, _deserializer])
+def test_fields_without_a_precise_type_are_planned(compiler):
+    assert set(compiler.plan(Untyped)) == {"value", "mapping", "items"}
+
+
+def test_dates_in_untyped_fields_are_serialized():
+    model = Untyped(
+        value=date(2024, 1, 2),
+        mapping={"at": datetime(2024, 1, 3, 12, 30)},
+        items=[date(2024, 1, 4)],
+        name="2024-01-05",
+    )
+
+    assert model.dict() == {
+        "value": "2024-01-02",
+        "mapping": {"at": "2024-01-03T12:30:00"},
+        "items": ["2024-01-04"],
+        "name": "2024-01-05",
+    }
+
+
+def test_dates_in_untyped_fields_are_deserialized():
+    model = Untyped.from_dict(
+        {
+            "value": "2024-01-02",
+            "mapping": {"at": "2024-01-03T12:30:00", "note": "soon"},
+            "items": ["2024-01-04", "later"],
+            "name": "2024-01-05",
+        }
+    )
+
+    assert model.value == datetime(2024, 1, 2)
+    assert model.mapping == {"at": datetime(2024, 1, 3, 12, 30), "note": "soon"}
+    assert model.items == [datetime(2024, 1, 4), "later"]
+    assert model.name == "2024-01-05"
+
+
+def load_profiles() -> list[LinkedInProfile]:
+    with open(PROFILES) as f:
+        return [LinkedInProfile(**candidate["profile"]) for candidate in json.load(f)]
+
+
+@pytest.mark.parametrize(
+    "profile", load_profiles(), ids=lambda profile: profile.public_identifier
+)
+def test_profile_dict_matches_legacy_serializer(profile):
+    with legacy_serializer():
+        expected = profile.dict()
+
+    assert profile.dict() == expected
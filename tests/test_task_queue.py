@@ -0,0 +1,159 @@
+import pytest
+
+from models.tasks import QueuedTask
+from services.task_queue import TASK_MAX_ATTEMPTS, LeaseLostError, SQLiteTaskQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SQLiteTaskQueue(str(tmp_path / "tasks.sqlite3"))
+
+
+def make_tasks(count: int, batch_id: str = "batch") -> list[QueuedTask]:
+    return [
+        QueuedTask(
+            id=f"{batch_id}-{i}",
+            kind="process_url",
+            batch_id=batch_id,
+            payload={"url": f"https://www.linkedin.com/in/candidate-{i}"},
+        )
+        for i in range(count)
+    ]
+
+
+def expire_lease(queue: SQLiteTaskQueue, task_id: str) -> None:
+    queue._connect().execute(
+        "UPDATE tasks SET lease_until = 0 WHERE id = ?", (task_id,)
+    )
+
+
+def test_claims_tasks_in_enqueue_order(queue):
+    queue.enqueue(make_tasks(2))
+
+    first, second = queue.claim(), queue.claim()
+
+    assert (first.id, second.id) == ("batch-0", "batch-1")
+    assert first.status == "running"
+    assert first.attempts == 1
+    assert first.payload == {"url": "https://www.linkedin.com/in/candidate-0"}
+    assert queue.claim() is None
+
+
+def test_enqueue_ignores_tasks_already_queued(queue):
+    queue.enqueue(make_tasks(1))
+    queue.complete(queue.claim())
+
+    queue.enqueue(make_tasks(1))
+
+    assert queue.claim() is None
+
+
+def test_leased_task_is_not_handed_out_twice(queue):
+    queue.enqueue(make_tasks(1))
+    assert queue.claim() is not None
+
+    assert queue.claim() is None
+
+
+def test_expired_lease_is_reclaimed(queue):
+    queue.enqueue(make_tasks(1))
+    task = queue.claim()
+    expire_lease(queue, task.id)
+
+    reclaimed = queue.claim()
+
+    assert reclaimed.id == task.id
+    assert reclaimed.attempts == 2
+
+
+def test_stale_worker_cannot_finish_a_reclaimed_task(queue):
+    queue.enqueue(make_tasks(1))
+    stale = queue.claim()
+    expire_lease(queue, stale.id)
+    current = queue.claim()
+
+    with pytest.raises(LeaseLostError):
+        queue.complete(stale)
+    with pytest.raises(LeaseLostError):
+        queue.fail(stale, "timeout")
+
+    queue.complete(current)
+    assert queue.count_open("batch") == 0
+
+
+def test_stale_worker_cannot_finish_a_task_failed_by_claim(queue):
+    queue.enqueue(make_tasks(1))
+    for _ in range(TASK_MAX_ATTEMPTS):
+        task = queue.claim()
+        expire_lease(queue, task.id)
+    queue.claim()
+
+    with pytest.raises(LeaseLostError):
+        queue.complete(task)
+
+
+def test_completed_task_is_never_rerun(queue):
+    queue.enqueue(make_tasks(1))
+    task = queue.claim()
+    queue.complete(task)
+    expire_lease(queue, task.id)
+
+    assert queue.claim() is None
+
+
+def test_failed_task_is_retried_until_attempts_run_out(queue):
+    queue.enqueue(make_tasks(1))
+
+    for attempt in range(1, TASK_MAX_ATTEMPTS):
+        task = queue.claim()
+        assert task.attempts == attempt
+        assert queue.fail(task, "timeout") is True
+
+    task = queue.claim()
+    assert queue.fail(task, "timeout") is False
+    assert queue.claim() is None
+
+
+def test_permanent_failure_is_not_retried(queue):
+    queue.enqueue(make_tasks(1))
+
+    assert queue.fail(queue.claim(), "not found", retry=False) is False
+    assert queue.claim() is None
+
+
+def test_expired_lease_on_final_attempt_fails_the_task(queue):
+    queue.enqueue(make_tasks(1))
+    for _ in range(TASK_MAX_ATTEMPTS):
+        task = queue.claim()
+        expire_lease(queue, task.id)
+
+    failed = queue.claim()
+
+    assert failed.id == task.id
+    assert failed.status == "failed"
+    assert failed.attempts == TASK_MAX_ATTEMPTS
+    assert queue.claim() is None
+    assert queue.count_open("batch") == 0
+
+
+def test_batch_is_open_until_every_task_finishes(queue):
+    queue.enqueue(make_tasks(3))
+    tasks = [queue.claim() for _ in range(3)]
+    assert queue.count_open("batch") == 3
+
+    queue.complete(tasks[0])
+    queue.fail(tasks[1], "not found", retry=False)
+    assert queue.count_open("batch") == 1
+
+    queue.fail(tasks[2], "timeout")
+    assert queue.count_open("batch") == 1
+
+    queue.complete(queue.claim())
+    assert queue.count_open("batch") == 0
+
+
+def test_batches_are_counted_separately(queue):
+    queue.enqueue(make_tasks(2) + make_tasks(1, batch_id="other"))
+
+    assert queue.count_open("batch") == 2
+    assert queue.count_open("other") == 1